@@ -6,8 +6,10 @@
 import json
 import os
 import ssl
+import threading
+import weakref
 import httpx
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 # 禁用 SSL 警告 | Disable SSL warnings
 import warnings
@@ -15,7 +17,11 @@ import urllib3
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-from config import API_KEY, API_BASE_URL, MODEL_NAME
+from config import (
+    API_KEY, API_BASE_URL, MODEL_NAME,
+    LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_HTTP_KEEPALIVE_EXPIRY, LLM_HTTP2_ENABLED
+)
 from logger_config import logger, log_function_call
 
 # LangGraph imports for ReAct Agent
@@ -75,6 +81,16 @@ def _check_langchain_openai():
         return False
 
 
+def _h2_available() -> bool:
+    """检查是否安装了 HTTP/2 支持（h2）| Check whether HTTP/2 support (h2) is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("⚠️  h2 not installed, falling back to HTTP/1.1 (pip install h2)")
+        return False
+
+
 class SimpleLLM:
     """
     简单的 LLM 包装类 | Simple LLM Wrapper Class
@@ -82,37 +98,136 @@ class SimpleLLM:
     Directly use HTTP requests to call API, bypassing SSL certificate issues
     """
     
-    def __init__(self, api_key: str, base_url: str, model_name: str, temperature: float = 0.7):
+    def __init__(self, api_key: str, base_url: str, model_name: str, temperature: float = 0.7,
+                 max_tokens: int = 4096, cache=None):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.model_name = model_name
         self.temperature = temperature
+        self.max_tokens = max_tokens
+        # 可插拔的响应缓存（llm_cache.ResponseCache）| Pluggable response cache (llm_cache.ResponseCache)
+        self.cache = cache
+        self.http2 = LLM_HTTP2_ENABLED and _h2_available()
         # 创建禁用 SSL 验证的客户端，设置更长的超时时间
-        self.client = httpx.Client(
-            verify=False, 
-            timeout=httpx.Timeout(300.0, connect=30.0)
-        )
+        self.client = httpx.Client(**self._client_kwargs())
+        # 每个事件循环一个长期复用的异步客户端 | One long-lived async client per event loop
+        # httpx.AsyncClient 的连接绑定在创建它的事件循环上，不能跨循环共享
+        # httpx.AsyncClient connections are bound to the loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """
+        HTTP 客户端公共参数 | Shared HTTP client options
+        有界连接池 + keep-alive，避免每次调用重新握手
+        Bounded pool + keep-alive so calls skip the TCP/TLS handshake
+        """
+        return {
+            "verify": False,
+            "timeout": httpx.Timeout(300.0, connect=30.0),
+            "limits": httpx.Limits(
+                max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY
+            ),
+            "http2": self.http2
+        }
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        获取当前事件循环的异步客户端 | Get the async client for the running event loop
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(**self._client_kwargs())
+                self._async_clients[loop] = client
+                logger.debug(f"Created pooled async HTTP client (http2={self.http2})")
+            return client
+
+    async def aclose(self):
+        """
+        关闭当前事件循环的异步客户端 | Close the async client of the running event loop
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def close(self):
+        """
+        关闭所有 HTTP 客户端 | Close all HTTP clients
+        用于 worker 退出时的清理 | Used for cleanup on worker shutdown
+        """
+        import asyncio
+
+        self.client.close()
+        with self._async_clients_lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        for loop, client in clients:
+            if client.is_closed or loop.is_closed():
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+                else:
+                    loop.run_until_complete(client.aclose())
+            except Exception as e:
+                logger.warning(f"Failed to close async HTTP client: {e}")
+        logger.info("LLM HTTP clients closed")
+
+    def _cache_key(self, prompt: str) -> str:
+        """生成响应缓存键 | Build the response cache key"""
+        from llm_cache import make_cache_key
+        return make_cache_key(self.model_name, self.temperature, prompt, self.max_tokens)
+
+    def _cache_get(self, prompt: str) -> Optional[str]:
+        """查询响应缓存，出错时视为未命中 | Look up the response cache, treating errors as misses"""
+        if self.cache is None:
+            return None
+        try:
+            cached = self.cache.get(self._cache_key(prompt))
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        if cached is not None:
+            logger.info(f"✓ LLM cache hit, response length: {len(cached)}")
+        return cached
+
+    def _cache_set(self, prompt: str, content: str):
+        """写入响应缓存 | Store a response in the cache"""
+        if self.cache is None or not content:
+            return
+        try:
+            self.cache.set(self._cache_key(prompt), content)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
     
     @log_function_call
-    def invoke(self, prompt: str, max_retries: int = 3) -> str:
+    def invoke(self, prompt: str, max_retries: int = 3, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         调用 LLM 生成响应 | Call LLM to generate response
+
+        Args:
+            on_token: 可选的增量回调，提供时使用流式模式 | Optional delta callback, enables streaming mode
         """
+        if on_token is not None:
+            return self.stream(prompt, on_token, max_retries)
+
         logger.debug(f"LLM invoke called - Model: {self.model_name}, Prompt length: {len(prompt)}")
-        url = f"{self.base_url}/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": self.model_name,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": self.temperature,
-            "max_tokens": 4096
-        }
-        
+        cached = self._cache_get(prompt)
+        if cached is not None:
+            return cached
+
+        url, headers, data = self._build_request(prompt)
+
         import time
         last_error = None
         for attempt in range(max_retries):
@@ -123,6 +238,7 @@ class SimpleLLM:
                 result = response.json()
                 content = result["choices"][0]["message"]["content"]
                 logger.info(f"✓ LLM API call successful, response length: {len(content)}")
+                self._cache_set(prompt, content)
                 return content
             except httpx.TimeoutException as e:
                 last_error = e
@@ -172,43 +288,40 @@ class SimpleLLM:
         """兼容旧版 API | Compatible with old API"""
         return self.invoke(prompt)
 
-    async def ainvoke(self, prompt: str, max_retries: int = 3) -> str:
+    async def ainvoke(self, prompt: str, max_retries: int = 3,
+                      on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         异步调用 LLM 生成响应 | Async call LLM to generate response
 
         用于并行 Skill 执行 | Used for parallel Skill execution
+
+        Args:
+            on_token: 可选的增量回调，提供时使用流式模式 | Optional delta callback, enables streaming mode
         """
         import asyncio
 
-        logger.debug(f"LLM ainvoke called - Model: {self.model_name}, Prompt length: {len(prompt)}")
-        url = f"{self.base_url}/chat/completions"
+        if on_token is not None:
+            return await self.astream(prompt, on_token, max_retries)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        logger.debug(f"LLM ainvoke called - Model: {self.model_name}, Prompt length: {len(prompt)}")
+        cached = self._cache_get(prompt)
+        if cached is not None:
+            return cached
 
-        data = {
-            "model": self.model_name,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": self.temperature,
-            "max_tokens": 4096
-        }
+        url, headers, data = self._build_request(prompt)
 
         last_error = None
         for attempt in range(max_retries):
             try:
                 logger.info(f"LLM async API call attempt {attempt + 1}/{max_retries}")
-                async with httpx.AsyncClient(
-                    verify=False,
-                    timeout=httpx.Timeout(300.0, connect=30.0)
-                ) as client:
-                    response = await client.post(url, headers=headers, json=data)
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    logger.info(f"✓ LLM async API call successful, response length: {len(content)}")
-                    return content
+                client = self._get_async_client()
+                response = await client.post(url, headers=headers, json=data)
+                response.raise_for_status()
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+                logger.info(f"✓ LLM async API call successful, response length: {len(content)}")
+                self._cache_set(prompt, content)
+                return content
             except httpx.TimeoutException as e:
                 last_error = e
                 wait_time = 2 * (attempt + 1)
@@ -251,15 +364,154 @@ class SimpleLLM:
         raise Exception(f"LLM async call failed after {max_retries} retries: {str(last_error)}")
 
 
+    def _build_request(self, prompt: str, stream: bool = False):
+        """构建 chat/completions 请求 | Build the chat/completions request"""
+        url = f"{self.base_url}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        data = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens
+        }
+        if stream:
+            data["stream"] = True
+        return url, headers, data
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """
+        解析一行 SSE 数据，返回内容增量 | Parse one SSE line and return the content delta
+        """
+        if not line or not line.startswith("data:"):
+            return None
+        payload = line[5:].strip()
+        if not payload or payload == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed stream chunk: {payload[:100]}")
+            return None
+        choices = chunk.get("choices") or []
+        if not choices:
+            return None
+        return (choices[0].get("delta") or {}).get("content")
+
+    def stream(self, prompt: str, on_token: Callable[[str], None], max_retries: int = 3) -> str:
+        """
+        流式调用 LLM（stream: true），每收到一个增量就回调 on_token
+        Streaming LLM call (stream: true), calling on_token for every delta
+
+        Returns:
+            完整的响应文本 | Full response text
+        """
+        import time
+
+        logger.debug(f"LLM stream called - Model: {self.model_name}, Prompt length: {len(prompt)}")
+        cached = self._cache_get(prompt)
+        if cached is not None:
+            on_token(cached)
+            return cached
+
+        url, headers, data = self._build_request(prompt, stream=True)
+        last_error = None
+        for attempt in range(max_retries):
+            parts = []
+            try:
+                logger.info(f"LLM streaming API call attempt {attempt + 1}/{max_retries}")
+                with self.client.stream("POST", url, headers=headers, json=data) as response:
+                    if response.status_code >= 400:
+                        response.read()
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        delta = self._parse_stream_line(line)
+                        if delta:
+                            parts.append(delta)
+                            on_token(delta)
+                content = "".join(parts)
+                logger.info(f"✓ LLM streaming API call successful, response length: {len(content)}")
+                self._cache_set(prompt, content)
+                return content
+            except Exception as e:
+                last_error = e
+                # 已经推送过增量时不再重试，避免客户端收到重复内容
+                # Do not retry once deltas were pushed, the client would see duplicates
+                retryable = not isinstance(e, httpx.HTTPStatusError) or \
+                    e.response.status_code >= 500 or e.response.status_code == 429
+                if parts or not retryable or attempt == max_retries - 1:
+                    break
+                wait_time = 2 * (attempt + 1)
+                logger.warning(f"Streaming API call failed, retrying in {wait_time}s ({attempt + 1}/{max_retries}): {str(e)}")
+                time.sleep(wait_time)
+
+        logger.error(f"LLM streaming call failed: {str(last_error)}")
+        raise Exception(f"LLM streaming call failed: {str(last_error)}")
+
+    async def astream(self, prompt: str, on_token: Callable[[str], None], max_retries: int = 3) -> str:
+        """
+        异步流式调用 LLM | Async streaming LLM call
+
+        Returns:
+            完整的响应文本 | Full response text
+        """
+        import asyncio
+
+        logger.debug(f"LLM astream called - Model: {self.model_name}, Prompt length: {len(prompt)}")
+        cached = self._cache_get(prompt)
+        if cached is not None:
+            on_token(cached)
+            return cached
+
+        url, headers, data = self._build_request(prompt, stream=True)
+        last_error = None
+        for attempt in range(max_retries):
+            parts = []
+            try:
+                logger.info(f"LLM async streaming API call attempt {attempt + 1}/{max_retries}")
+                client = self._get_async_client()
+                async with client.stream("POST", url, headers=headers, json=data) as response:
+                    if response.status_code >= 400:
+                        await response.aread()
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        delta = self._parse_stream_line(line)
+                        if delta:
+                            parts.append(delta)
+                            on_token(delta)
+                content = "".join(parts)
+                logger.info(f"✓ LLM async streaming API call successful, response length: {len(content)}")
+                self._cache_set(prompt, content)
+                return content
+            except Exception as e:
+                last_error = e
+                retryable = not isinstance(e, httpx.HTTPStatusError) or \
+                    e.response.status_code >= 500 or e.response.status_code == 429
+                if parts or not retryable or attempt == max_retries - 1:
+                    break
+                wait_time = 2 * (attempt + 1)
+                logger.warning(f"Async streaming API call failed, retrying in {wait_time}s ({attempt + 1}/{max_retries}): {str(e)}")
+                await asyncio.sleep(wait_time)
+
+        logger.error(f"LLM async streaming call failed: {str(last_error)}")
+        raise Exception(f"LLM async streaming call failed: {str(last_error)}")
+
+
 def init_llm():
     """
     初始化语言模型 | Initialize Language Model
     """
+    from llm_cache import get_response_cache
+
     llm = SimpleLLM(
         api_key=API_KEY,
         base_url=API_BASE_URL,
         model_name=MODEL_NAME,
-        temperature=0.7
+        temperature=0.7,
+        cache=get_response_cache()
     )
     return llm
 
@@ -537,12 +789,15 @@ class ProductResearcher:
             logger.info("LangGraph ReAct Agent not available (LangGraph prebuilt not available), using fallback mode")
     
     @log_function_call
-    def research(self, user_input: str) -> Dict[str, Any]:
+    def research(self, user_input: str,
+                 on_token: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
         """
         执行需求调研 | Conduct requirement research
 
         Args:
             user_input: 用户输入的产品需求 | User input product requirements
+            on_token: 可选的流式回调 (output_key, delta)，仅并行 Skill 模式支持
+                      Optional streaming callback (output_key, delta), parallel Skill mode only
 
         Returns:
             包含调研结果的字典 | Dictionary containing research results
@@ -555,8 +810,18 @@ class ProductResearcher:
                 logger.info("Using Parallel Skill mode...")
                 import asyncio
 
+                async def run_parallel_research():
+                    try:
+                        return await self.parallel_orchestrator.research_with_timeout(
+                            user_input, timeout=120.0, on_token=on_token
+                        )
+                    finally:
+                        # asyncio.run 的事件循环随后即被销毁，释放绑定在其上的连接池
+                        # The asyncio.run loop is torn down next; release its connection pool
+                        await self.simple_llm.aclose()
+
                 # 运行异步并行研究
-                result = asyncio.run(self.parallel_orchestrator.research_with_timeout(user_input, timeout=120.0))
+                result = asyncio.run(run_parallel_research())
                 logger.info("✓ Parallel Skill research completed successfully")
                 # 包装成与原有格式一致的结构
                 return {"research_result": result}
@@ -564,6 +829,46 @@ class ProductResearcher:
                 logger.warning(f"Parallel Skill mode failed: {e}")
                 logger.warning("⚠️  Falling back to LangGraph ReAct Agent mode")
 
+        return self._research_with_agent(user_input)
+
+    @log_function_call
+    async def aresearch(self, user_input: str,
+                        on_token: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        异步执行需求调研，直接在调用方的事件循环上运行并行 Skill
+        Conduct requirement research asynchronously, running the parallel Skills on the caller's loop
+
+        Args:
+            user_input: 用户输入的产品需求 | User input product requirements
+            on_token: 可选的流式回调 (output_key, delta) | Optional streaming callback (output_key, delta)
+
+        Returns:
+            包含调研结果的字典 | Dictionary containing research results
+        """
+        logger.info(f"ProductResearcher.aresearch() called - Input length: {len(user_input)}")
+
+        if self.use_parallel_skills and self.parallel_orchestrator is not None:
+            try:
+                logger.info("Using Parallel Skill mode...")
+                result = await self.parallel_orchestrator.research_with_timeout(
+                    user_input, timeout=120.0, on_token=on_token
+                )
+                logger.info("✓ Parallel Skill research completed successfully")
+                return {"research_result": result}
+            except Exception as e:
+                logger.warning(f"Parallel Skill mode failed: {e}")
+                logger.warning("⚠️  Falling back to LangGraph ReAct Agent mode")
+
+        # ReAct Agent 和回退模式是同步调用，放到线程中执行以免阻塞事件循环
+        # The ReAct Agent and fallback modes are synchronous; run them in a thread to keep the loop free
+        import asyncio
+        return await asyncio.to_thread(self._research_with_agent, user_input)
+
+    def _research_with_agent(self, user_input: str) -> Dict[str, Any]:
+        """
+        使用 LangGraph ReAct Agent 调研，不可用时回退到直接调用 LLM
+        Research with the LangGraph ReAct Agent, falling back to a direct LLM call
+        """
         # 尝试使用 LangGraph ReAct Agent
         if self.react_agent is not None:
             try:
@@ -1066,13 +1371,48 @@ class DocAssistant:
         self.name = "Doc Assistant"
     
     @log_function_call
-    def generate_doc(self, user_input: str, research_result: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_doc(self, user_input: str, research_result: Dict[str, Any],
+                     on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         生成产品需求文档 | Generate product requirement document
+
+        Args:
+            on_token: 可选的流式回调，逐段接收文档内容 | Optional streaming callback for document deltas
         """
         logger.info(f"DocAssistant.generate_doc() called")
         
-        prompt = f"""
+        prompt = self._build_prompt(user_input, research_result)
+        doc_content = self.llm.invoke(prompt, on_token=on_token)
+        logger.info(f"✓ DocAssistant.generate_doc() completed - Document length: {len(doc_content)}")
+        
+        return {
+            "agent": self.name,
+            "document": doc_content,
+            "status": "completed"
+        }
+
+    @log_function_call
+    async def agenerate_doc(self, user_input: str, research_result: Dict[str, Any],
+                            on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        异步生成产品需求文档 | Generate product requirement document asynchronously
+        """
+        logger.info(f"DocAssistant.agenerate_doc() called")
+
+        prompt = self._build_prompt(user_input, research_result)
+        doc_content = await self.llm.ainvoke(prompt, on_token=on_token)
+        logger.info(f"✓ DocAssistant.agenerate_doc() completed - Document length: {len(doc_content)}")
+
+        return {
+            "agent": self.name,
+            "document": doc_content,
+            "status": "completed"
+        }
+
+    @staticmethod
+    def _build_prompt(user_input: str, research_result: Dict[str, Any]) -> str:
+        """构建文档生成提示词 | Build the document generation prompt"""
+        return f"""
 You are a professional product documentation expert. Based on the following information, generate a professional Product Requirements Document (PRD):
 
 User Requirement:
@@ -1093,15 +1433,6 @@ IMPORTANT:
 - Return the document content in Markdown format
 - All content must be written in English only
 """
-        
-        doc_content = self.llm.invoke(prompt)
-        logger.info(f"✓ DocAssistant.generate_doc() completed - Document length: {len(doc_content)}")
-        
-        return {
-            "agent": self.name,
-            "document": doc_content,
-            "status": "completed"
-        }
 
 
 # ============================================================================
@@ -1141,6 +1472,16 @@ def filter_citations_by_usage(citations: List[Dict], used_ids: set) -> List[Dict
     return [cite for cite in citations if cite.get('id') in used_ids]
 
 
+# 可行性评估各维度的检索关注点 | Retrieval focus of each feasibility aspect
+RAG_ASPECT_QUERIES = {
+    "technical": "technical feasibility implementation requirements",
+    "cost": "cost budget pricing resources",
+    "architecture": "system architecture integration infrastructure",
+    "risk": "risks limitations failure modes",
+    "compliance": "compliance regulations standards certification"
+}
+
+
 class FeasibilityEvaluator:
     """
     可行性评估专家智能体 | Feasibility Evaluator Agent
@@ -1166,47 +1507,100 @@ class FeasibilityEvaluator:
             logger.info("FeasibilityEvaluator initialized without RAG support")
 
     @log_function_call
-    def evaluate(self, user_input: str, research_result: Dict[str, Any], doc_content: str = "") -> Dict[str, Any]:
+    def evaluate(self, user_input: str, research_result: Dict[str, Any], doc_content: str = "",
+                 on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         执行可行性评估 | Conduct feasibility assessment
         基于用户需求和研究结果进行评估（文档内容可选）
         如果启用了RAG，会从知识库中检索相关参考资料
+
+        Args:
+            on_token: 可选的流式回调，逐段接收评估响应 | Optional streaming callback for evaluation deltas
         """
         logger.info(f"FeasibilityEvaluator.evaluate() called")
 
-        # RAG: 检索相关文档
+        rag_context, citations = self._retrieve_context(user_input, research_result)
+        prompt = self._build_prompt(user_input, research_result, rag_context)
+        response = self.llm.invoke(prompt, on_token=on_token)
+        return self._build_result(response, citations)
+
+    @log_function_call
+    async def aevaluate(self, user_input: str, research_result: Dict[str, Any], doc_content: str = "",
+                        on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        异步执行可行性评估 | Conduct feasibility assessment asynchronously
+        RAG 检索（嵌入计算和向量查询）在线程中执行，不阻塞事件循环
+        RAG retrieval (embedding and vector query) runs in a thread so the loop is not blocked
+        """
+        import asyncio
+
+        logger.info(f"FeasibilityEvaluator.aevaluate() called")
+
+        rag_context, citations = await asyncio.to_thread(self._retrieve_context, user_input, research_result)
+        prompt = self._build_prompt(user_input, research_result, rag_context)
+        response = await self.llm.ainvoke(prompt, on_token=on_token)
+        return self._build_result(response, citations)
+
+    def _retrieve_context(self, user_input: str, research_result: Dict[str, Any]):
+        """
+        RAG: 检索相关文档 | RAG: Retrieve relevant documents
+        参考资料按剩余的提示词 token 预算打包 | Reference context is packed into the prompt's remaining token budget
+
+        Returns:
+            (参考资料上下文, 引用列表) | (reference context, citations)
+        """
         rag_context = ""
         citations = []
 
         if self.rag_retriever:
             try:
-                # 构建检索查询
-                query = f"{user_input} technical feasibility cost architecture risk compliance"
-                logger.info(f"RAG: Retrieving relevant documents for query...")
-
-                # 检查vector store状态
-                rag_status = self.rag_retriever.get_status()
-                logger.info(f"RAG: Vector store has {rag_status['chunks_in_vector_store']} chunks")
+                # 每个评估维度一条聚焦的子查询，一次批量检索 | One focused sub-query per evaluation aspect, retrieved in one batch
+                queries = {
+                    aspect: f"{user_input} {focus}"
+                    for aspect, focus in RAG_ASPECT_QUERIES.items()
+                }
+                logger.info(f"RAG: Retrieving relevant documents for {len(queries)} aspects...")
 
                 # 检索相关文档
                 from config import RAG_TOP_K
                 logger.info(f"RAG: Querying with top_k={RAG_TOP_K}")
-                retrieved_docs = self.rag_retriever.retrieve(query, top_k=RAG_TOP_K)
+                retrieved_docs = self.rag_retriever.retrieve_many(queries, top_k=RAG_TOP_K)
 
                 if retrieved_docs:
-                    rag_context, citations = self.rag_retriever.format_context_with_citations(retrieved_docs)
+                    token_budget = self._context_token_budget(user_input, research_result)
+                    rag_context, citations = self.rag_retriever.format_context_with_citations(
+                        retrieved_docs, token_budget=token_budget
+                    )
+                    logger.info(f"RAG: Context token budget {token_budget}")
                     logger.info(f"RAG: Retrieved {len(retrieved_docs)} relevant documents with {len(citations)} citations")
                     # 记录引用的文档名
                     for cite in citations:
-                        logger.info(f"RAG: Citation [{cite['id']}] - {cite['document']}, Page {cite['page']}, Score: {cite['relevance_score']}")
+                        logger.info(f"RAG: Citation [{cite['id']}] - {cite['document']}, Page {cite['page']}, Score: {cite['relevance_score']}, Aspects: {', '.join(cite.get('aspects', []))}")
                 else:
-                    logger.warning(f"RAG: No relevant documents found (vector store has {rag_status['chunks_in_vector_store']} chunks)")
+                    # 仅在无结果时读取分块数（缓存值，不额外查询向量库）| Chunk count only on a miss (cached, no extra store call)
+                    logger.warning(f"RAG: No relevant documents found (vector store has {self.rag_retriever.get_chunk_count()} chunks)")
             except Exception as e:
                 logger.warning(f"RAG retrieval failed: {e}")
                 rag_context = ""
                 citations = []
 
-        # 构建评估prompt（基于研究结果，可选包含RAG上下文）
+        return rag_context, citations
+
+    def _context_token_budget(self, user_input: str, research_result: Dict[str, Any]) -> int:
+        """
+        参考资料的 token 预算：提示词总预算减去提示词其余部分的估算长度
+        Context token budget: the prompt budget minus the estimated size of the rest of the prompt
+        """
+        from config import RAG_PROMPT_TOKEN_BUDGET, RAG_CONTEXT_TOKEN_BUDGET, RAG_CONTEXT_MIN_TOKENS
+        from rag.tokenization import estimate_tokens
+
+        # 用占位上下文构建，使参考资料段落的说明文字也计入 | Built with a placeholder so the reference section's instructions count too
+        prompt_tokens = estimate_tokens(self._build_prompt(user_input, research_result, "[context]"))
+        return max(RAG_CONTEXT_MIN_TOKENS, min(RAG_CONTEXT_TOKEN_BUDGET, RAG_PROMPT_TOKEN_BUDGET - prompt_tokens))
+
+    @staticmethod
+    def _build_prompt(user_input: str, research_result: Dict[str, Any], rag_context: str) -> str:
+        """构建评估提示词（基于研究结果，可选包含RAG上下文）| Build the evaluation prompt"""
         rag_section = ""
         if rag_context:
             rag_section = f"""
@@ -1216,7 +1610,7 @@ Reference Documents from Knowledge Base:
 IMPORTANT: When using information from the reference documents above, include citations in your response using the format [1], [2], etc. to indicate which reference document the information comes from.
 """
 
-        prompt = f"""
+        return f"""
 You are a senior technical architect and project evaluation expert. Based on the following information, conduct a comprehensive feasibility assessment:
 
 User Requirement:
@@ -1259,8 +1653,8 @@ IMPORTANT:
 - If you referenced any information from the knowledge base documents, include the citation numbers [1], [2], etc. in your response text.
 """
 
-        response = self.llm.invoke(prompt)
-
+    def _build_result(self, response: str, citations: List[Dict]) -> Dict[str, Any]:
+        """解析评估响应并过滤引用 | Parse the evaluation response and filter citations"""
         evaluation_result = parse_json_response(response, [
             "technical_feasibility", "architecture_design", "cost_estimation",
             "compliance_requirements", "risks_and_recommendations"
@@ -0,0 +1,94 @@
+"""
+进程级异步运行时 | Process-wide Async Runtime
+每个 worker 进程只有一个长期运行的事件循环（在后台线程中），所有编排共享该循环
+Each worker process runs a single long-lived event loop on a background thread,
+shared by all orchestrations
+
+- 避免每个请求 asyncio.run 创建并销毁事件循环 | Avoids creating and tearing down a loop per request
+- 绑定在循环上的 httpx.AsyncClient 连接池可以跨请求复用 | Loop-bound httpx.AsyncClient pools are reused across requests
+- 循环在首次使用时才启动，gunicorn fork 之后的子进程会重新创建
+  The loop starts on first use, and is recreated in children forked by gunicorn
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+from logger_config import logger
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取（必要时启动）共享事件循环 | Get (starting if needed) the shared event loop
+
+    Returns:
+        在后台线程中运行的事件循环 | Event loop running on a background thread
+    """
+    global _loop, _thread, _pid
+    with _lock:
+        # fork 出的子进程继承了循环对象但没有运行它的线程 | Forked children inherit the loop but not its thread
+        if _loop is None or _pid != os.getpid() or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_run_loop, args=(_loop,), name="async-runtime", daemon=True)
+            _thread.start()
+            _pid = os.getpid()
+            logger.info(f"Async runtime event loop started (pid {_pid})")
+        return _loop
+
+
+def in_runtime_thread() -> bool:
+    """当前是否运行在共享事件循环的线程中 | Whether the caller runs on the shared loop's thread"""
+    return _thread is not None and threading.current_thread() is _thread
+
+
+def submit(coro: Awaitable[Any]) -> concurrent.futures.Future:
+    """
+    将协程提交到共享事件循环 | Submit a coroutine to the shared event loop
+
+    Returns:
+        可在任意线程等待的 Future | Future that can be waited on from any thread
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    在共享事件循环上运行协程并阻塞等待结果（供同步调用方使用）
+    Run a coroutine on the shared loop and block for its result (for synchronous callers)
+
+    Raises:
+        RuntimeError: 在事件循环线程中调用会造成死锁 | Calling from the loop thread would deadlock
+    """
+    if in_runtime_thread():
+        raise RuntimeError("run_sync() cannot be called from the async runtime thread")
+    return submit(coro).result(timeout=timeout)
+
+
+def shutdown(timeout: float = 5.0):
+    """
+    停止共享事件循环，worker 退出时调用 | Stop the shared event loop, called on worker exit
+    """
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None or _pid != os.getpid() or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=timeout)
+    if not loop.is_running():
+        loop.close()
+    logger.info("Async runtime event loop stopped")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+向量库后端基准测试：对比 ChromaDB 与 NumPy 内存映射索引的写入和 top-k 查询耗时
+Vector store benchmark: compare write and top-k query latency of ChromaDB and the NumPy memmapped index
+
+用法 | Usage:
+    python benchmark_vector_store.py [--chunks 5000] [--dim 384] [--queries 200] [--top-k 5]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from rag.vector_store import create_vector_store
+
+
+def make_corpus(chunks: int, dim: int, seed: int = 0):
+    """生成随机分块和向量 | Generate random chunks and embeddings"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((chunks, dim)).astype(np.float32)
+    documents = [
+        {
+            "content": f"chunk {i}",
+            "metadata": {"source": f"doc_{i // 100}.pdf", "page": i // 10, "chunk_index": i % 10}
+        }
+        for i in range(chunks)
+    ]
+    queries = rng.standard_normal((max(1, chunks // 25), dim)).astype(np.float32)
+    return documents, embeddings, queries
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def benchmark_backend(backend: str, documents: List[Dict], embeddings: np.ndarray,
+                      queries: np.ndarray, query_count: int, top_k: int, batch_size: int) -> Dict:
+    """对一个后端计时：批量写入、冷启动首查、热查询 | Time one backend: batched writes, first query, warm queries"""
+    directory = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    try:
+        store = create_vector_store(backend, directory, "benchmark")
+
+        started = time.perf_counter()
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            store.add_documents(documents[start:end], embeddings[start:end].tolist())
+        store.flush()
+        write_seconds = time.perf_counter() - started
+
+        # 新实例模拟 worker 重启后的第一次查询 | A fresh instance models the first query after a worker restart
+        store = create_vector_store(backend, directory, "benchmark")
+        started = time.perf_counter()
+        store.query(queries[0].tolist(), top_k)
+        first_query_ms = (time.perf_counter() - started) * 1000
+
+        latencies = []
+        for i in range(query_count):
+            query = queries[i % len(queries)].tolist()
+            started = time.perf_counter()
+            store.query(query, top_k)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        return {
+            "backend": backend,
+            "write_seconds": write_seconds,
+            "first_query_ms": first_query_ms,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "qps": 1000 * len(latencies) / sum(latencies)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def check_agreement(documents: List[Dict], embeddings: np.ndarray, queries: np.ndarray, top_k: int) -> float:
+    """两个后端 top-k 结果的重合率（HNSW 为近似检索）| Top-k overlap between backends (HNSW is approximate)"""
+    directories = [tempfile.mkdtemp(prefix="bench_agree_") for _ in range(2)]
+    try:
+        stores = [create_vector_store(backend, directory, "agreement")
+                  for backend, directory in zip(("chroma", "numpy"), directories)]
+        for store in stores:
+            store.add_documents(documents, embeddings.tolist())
+            store.flush()
+
+        overlap = 0
+        for query in queries:
+            chroma_ids, numpy_ids = ({r["id"] for r in store.query(query.tolist(), top_k)} for store in stores)
+            overlap += len(chroma_ids & numpy_ids)
+        return overlap / (len(queries) * top_k)
+    finally:
+        for directory in directories:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector store backends")
+    parser.add_argument("--chunks", type=int, default=5000, help="分块数 | Number of chunks")
+    parser.add_argument("--dim", type=int, default=384, help="向量维度 | Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="计时的查询次数 | Timed queries")
+    parser.add_argument("--top-k", type=int, default=5, help="每次查询返回的结果数 | Results per query")
+    parser.add_argument("--batch-size", type=int, default=64, help="每批写入的分块数 | Chunks per write batch")
+    parser.add_argument("--backends", default="chroma,numpy", help="逗号分隔的后端 | Comma-separated backends")
+    args = parser.parse_args()
+
+    documents, embeddings, queries = make_corpus(args.chunks, args.dim)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+
+    print("=" * 80)
+    print("Vector Store Benchmark")
+    print("=" * 80)
+    print(f"Chunks: {args.chunks}  Dimension: {args.dim}  Queries: {args.queries}  Top-k: {args.top_k}")
+    print()
+
+    results = []
+    for backend in backends:
+        print(f"Benchmarking {backend}...")
+        results.append(benchmark_backend(
+            backend, documents, embeddings, queries, args.queries, args.top_k, args.batch_size
+        ))
+
+    print()
+    print(f"{'Backend':<10}{'Write (s)':>12}{'First (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}{'QPS':>10}")
+    print("-" * 68)
+    for r in results:
+        print(f"{r['backend']:<10}{r['write_seconds']:>12.2f}{r['first_query_ms']:>12.2f}"
+              f"{r['p50_ms']:>12.3f}{r['p95_ms']:>12.3f}{r['qps']:>10.0f}")
+
+    if set(backends) >= {"chroma", "numpy"}:
+        agreement = check_agreement(documents, embeddings, queries[:50], args.top_k)
+        print()
+        print(f"Top-{args.top_k} overlap between chroma and numpy: {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,77 @@ RAG_ENABLED = True
 RAG_DOCUMENTS_DIR = "knowledge_base/documents"
 RAG_VECTOR_DB_DIR = "vector_db/chroma_db"
 RAG_COLLECTION_NAME = "product_knowledge"
+RAG_VECTOR_BACKEND = "chroma"  # 向量库后端："chroma" 或 "numpy"（进程内内存映射索引，适合小规模知识库）| Vector store backend: "chroma" or "numpy" (in-process memmapped index for small corpora)
 RAG_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 RAG_CHUNK_SIZE = 1000
 RAG_CHUNK_OVERLAP = 150
+RAG_CHUNK_SIZE_UNIT = "chars"  # 分块大小的单位："chars" 字符或 "tokens" 估算的 LLM token | Unit of chunk sizes: "chars" or "tokens" (estimated LLM tokens)
 RAG_TOP_K = 5  # Number of relevant chunks to retrieve
+RAG_HYBRID_SEARCH = True  # 融合 BM25 关键词检索与向量检索 | Fuse BM25 keyword and dense retrieval
+RAG_HYBRID_CANDIDATES = 20  # 融合前每路检索取的结果数 | Results taken from each retriever before fusion
+RAG_RRF_K = 60  # 倒数排名融合常数 | Reciprocal-rank-fusion constant
+RAG_MMR_LAMBDA = 0.7  # MMR 相关性与多样性的权衡，1.0 表示关闭 | MMR relevance/diversity trade-off, 1.0 disables
+RAG_MMR_CANDIDATES = 20  # MMR 的候选分块数 | Candidates MMR chooses from
+RAG_MERGE_ADJACENT_CHUNKS = True  # 合并同页相邻分块为一条上下文 | Merge chunks adjacent on the same page into one context entry
+RAG_CONTEXT_TOKEN_BUDGET = 1500  # 参考资料上下文的最大 token 数 | Maximum tokens of reference context
+RAG_CONTEXT_MIN_TOKENS = 300  # 提示词较长时参考资料仍保留的最少 token 数 | Reference context kept even when the prompt is long
+RAG_PROMPT_TOKEN_BUDGET = 6000  # 评估提示词的目标总 token 数 | Target total tokens of the evaluation prompt
+RAG_EXTRACT_WORKERS = 4  # PDF 文本提取进程数，1 表示在当前进程提取 | PDF extraction processes, 1 = in-process
+RAG_EXTRACT_PAGES_PER_TASK = 50  # 每个提取任务的页数，大文件拆分到多个进程 | Pages per extraction task
+RAG_INGEST_BATCH_SIZE = 64  # 每批嵌入和写入的分块数 | Chunks per embedding and upsert batch
+RAG_INGEST_QUEUE_SIZE = 4  # 入库各阶段之间缓冲的批次数（背压上限）| Batches buffered between ingest stages (backpressure bound)
+RAG_QUERY_CACHE_SIZE = 1024  # 内存中缓存的查询向量数，0 表示关闭 | Query embeddings cached in memory, 0 disables
+RAG_QUERY_CACHE_PATH = "cache/query_embeddings.db"  # 查询向量的磁盘缓存，None 表示只用内存 | On-disk query embedding cache, None = memory only
+RAG_EMBEDDING_CACHE_DIR = "cache/embedding_cache"  # 按内容哈希缓存分块向量，None 表示关闭 | Chunk embeddings by content hash, None disables
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = 200000  # 分块向量缓存的最大条数 | Maximum cached chunk embeddings
+RAG_WARMUP_ENABLED = True  # worker 启动后在后台加载嵌入模型和向量库 | Load the embedding model and vector store in the background at worker start
+
+# LLM HTTP 连接池配置 | LLM HTTP Connection Pool Configuration
+LLM_HTTP_MAX_CONNECTIONS = 20  # 连接池最大连接数 | Max connections in the pool
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 10  # 保持活动的空闲连接数 | Idle keep-alive connections
+LLM_HTTP_KEEPALIVE_EXPIRY = 60.0  # 空闲连接保持时间（秒）| Idle connection expiry (seconds)
+LLM_HTTP2_ENABLED = True  # 启用 HTTP/2（需要安装 h2）| Enable HTTP/2 (requires h2)
+
+# LLM 响应缓存配置 | LLM Response Cache Configuration
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL_SECONDS = 6 * 3600  # 缓存有效期（秒）| Cache entry TTL (seconds)
+LLM_CACHE_MEMORY_MAX_ENTRIES = 256  # 内存 LRU 层条目上限 | In-memory LRU tier size
+LLM_CACHE_DISK_ENABLED = True  # 启用 SQLite 磁盘层 | Enable the SQLite disk tier
+LLM_CACHE_DB_PATH = "cache/llm_responses.db"
+LLM_CACHE_DISK_MAX_ENTRIES = 5000  # 磁盘层条目上限 | Disk tier size
+
+# 流式输出配置 | Streaming Configuration
+# 启用后 LLM 以 stream: true 调用，token 增量直接推送到 SSE 流
+# When enabled, LLM calls use stream: true and token deltas are pushed to the SSE stream
+LLM_STREAMING_ENABLED = True
+
+# 执行状态存储配置 | Execution State Store Configuration
+# "memory": 进程内存储，只支持单个 gunicorn worker | Process-local, single gunicorn worker only
+# "sqlite": SQLite WAL 文件，多个 worker 共享状态 | SQLite WAL file shared by multiple workers
+EXECUTION_STORE_BACKEND = "memory"
+EXECUTION_STORE_DB_PATH = "cache/execution_states.db"
+EXECUTION_STORE_POLL_SECONDS = 0.5  # 跨 worker SSE 的轮询间隔 | Poll interval for cross-worker SSE
+
+# 编排任务池配置 | Orchestration Pool Configuration
+ORCHESTRATION_MAX_WORKERS = 4  # 每个 worker 同时执行的编排数 | Concurrent orchestrations per worker
+ORCHESTRATION_MAX_QUEUE_SIZE = 20  # 等待队列长度上限 | Maximum waiting jobs per worker
+ORCHESTRATION_RETRY_AFTER_SECONDS = 30  # 队列已满时返回的 Retry-After | Retry-After when saturated
+
+# 执行状态淘汰配置 | Execution State Eviction Configuration
+# 已结束的执行超过 TTL 或超过数量上限时从内存/共享存储中淘汰，结果仍可从 outputs/ 加载
+# Finished executions past the TTL or over the limit are evicted; results reload from outputs/
+EXECUTION_STATE_TTL_SECONDS = 3600
+EXECUTION_STATE_MAX_FINISHED = 50
+
+# 工作流拓扑配置 | Workflow Topology Configuration
+# "serial": researcher -> evaluator -> aggregation -> doc_assistant
+# "parallel": researcher 之后评估与仅基于研究的 PRD 草稿并行，最后轻量合并
+#             After researcher, evaluation runs alongside a research-only PRD draft, then a lightweight merge
+WORKFLOW_TOPOLOGY = "serial"
+
+# 后台重建索引任务配置 | Background Reindex Job Configuration
+# 任务状态使用与执行状态相同的存储后端，sqlite 时各 worker 共享 | Job state uses the execution store backend, shared across workers with sqlite
+REINDEX_JOB_DB_PATH = "cache/reindex_jobs.db"
+REINDEX_JOB_STALE_SECONDS = 600  # 运行中任务超过该时间未更新视为已失效（worker 退出）| Running jobs without updates for this long are treated as dead
+REINDEX_JOB_TTL_SECONDS = 3600
+REINDEX_JOB_MAX_FINISHED = 20
@@ -60,12 +60,12 @@ def step2_check_chunking(documents):
         print("ERROR: No documents to chunk!")
         return None
 
-    from rag.text_chunker import TextChunker
-    from config import RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP
+    from rag.text_chunker import create_chunker
+    from config import RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP, RAG_CHUNK_SIZE_UNIT
 
-    chunker = TextChunker(RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP)
+    chunker = create_chunker(RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP, RAG_CHUNK_SIZE_UNIT)
 
-    print(f"Chunk size: {RAG_CHUNK_SIZE}, Overlap: {RAG_CHUNK_OVERLAP}")
+    print(f"Chunk size: {RAG_CHUNK_SIZE}, Overlap: {RAG_CHUNK_OVERLAP} ({RAG_CHUNK_SIZE_UNIT})")
     print(f"Input: {len(documents)} pages")
 
     chunked_docs = chunker.chunk_documents(documents)
@@ -78,6 +78,7 @@ def step2_check_chunking(documents):
             print(f"    Source: {chunk['metadata']['source']}")
             print(f"    Page: {chunk['metadata']['page']}")
             print(f"    Chunk index: {chunk['metadata']['chunk_index']}/{chunk['metadata']['total_chunks']}")
+            print(f"    Offsets: {chunk['metadata']['start_offset']}-{chunk['metadata']['end_offset']}")
             print(f"    Content length: {len(chunk['content'])} chars")
             print(f"    Content preview: {chunk['content'][:100]}...")
 
@@ -115,13 +116,14 @@ def step4_check_vector_store():
     """Step 4: 检查ChromaDB存储"""
     print_separator("Step 4: ChromaDB Vector Store")
 
-    from rag.vector_store import VectorStore
-    from config import RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME
+    from rag.vector_store import create_vector_store
+    from config import RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME, RAG_VECTOR_BACKEND
 
     print(f"Vector DB directory: {RAG_VECTOR_DB_DIR}")
     print(f"Collection name: {RAG_COLLECTION_NAME}")
+    print(f"Backend: {RAG_VECTOR_BACKEND}")
 
-    vector_store = VectorStore(RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME)
+    vector_store = create_vector_store(RAG_VECTOR_BACKEND, RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME)
 
     stats = vector_store.get_stats()
     print(f"\nVector store stats:")
@@ -174,7 +176,11 @@ def step6_check_rag_retriever():
 
     from rag import RAGRetriever
     from config import (RAG_DOCUMENTS_DIR, RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME,
-                       RAG_EMBEDDING_MODEL, RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP, RAG_TOP_K)
+                       RAG_EMBEDDING_MODEL, RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP, RAG_CHUNK_SIZE_UNIT, RAG_TOP_K,
+                       RAG_QUERY_CACHE_SIZE, RAG_QUERY_CACHE_PATH, RAG_VECTOR_BACKEND,
+                       RAG_HYBRID_SEARCH, RAG_HYBRID_CANDIDATES, RAG_RRF_K,
+                       RAG_MMR_LAMBDA, RAG_MMR_CANDIDATES, RAG_MERGE_ADJACENT_CHUNKS,
+                       RAG_CONTEXT_TOKEN_BUDGET)
 
     retriever = RAGRetriever(
         documents_dir=RAG_DOCUMENTS_DIR,
@@ -182,7 +188,18 @@ def step6_check_rag_retriever():
         collection_name=RAG_COLLECTION_NAME,
         embedding_model=RAG_EMBEDDING_MODEL,
         chunk_size=RAG_CHUNK_SIZE,
-        chunk_overlap=RAG_CHUNK_OVERLAP
+        chunk_overlap=RAG_CHUNK_OVERLAP,
+        chunk_unit=RAG_CHUNK_SIZE_UNIT,
+        query_cache_size=RAG_QUERY_CACHE_SIZE,
+        query_cache_path=RAG_QUERY_CACHE_PATH,
+        vector_backend=RAG_VECTOR_BACKEND,
+        hybrid_search=RAG_HYBRID_SEARCH,
+        hybrid_candidates=RAG_HYBRID_CANDIDATES,
+        rrf_k=RAG_RRF_K,
+        mmr_lambda=RAG_MMR_LAMBDA,
+        mmr_candidates=RAG_MMR_CANDIDATES,
+        merge_adjacent=RAG_MERGE_ADJACENT_CHUNKS,
+        context_token_budget=RAG_CONTEXT_TOKEN_BUDGET
     )
 
     # 获取状态
@@ -191,6 +208,7 @@ def step6_check_rag_retriever():
     print(f"  Enabled: {status['enabled']}")
     print(f"  Documents in knowledge base: {status['documents_in_knowledge_base']}")
     print(f"  Chunks in vector store: {status['chunks_in_vector_store']}")
+    print(f"  Chunks in lexical index: {status['chunks_in_lexical_index']} (hybrid search: {status['hybrid_search']})")
 
     if status['chunks_in_vector_store'] == 0:
         print("\nVector store is empty. Running document ingestion...")
@@ -207,6 +225,8 @@ def step6_check_rag_retriever():
 
     results = retriever.retrieve(test_query, top_k=RAG_TOP_K)
     print(f"Retrieved {len(results)} documents")
+    # 查询向量缓存命中情况 | Query embedding cache hits
+    print(f"Query cache: {retriever.get_status()['query_cache']}")
 
     if results:
         context, citations = retriever.format_context_with_citations(results)
@@ -216,6 +236,12 @@ def step6_check_rag_retriever():
         for cite in citations:
             print(f"  [{cite['id']}] {cite['document']}, {cite['section']} (Page {cite['page']}) - Score: {cite['relevance_score']}")
 
+        # 混合检索时显示各结果在向量和关键词两路中的排名 | With hybrid search, show each result's dense and BM25 rank
+        if status['hybrid_search']:
+            print("\nFusion ranks (dense / BM25):")
+            for i, doc in enumerate(results, start=1):
+                print(f"  [{i}] {doc.get('dense_rank') or '-'} / {doc.get('lexical_rank') or '-'}")
+
         print("\nContext preview:")
         print(context[:500] + "...")
 
@@ -228,7 +254,11 @@ def step7_check_agent_integration():
     from agents import FeasibilityEvaluator, init_llm
     from rag import RAGRetriever
     from config import (RAG_DOCUMENTS_DIR, RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME,
-                       RAG_EMBEDDING_MODEL, RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP)
+                       RAG_EMBEDDING_MODEL, RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP, RAG_CHUNK_SIZE_UNIT,
+                       RAG_QUERY_CACHE_SIZE, RAG_QUERY_CACHE_PATH, RAG_VECTOR_BACKEND,
+                       RAG_HYBRID_SEARCH, RAG_HYBRID_CANDIDATES, RAG_RRF_K,
+                       RAG_MMR_LAMBDA, RAG_MMR_CANDIDATES, RAG_MERGE_ADJACENT_CHUNKS,
+                       RAG_CONTEXT_TOKEN_BUDGET)
 
     # 初始化RAG
     rag_retriever = RAGRetriever(
@@ -237,7 +267,18 @@ def step7_check_agent_integration():
         collection_name=RAG_COLLECTION_NAME,
         embedding_model=RAG_EMBEDDING_MODEL,
         chunk_size=RAG_CHUNK_SIZE,
-        chunk_overlap=RAG_CHUNK_OVERLAP
+        chunk_overlap=RAG_CHUNK_OVERLAP,
+        chunk_unit=RAG_CHUNK_SIZE_UNIT,
+        query_cache_size=RAG_QUERY_CACHE_SIZE,
+        query_cache_path=RAG_QUERY_CACHE_PATH,
+        vector_backend=RAG_VECTOR_BACKEND,
+        hybrid_search=RAG_HYBRID_SEARCH,
+        hybrid_candidates=RAG_HYBRID_CANDIDATES,
+        rrf_k=RAG_RRF_K,
+        mmr_lambda=RAG_MMR_LAMBDA,
+        mmr_candidates=RAG_MMR_CANDIDATES,
+        merge_adjacent=RAG_MERGE_ADJACENT_CHUNKS,
+        context_token_budget=RAG_CONTEXT_TOKEN_BUDGET
     )
 
     # 检查vector store状态
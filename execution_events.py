@@ -0,0 +1,127 @@
+"""
+执行事件通道 | Execution Event Channels
+每个执行一个发布/订阅通道，SSE 客户端只在有变化时被唤醒，并且只接收增量
+One publish/subscribe channel per execution: SSE clients are woken only when
+something changes and only receive the delta
+
+增量格式 | Delta format:
+- 普通键（status、current_step、partial_*、final_result、error）覆盖旧值
+  Plain keys (status, current_step, partial_*, final_result, error) overwrite
+- new_steps: 追加到步骤列表 | Appended to the step list
+- token_deltas: {channel: text}，按通道拼接 | Concatenated per channel
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# 通道关闭标记 | Channel closed sentinel
+CLOSED = object()
+
+
+def merge_delta(target: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将一个增量合并到目标字典中 | Merge one delta into the target dict
+
+    Args:
+        target: 被更新的字典（快照或待发送的合并消息）| Dict to update (snapshot or pending message)
+        delta: 新的增量 | New delta
+
+    Returns:
+        更新后的 target | The updated target
+    """
+    for key, value in delta.items():
+        if key == 'new_steps':
+            target.setdefault('new_steps', []).extend(value)
+        elif key == 'token_deltas':
+            tokens = target.setdefault('token_deltas', {})
+            for channel, text in value.items():
+                tokens[channel] = tokens.get(channel, '') + text
+        else:
+            target[key] = value
+    return target
+
+
+class ExecutionChannel:
+    """
+    单个执行的事件通道 | Event channel for a single execution
+
+    通道本身维护一份合并后的快照，订阅时原子地返回快照并注册队列，
+    因此晚到的客户端既不会丢失也不会重复接收增量
+    The channel keeps a merged snapshot; subscribing returns the snapshot and
+    registers the queue atomically, so late clients neither miss nor duplicate deltas
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Dict[str, Any] = {}
+        self._subscribers = []
+        self.closed = False
+
+    def publish(self, delta: Dict[str, Any]):
+        """发布增量并唤醒所有订阅者 | Publish a delta and wake all subscribers"""
+        if not delta:
+            return
+        with self._lock:
+            if self.closed:
+                return
+            merge_delta(self._snapshot, delta)
+            for subscriber in self._subscribers:
+                subscriber.put(delta)
+
+    def close(self):
+        """关闭通道，订阅者收到结束标记 | Close the channel; subscribers receive the end marker"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            for subscriber in self._subscribers:
+                subscriber.put(CLOSED)
+
+    def subscribe(self) -> Tuple[Dict[str, Any], Optional[queue.Queue]]:
+        """
+        订阅通道 | Subscribe to the channel
+
+        Returns:
+            (快照, 队列)；通道已关闭时队列为 None | (snapshot, queue); queue is None if already closed
+        """
+        with self._lock:
+            snapshot = merge_delta({}, self._snapshot)
+            if self.closed:
+                return snapshot, None
+            subscriber = queue.Queue()
+            self._subscribers.append(subscriber)
+            return snapshot, subscriber
+
+    def unsubscribe(self, subscriber: Optional[queue.Queue]):
+        """取消订阅 | Unsubscribe"""
+        if subscriber is None:
+            return
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+
+def drain(subscriber: queue.Queue, timeout: float) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    阻塞等待下一个增量，并合并队列中已积压的增量
+    Block for the next delta, then coalesce any deltas already queued
+
+    Returns:
+        (合并后的消息或 None（超时）, 通道是否已关闭)
+        (coalesced message or None on timeout, whether the channel closed)
+    """
+    try:
+        item = subscriber.get(timeout=timeout)
+    except queue.Empty:
+        return None, False
+
+    message: Dict[str, Any] = {}
+    while True:
+        if item is CLOSED:
+            return message or None, True
+        merge_delta(message, item)
+        try:
+            item = subscriber.get_nowait()
+        except queue.Empty:
+            return message, False
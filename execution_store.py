@@ -0,0 +1,230 @@
+"""
+执行状态存储 | Execution State Store
+将执行状态从进程内字典抽象出来，使多个 gunicorn worker 可以共享状态
+Abstracts execution state away from a process-local dict so multiple gunicorn
+workers can share it
+
+实现 | Implementations:
+1. InMemoryExecutionStateStore: 进程内存储（单 worker）| Process-local (single worker)
+2. SQLiteExecutionStateStore: SQLite WAL 文件，跨进程共享 | SQLite WAL file shared across processes
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from logger_config import logger
+
+# 已结束的执行状态，可被淘汰 | Finished statuses, eligible for eviction
+FINISHED_STATUSES = ("completed", "error", "cancelled")
+
+
+class ExecutionStateStore(ABC):
+    """
+    执行状态存储基类 | Base class for execution state stores
+
+    每次 set 都会递增该执行的版本号，读取方可以先比较版本号，避免重复加载未变化的状态
+    Every set bumps the execution's version so readers can compare versions
+    before loading unchanged state
+    """
+
+    @abstractmethod
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """读取执行状态，不存在时返回 None | Read an execution's state, or None if unknown"""
+        pass
+
+    @abstractmethod
+    def set(self, execution_id: str, state: Dict[str, Any]):
+        """写入执行状态并递增版本号 | Write an execution's state and bump its version"""
+        pass
+
+    @abstractmethod
+    def delete(self, execution_id: str):
+        """删除执行状态 | Delete an execution's state"""
+        pass
+
+    @abstractmethod
+    def get_version(self, execution_id: str) -> Optional[int]:
+        """读取版本号，不存在时返回 None | Read an execution's version, or None if unknown"""
+        pass
+
+    @abstractmethod
+    def list_ids(self) -> List[str]:
+        """列出所有执行ID | List all execution IDs"""
+        pass
+
+    @abstractmethod
+    def list_meta(self) -> List[Tuple[str, str, float]]:
+        """
+        列出所有执行的元数据 | List metadata of all executions
+
+        Returns:
+            [(execution_id, status, updated_at), ...]
+        """
+        pass
+
+    def evict_finished(self, ttl_seconds: float, max_finished: int) -> List[str]:
+        """
+        淘汰已结束的执行：超过 TTL 的全部淘汰，其余按最近更新时间只保留 max_finished 个
+        Evict finished executions: all past the TTL, then the least recently updated
+        beyond max_finished
+
+        Returns:
+            被淘汰的执行ID | Evicted execution IDs
+        """
+        now = time.time()
+        finished = sorted(
+            (updated_at, execution_id)
+            for execution_id, status, updated_at in self.list_meta()
+            if status in FINISHED_STATUSES
+        )
+        evicted = [execution_id for updated_at, execution_id in finished if now - updated_at > ttl_seconds]
+        remaining = [execution_id for updated_at, execution_id in finished if now - updated_at <= ttl_seconds]
+        if len(remaining) > max_finished:
+            evicted.extend(remaining[:len(remaining) - max_finished])
+
+        for execution_id in evicted:
+            self.delete(execution_id)
+        return evicted
+
+    def __contains__(self, execution_id: str) -> bool:
+        return self.get_version(execution_id) is not None
+
+
+class InMemoryExecutionStateStore(ExecutionStateStore):
+    """进程内执行状态存储 | Process-local execution state store"""
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._states.get(execution_id)
+
+    def set(self, execution_id: str, state: Dict[str, Any]):
+        with self._lock:
+            self._states[execution_id] = state
+            self._versions[execution_id] = self._versions.get(execution_id, 0) + 1
+            self._updated_at[execution_id] = time.time()
+
+    def delete(self, execution_id: str):
+        with self._lock:
+            self._states.pop(execution_id, None)
+            self._versions.pop(execution_id, None)
+            self._updated_at.pop(execution_id, None)
+
+    def get_version(self, execution_id: str) -> Optional[int]:
+        with self._lock:
+            return self._versions.get(execution_id)
+
+    def list_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._states.keys())
+
+    def list_meta(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            return [
+                (execution_id, state.get("status"), self._updated_at[execution_id])
+                for execution_id, state in self._states.items()
+            ]
+
+
+class SQLiteExecutionStateStore(ExecutionStateStore):
+    """
+    基于 SQLite（WAL 模式）的共享执行状态存储
+    Shared execution state store backed by SQLite in WAL mode
+
+    所有 worker 指向同一个数据库文件即可共享状态
+    All workers pointing at the same database file share state
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS execution_states ("
+            "execution_id TEXT PRIMARY KEY, state TEXT NOT NULL, "
+            "version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM execution_states WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, execution_id: str, state: Dict[str, Any]):
+        payload = json.dumps(state, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO execution_states (execution_id, state, version, updated_at) "
+                "VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(execution_id) DO UPDATE SET "
+                "state = excluded.state, version = version + 1, updated_at = excluded.updated_at",
+                (execution_id, payload, time.time())
+            )
+            self._conn.commit()
+
+    def delete(self, execution_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM execution_states WHERE execution_id = ?", (execution_id,))
+            self._conn.commit()
+
+    def get_version(self, execution_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM execution_states WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def list_ids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT execution_id FROM execution_states").fetchall()
+        return [row[0] for row in rows]
+
+    def list_meta(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT execution_id, json_extract(state, '$.status'), updated_at FROM execution_states"
+            ).fetchall()
+        return [(row[0], row[1], row[2]) for row in rows]
+
+
+def create_execution_store(db_path: Optional[str] = None) -> ExecutionStateStore:
+    """
+    按配置创建执行状态存储 | Create the execution state store from config
+
+    Args:
+        db_path: SQLite 后端的数据库文件，默认 EXECUTION_STORE_DB_PATH
+                 Database file for the SQLite backend, defaults to EXECUTION_STORE_DB_PATH
+
+    Returns:
+        执行状态存储实例 | Execution state store instance
+    """
+    from config import EXECUTION_STORE_BACKEND, EXECUTION_STORE_DB_PATH
+
+    if EXECUTION_STORE_BACKEND == "sqlite":
+        db_path = db_path or EXECUTION_STORE_DB_PATH
+        logger.info(f"Using SQLite execution state store at {db_path}")
+        return SQLiteExecutionStateStore(db_path)
+
+    if EXECUTION_STORE_BACKEND != "memory":
+        logger.warning(f"Unknown EXECUTION_STORE_BACKEND '{EXECUTION_STORE_BACKEND}', using memory")
+    logger.info("Using in-memory execution state store")
+    return InMemoryExecutionStateStore()
@@ -11,9 +11,14 @@ bind = "0.0.0.0:5000"
 backlog = 2048
 
 # Worker 进程
-# 注意：由于 execution_states 存储在进程内存中，多worker会导致状态不共享
-# 如需多worker支持，需要使用Redis等外部存储来共享状态
-workers = 1  # 单worker确保状态共享
+# 注意：EXECUTION_STORE_BACKEND = "memory" 时状态存储在进程内存中，只能使用单worker
+# 设置 EXECUTION_STORE_BACKEND = "sqlite" 后各 worker 共享状态，可通过 GUNICORN_WORKERS 扩展
+from config import EXECUTION_STORE_BACKEND
+
+if EXECUTION_STORE_BACKEND == "memory":
+    workers = 1  # 单worker确保状态共享
+else:
+    workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
 worker_class = "sync"
 worker_connections = 1000
 timeout = 600  # 10分钟，LLM 调用可能需要较长时间
@@ -41,6 +46,22 @@ def when_ready(server):
     """服务器就绪时调用"""
     server.log.info("Product Master server is ready. Spawning workers")
 
+def post_worker_init(worker):
+    """Worker 加载应用后调用，在后台预热 RAG，使首个请求不再承担模型加载"""
+    try:
+        from web_app import start_rag_warmup
+        start_rag_warmup()
+    except Exception as e:
+        worker.log.warning(f"Failed to start RAG warm-up: {e}")
+
+def worker_exit(server, worker):
+    """Worker 退出时调用，释放共享的 LLM 连接池"""
+    try:
+        from web_app import close_shared_orchestrator
+        close_shared_orchestrator()
+    except Exception as e:
+        server.log.warning(f"Failed to close shared orchestrator: {e}")
+
 def on_exit(server):
     """服务器退出时调用"""
     server.log.info("Shutting down Product Master server...")
@@ -16,9 +16,28 @@ from config import (
     RAG_COLLECTION_NAME,
     RAG_EMBEDDING_MODEL,
     RAG_CHUNK_SIZE,
-    RAG_CHUNK_OVERLAP
+    RAG_CHUNK_OVERLAP,
+    RAG_CHUNK_SIZE_UNIT,
+    RAG_EXTRACT_WORKERS,
+    RAG_EXTRACT_PAGES_PER_TASK,
+    RAG_INGEST_BATCH_SIZE,
+    RAG_INGEST_QUEUE_SIZE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_VECTOR_BACKEND
 )
 
+def print_progress(progress):
+    """Print a single-line progress update"""
+    print(
+        f"\r  files {progress['files_done']}/{progress['files_total']}"
+        f" | pages {progress['pages']} | chunks {progress['chunks']}"
+        f" | embedded {progress['embedded']} ({progress['embeddings_per_second']}/s)"
+        f" | re-used {progress['reused']} | cached {progress['cached']}",
+        end="",
+        flush=True
+    )
+
 def main():
     print("=" * 80)
     print("Document Indexing Script")
@@ -33,7 +52,15 @@ def main():
         collection_name=RAG_COLLECTION_NAME,
         embedding_model=RAG_EMBEDDING_MODEL,
         chunk_size=RAG_CHUNK_SIZE,
-        chunk_overlap=RAG_CHUNK_OVERLAP
+        chunk_overlap=RAG_CHUNK_OVERLAP,
+        chunk_unit=RAG_CHUNK_SIZE_UNIT,
+        extract_workers=RAG_EXTRACT_WORKERS,
+        pages_per_task=RAG_EXTRACT_PAGES_PER_TASK,
+        ingest_batch_size=RAG_INGEST_BATCH_SIZE,
+        ingest_queue_size=RAG_INGEST_QUEUE_SIZE,
+        embedding_cache_dir=RAG_EMBEDDING_CACHE_DIR,
+        embedding_cache_max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+        vector_backend=RAG_VECTOR_BACKEND
     )
     print("✓ RAG Retriever initialized")
     print()
@@ -41,10 +68,13 @@ def main():
     # Index documents
     print("Starting document indexing...")
     print(f"Documents directory: {RAG_DOCUMENTS_DIR}")
-    print(f"Vector DB directory: {RAG_VECTOR_DB_DIR}")
+    print(f"Vector DB directory: {RAG_VECTOR_DB_DIR} ({RAG_VECTOR_BACKEND})")
     print()
 
-    result = retriever.ingest_documents(clear_existing=True)
+    # 默认增量索引，--full 时清空后全量重建 | Incremental by default, --full rebuilds from scratch
+    full = "--full" in sys.argv
+    print(f"Mode: {'full rebuild' if full else 'incremental'}")
+    result = retriever.ingest_documents(clear_existing=full, progress_callback=print_progress)
 
     print()
     print("=" * 80)
@@ -55,6 +85,11 @@ def main():
     print(f"Documents processed: {result.get('documents_processed', 0)}")
     print(f"Pages processed: {result.get('pages_processed', 0)}")
     print(f"Chunks created: {result.get('chunks_created', 0)}")
+    print(f"Chunks embedded: {result.get('chunks_embedded', 0)}")
+    print(f"Chunks re-used: {result.get('chunks_reused', 0)}")
+    print(f"Chunks from embedding cache: {result.get('chunks_cached', 0)}")
+    print(f"Chunks deleted: {result.get('chunks_deleted', 0)}")
+    print(f"Unchanged files skipped: {result.get('files_unchanged', 0)}")
 
     if 'document_names' in result:
         print()
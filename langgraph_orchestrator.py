@@ -4,11 +4,45 @@ LangGraph 版本的多智能体编排系统 | LangGraph Version of Multi-Agent O
 Uses LangGraph's state graph to manage the execution flow of agents
 """
 
-from typing import TypedDict, List, Any, Dict
+from typing import TypedDict, List, Any, Dict, Callable, Optional, Annotated
 from datetime import datetime
 import json
+import operator
+import time
 from langgraph.graph import StateGraph, END
 from logger_config import logger, log_function_call
+import async_runtime
+
+# 可选的工作流拓扑 | Available workflow topologies
+TOPOLOGY_SERIAL = "serial"
+TOPOLOGY_PARALLEL = "parallel"
+
+
+def merge_timings(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    """合并节点耗时（并行节点各自写入）| Merge node timings (parallel nodes write their own)"""
+    return {**(left or {}), **(right or {})}
+
+
+def apply_state_update(state: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按状态定义中的 reducer 将节点更新合并到状态中（用于消费 stream 输出）
+    Merge a node update into a state using the schema's reducers (for consuming stream output)
+
+    Args:
+        state: 累积的状态 | Accumulated state
+        update: 单个节点返回的部分更新 | Partial update returned by one node
+
+    Returns:
+        更新后的 state | The updated state
+    """
+    for key, value in update.items():
+        if key == "execution_log":
+            state["execution_log"] = state.get("execution_log", []) + list(value)
+        elif key == "node_timings":
+            state["node_timings"] = merge_timings(state.get("node_timings", {}), value)
+        else:
+            state[key] = value
+    return state
 
 
 class OrchestratorState(TypedDict):
@@ -30,11 +64,20 @@ class OrchestratorState(TypedDict):
     
     # 最终结果 | Final results
     final_summary: Dict[str, Any]  # 最终汇总 | Final summary
-    execution_log: List[str]  # 执行日志 | Execution log
+    # 节点只返回新增的日志条目，由 reducer 拼接（并行节点可同时写入）
+    # Nodes return only their new entries, concatenated by the reducer (parallel nodes may write together)
+    execution_log: Annotated[List[str], operator.add]  # 执行日志 | Execution log
     
     # 元数据 | Metadata
     timestamp: str  # 时间戳 | Timestamp
     execution_time: float  # 执行时间 | Execution time
+    workflow_topology: str  # 工作流拓扑 | Workflow topology
+    node_timings: Annotated[Dict[str, float], merge_timings]  # 各节点耗时（秒）| Per-node duration (seconds)
+
+    # 流式输出 | Streaming
+    # 可选的 token 回调 (channel, delta)，channel 如 'research.target_users'、'evaluation'
+    # Optional token callback (channel, delta), channel e.g. 'research.target_users', 'evaluation'
+    token_callback: Optional[Callable[[str, str], None]]
 
 
 class LangGraphOrchestrator:
@@ -65,7 +108,7 @@ class LangGraphOrchestrator:
     - 更好的错误处理和检查点功能
     """
     
-    def __init__(self, researcher, doc_assistant, evaluator, llm=None):
+    def __init__(self, researcher, doc_assistant, evaluator, llm=None, topology: Optional[str] = None):
         """
         初始化 LangGraph 编排器 | Initialize LangGraph Orchestrator
         
@@ -74,6 +117,8 @@ class LangGraphOrchestrator:
             doc_assistant: 文档助手Agent | Doc Assistant Agent
             evaluator: 可行性评估员Agent | Feasibility Evaluator Agent
             llm: 语言模型实例（用于汇总）| Language model instance (for summarization)
+            topology: 工作流拓扑 "serial" 或 "parallel"，默认读取配置
+                      Workflow topology "serial" or "parallel", defaults to config
         """
         # 存储三个Agent的实例 | Store instances of three agents
         self.researcher = researcher
@@ -93,9 +138,39 @@ class LangGraphOrchestrator:
         # 编排器名称 | Orchestrator name
         self.name = "LangGraph Orchestrator"
         
+        # 工作流拓扑 | Workflow topology
+        if topology is None:
+            from config import WORKFLOW_TOPOLOGY
+            topology = WORKFLOW_TOPOLOGY
+        if topology not in (TOPOLOGY_SERIAL, TOPOLOGY_PARALLEL):
+            logger.warning(f"Unknown workflow topology '{topology}', using {TOPOLOGY_SERIAL}")
+            topology = TOPOLOGY_SERIAL
+        self.topology = topology
+        
         # 构建 LangGraph 工作流 | Build LangGraph workflow
         self.workflow = self._build_workflow()
     
+    @staticmethod
+    def _timed_node(name: str, node: Callable[[OrchestratorState], Dict[str, Any]]):
+        """
+        包装节点函数，将其耗时写入 node_timings | Wrap a node so its duration is written to node_timings
+        
+        Args:
+            name: 节点名称 | Node name
+            node: 异步节点函数 | Async node function
+            
+        Returns:
+            包装后的节点函数 | Wrapped node function
+        """
+        async def timed(state: OrchestratorState) -> Dict[str, Any]:
+            started = time.perf_counter()
+            update = await node(state)
+            elapsed = round(time.perf_counter() - started, 3)
+            logger.info(f"Node {name} took {elapsed:.2f}s")
+            return {**update, "node_timings": {name: elapsed}}
+        timed.__name__ = node.__name__
+        return timed
+    
     def _build_workflow(self) -> StateGraph:
         """
         构建 LangGraph 工作流图 | Build LangGraph workflow graph
@@ -103,22 +178,21 @@ class LangGraphOrchestrator:
         Returns:
             编译后的 LangGraph 应用 | Compiled LangGraph application
         """
-        logger.info("Building LangGraph workflow...")
+        logger.info(f"Building LangGraph workflow (topology: {self.topology})...")
         
         # 创建状态图 | Create state graph
         workflow = StateGraph(OrchestratorState)
         logger.debug("Created StateGraph with OrchestratorState")
         
         # 添加节点到图中 | Add nodes to the graph
-        # 每个节点是一个函数，接收 state 并返回更新后的 state
+        # 每个节点是一个函数，接收 state 并返回状态的部分更新
+        # Each node is a function that takes the state and returns a partial update
         logger.debug("Adding nodes to workflow...")
-        workflow.add_node("researcher", self.researcher_node)
+        workflow.add_node("researcher", self._timed_node("researcher", self.researcher_node))
         logger.debug("  ✓ Added node: researcher")
-        workflow.add_node("doc_assistant", self.doc_assistant_node)
-        logger.debug("  ✓ Added node: doc_assistant")
-        workflow.add_node("evaluator", self.evaluator_node)
+        workflow.add_node("evaluator", self._timed_node("evaluator", self.evaluator_node))
         logger.debug("  ✓ Added node: evaluator")
-        workflow.add_node("aggregation", self.aggregation_node)
+        workflow.add_node("aggregation", self._timed_node("aggregation", self.aggregation_node))
         logger.debug("  ✓ Added node: aggregation")
         
         # 定义图的入口点 | Define entry point of the graph
@@ -126,17 +200,36 @@ class LangGraphOrchestrator:
         logger.debug("Set entry point: researcher")
         
         # 添加边（定义节点间的连接）| Add edges (define connections between nodes)
-        # 这些边定义了工作流的执行顺序
-        # 新顺序: researcher -> evaluator -> aggregation -> doc_assistant
         logger.debug("Adding edges to workflow...")
         workflow.add_edge("researcher", "evaluator")
         logger.debug("  ✓ Edge: researcher -> evaluator")
         workflow.add_edge("evaluator", "aggregation")
         logger.debug("  ✓ Edge: evaluator -> aggregation")
-        workflow.add_edge("aggregation", "doc_assistant")
-        logger.debug("  ✓ Edge: aggregation -> doc_assistant")
-        workflow.add_edge("doc_assistant", END)  # END 是 LangGraph 的特殊节点，表示工作流结束
-        logger.debug("  ✓ Edge: doc_assistant -> END")
+        
+        if self.topology == TOPOLOGY_PARALLEL:
+            # 并行拓扑: researcher 之后分叉，evaluator -> aggregation 与 doc_draft 同时执行，
+            # 两者都完成后由 merge 汇合
+            # Parallel: fan out after researcher; evaluator -> aggregation runs alongside
+            # doc_draft, and merge joins once both are done
+            workflow.add_node("doc_draft", self._timed_node("doc_draft", self.doc_draft_node))
+            logger.debug("  ✓ Added node: doc_draft")
+            workflow.add_node("merge", self._timed_node("merge", self.merge_node))
+            logger.debug("  ✓ Added node: merge")
+            workflow.add_edge("researcher", "doc_draft")
+            logger.debug("  ✓ Edge: researcher -> doc_draft")
+            workflow.add_edge(["aggregation", "doc_draft"], "merge")
+            logger.debug("  ✓ Edge: [aggregation, doc_draft] -> merge")
+            workflow.add_edge("merge", END)
+            logger.debug("  ✓ Edge: merge -> END")
+        else:
+            # 串行拓扑: researcher -> evaluator -> aggregation -> doc_assistant
+            # Serial: researcher -> evaluator -> aggregation -> doc_assistant
+            workflow.add_node("doc_assistant", self._timed_node("doc_assistant", self.doc_assistant_node))
+            logger.debug("  ✓ Added node: doc_assistant")
+            workflow.add_edge("aggregation", "doc_assistant")
+            logger.debug("  ✓ Edge: aggregation -> doc_assistant")
+            workflow.add_edge("doc_assistant", END)  # END 是 LangGraph 的特殊节点，表示工作流结束
+            logger.debug("  ✓ Edge: doc_assistant -> END")
         
         # 编译图 | Compile the graph
         # 编译后会进行验证，确保图的完整性
@@ -155,7 +248,7 @@ class LangGraphOrchestrator:
         return app
     
     @log_function_call
-    def researcher_node(self, state: OrchestratorState) -> OrchestratorState:
+    async def researcher_node(self, state: OrchestratorState) -> Dict[str, Any]:
         """
         研究员节点 | Researcher Node
         执行产品研究的图节点
@@ -165,7 +258,7 @@ class LangGraphOrchestrator:
             state: 当前编排器状态 | Current orchestrator state
             
         Returns:
-            更新了research_result的状态 | State with updated research_result
+            包含 research_result 的状态更新 | State update with research_result
         """
         logger.info("=" * 60)
         logger.info("NODE: researcher_node - Starting execution")
@@ -174,31 +267,33 @@ class LangGraphOrchestrator:
         
         # 记录节点执行 | Log node execution
         log_message = "📚 Researcher Node: Executing product research"
-        state["execution_log"].append(log_message)
         print(f"→ {log_message}")
         logger.info(log_message)
         
         # 调用研究员Agent | Call researcher agent
-        logger.info("Calling ProductResearcher.research()...")
-        research_result = self.researcher.research(state["user_input"])
-        logger.info("✓ ProductResearcher.research() completed")
+        logger.info("Calling ProductResearcher.aresearch()...")
+        token_callback = state.get("token_callback")
+        research_result = await self.researcher.aresearch(
+            state["user_input"],
+            on_token=(lambda key, delta: token_callback(f"research.{key}", delta)) if token_callback else None
+        )
+        logger.info("✓ ProductResearcher.aresearch() completed")
         logger.debug(f"Research result keys: {list(research_result.get('research_result', {}).keys())}")
         
-        # 更新状态中的研究结果 | Update research result in state
-        state["research_result"] = research_result["research_result"]
-        logger.debug("Updated state['research_result']")
-        
         # 记录完成 | Log completion
         completion_message = "✓ Researcher Node Completed"
-        state["execution_log"].append(completion_message)
         print(f"✓ {completion_message}\n")
         logger.info(completion_message)
         logger.info("=" * 60)
         
-        return state
+        # 返回研究结果 | Return research result
+        return {
+            "research_result": research_result["research_result"],
+            "execution_log": [log_message, completion_message]
+        }
     
     @log_function_call
-    def doc_assistant_node(self, state: OrchestratorState) -> OrchestratorState:
+    async def doc_assistant_node(self, state: OrchestratorState) -> Dict[str, Any]:
         """
         文档助手节点 | Doc Assistant Node
         执行产品文档生成的图节点（基于研究、评估和汇总结果）
@@ -208,20 +303,19 @@ class LangGraphOrchestrator:
             state: 当前编排器状态 | Current orchestrator state
             
         Returns:
-            更新了document_content的状态 | State with updated document_content
+            包含 document_content 的状态更新 | State update with document_content
         """
         logger.info("=" * 60)
         logger.info("NODE: doc_assistant_node - Starting execution")
         
         # 记录节点执行 | Log node execution
         log_message = "📝 Doc Assistant Node: Generating product documentation based on all results"
-        state["execution_log"].append(log_message)
         print(f"→ {log_message}")
         logger.info(log_message)
         
         # 调用文档助手Agent | Call doc assistant agent
         # 注意：现在使用 research_result、evaluation_result 和 final_summary
-        logger.info("Calling DocAssistant.generate_doc_with_summary()...")
+        logger.info("Calling DocAssistant.agenerate_doc()...")
         
         # 构建包含所有信息的研究结果 | Build research result with all information
         enriched_research = {
@@ -230,27 +324,137 @@ class LangGraphOrchestrator:
             "final_summary": state["final_summary"]
         }
         
-        doc_result = self.doc_assistant.generate_doc(
+        token_callback = state.get("token_callback")
+        doc_result = await self.doc_assistant.agenerate_doc(
             state["user_input"],
-            enriched_research
+            enriched_research,
+            on_token=(lambda delta: token_callback("documentation", delta)) if token_callback else None
         )
-        logger.info("✓ DocAssistant.generate_doc() completed")
-        
-        # 更新状态中的文档内容 | Update document content in state
-        state["document_content"] = doc_result["document"]
+        logger.info("✓ DocAssistant.agenerate_doc() completed")
         logger.debug(f"Document length: {len(doc_result['document'])}")
         
         # 记录完成 | Log completion
         completion_message = "✓ Doc Assistant Node Completed"
-        state["execution_log"].append(completion_message)
         print(f"✓ {completion_message}\n")
         logger.info(completion_message)
         logger.info("=" * 60)
         
-        return state
+        # 返回文档内容 | Return document content
+        return {
+            "document_content": doc_result["document"],
+            "execution_log": [log_message, completion_message]
+        }
     
     @log_function_call
-    def evaluator_node(self, state: OrchestratorState) -> OrchestratorState:
+    async def doc_draft_node(self, state: OrchestratorState) -> Dict[str, Any]:
+        """
+        文档草稿节点（并行拓扑）| Doc Draft Node (parallel topology)
+        仅基于研究结果生成 PRD 草稿，与评估、汇总同时执行
+        Generates a PRD draft from the research results only, running alongside evaluation and aggregation
+        
+        Args:
+            state: 当前编排器状态 | Current orchestrator state
+            
+        Returns:
+            包含 document_content 的状态更新 | State update with document_content
+        """
+        logger.info("=" * 60)
+        logger.info("NODE: doc_draft_node - Starting execution")
+        
+        # 记录节点执行 | Log node execution
+        log_message = "📝 Doc Draft Node: Drafting product documentation from research results"
+        print(f"→ {log_message}")
+        logger.info(log_message)
+        
+        # 调用文档助手Agent（只使用研究结果）| Call doc assistant agent (research results only)
+        token_callback = state.get("token_callback")
+        doc_result = await self.doc_assistant.agenerate_doc(
+            state["user_input"],
+            state["research_result"],
+            on_token=(lambda delta: token_callback("documentation", delta)) if token_callback else None
+        )
+        logger.debug(f"Draft length: {len(doc_result['document'])}")
+        
+        # 记录完成 | Log completion
+        completion_message = "✓ Doc Draft Node Completed"
+        print(f"✓ {completion_message}\n")
+        logger.info(completion_message)
+        logger.info("=" * 60)
+        
+        return {
+            "document_content": doc_result["document"],
+            "execution_log": [log_message, completion_message]
+        }
+    
+    @log_function_call
+    async def merge_node(self, state: OrchestratorState) -> Dict[str, Any]:
+        """
+        合并节点（并行拓扑）| Merge Node (parallel topology)
+        将汇总结果以执行摘要章节的形式追加到 PRD 草稿，不再调用 LLM
+        Appends the summary to the PRD draft as an executive summary section, without another LLM call
+        
+        Args:
+            state: 当前编排器状态 | Current orchestrator state
+            
+        Returns:
+            包含合并后 document_content 的状态更新 | State update with the merged document_content
+        """
+        logger.info("=" * 60)
+        logger.info("NODE: merge_node - Starting execution")
+        
+        log_message = "🔗 Merge Node: Merging evaluation summary into the documentation draft"
+        print(f"→ {log_message}")
+        logger.info(log_message)
+        
+        document = state["document_content"].rstrip() + "\n\n" + self._format_summary_section(
+            state["final_summary"]
+        )
+        
+        completion_message = "✓ Merge Node Completed"
+        print(f"✓ {completion_message}\n")
+        logger.info(completion_message)
+        logger.info("=" * 60)
+        
+        return {
+            "document_content": document,
+            "execution_log": [log_message, completion_message]
+        }
+    
+    @staticmethod
+    def _format_summary_section(summary: Dict[str, Any]) -> str:
+        """
+        将汇总结果格式化为 Markdown 章节 | Format the summary as a Markdown section
+        
+        Args:
+            summary: aggregation_node 生成的汇总 | Summary produced by aggregation_node
+            
+        Returns:
+            Markdown 文本 | Markdown text
+        """
+        lines = ["## Feasibility & Executive Summary", ""]
+        if summary.get("feasibility_score") is not None:
+            lines.extend([f"**Feasibility Score:** {summary['feasibility_score']}/10", ""])
+        
+        sections = [
+            ("value_propositions", "Core Value Propositions"),
+            ("success_factors", "Key Success Factors"),
+            ("risks_and_mitigations", "Key Risks and Mitigations"),
+            ("next_steps", "Recommended Next Steps")
+        ]
+        for key, title in sections:
+            items = summary.get(key)
+            if not items:
+                continue
+            if not isinstance(items, list):
+                items = [items]
+            lines.append(f"### {title}")
+            lines.extend(f"- {item}" for item in items)
+            lines.append("")
+        
+        return "\n".join(lines).rstrip() + "\n"
+    
+    @log_function_call
+    async def evaluator_node(self, state: OrchestratorState) -> Dict[str, Any]:
         """
         可行性评估节点 | Feasibility Evaluator Node
         执行可行性评估的图节点（基于研究结果）
@@ -260,42 +464,43 @@ class LangGraphOrchestrator:
             state: 当前编排器状态 | Current orchestrator state
             
         Returns:
-            更新了evaluation_result的状态 | State with updated evaluation_result
+            包含 evaluation_result 的状态更新 | State update with evaluation_result
         """
         logger.info("=" * 60)
         logger.info("NODE: evaluator_node - Starting execution")
         
         # 记录节点执行 | Log node execution
         log_message = "🔍 Evaluator Node: Conducting feasibility assessment based on research"
-        state["execution_log"].append(log_message)
         print(f"→ {log_message}")
         logger.info(log_message)
         
         # 调用可行性评估Agent | Call feasibility evaluator agent
         # 注意：现在只使用 research_result，不再依赖 document_content
-        logger.info("Calling FeasibilityEvaluator.evaluate()...")
-        evaluation_result = self.evaluator.evaluate(
+        logger.info("Calling FeasibilityEvaluator.aevaluate()...")
+        token_callback = state.get("token_callback")
+        evaluation_result = await self.evaluator.aevaluate(
             state["user_input"],
             state["research_result"],
-            ""  # 不再使用 document_content
+            "",  # 不再使用 document_content
+            on_token=(lambda delta: token_callback("evaluation", delta)) if token_callback else None
         )
-        logger.info("✓ FeasibilityEvaluator.evaluate() completed")
-        
-        # 更新状态中的评估结果 | Update evaluation result in state
-        state["evaluation_result"] = evaluation_result["evaluation_result"]
+        logger.info("✓ FeasibilityEvaluator.aevaluate() completed")
         logger.debug(f"Evaluation keys: {list(evaluation_result['evaluation_result'].keys())}")
         
         # 记录完成 | Log completion
         completion_message = "✓ Evaluator Node Completed"
-        state["execution_log"].append(completion_message)
         print(f"✓ {completion_message}\n")
         logger.info(completion_message)
         logger.info("=" * 60)
         
-        return state
+        # 返回评估结果 | Return evaluation result
+        return {
+            "evaluation_result": evaluation_result["evaluation_result"],
+            "execution_log": [log_message, completion_message]
+        }
     
     @log_function_call
-    def aggregation_node(self, state: OrchestratorState) -> OrchestratorState:
+    async def aggregation_node(self, state: OrchestratorState) -> Dict[str, Any]:
         """
         聚合节点 | Aggregation Node
         汇总研究结果和评估结果并提炼关键点
@@ -305,14 +510,13 @@ class LangGraphOrchestrator:
             state: 当前编排器状态 | Current orchestrator state
             
         Returns:
-            更新了final_summary的状态 | State with updated final_summary
+            包含 final_summary 的状态更新 | State update with final_summary
         """
         logger.info("=" * 60)
         logger.info("NODE: aggregation_node - Starting execution")
         
         # 记录节点执行 | Log node execution
         log_message = "🎯 Aggregation Node: Summarizing research and evaluation results"
-        state["execution_log"].append(log_message)
         print(f"→ {log_message}")
         logger.info(log_message)
         
@@ -350,7 +554,7 @@ IMPORTANT: All text content in the JSON response must be in English only.
 """
         
         # 调用 LLM 进行汇总 | Call LLM for summarization
-        summary_response = self.llm.invoke(prompt)
+        summary_response = await self.llm.ainvoke(prompt)
         
         # 解析 JSON 响应 | Parse JSON response
         summary = parse_json_response(summary_response, [
@@ -358,25 +562,41 @@ IMPORTANT: All text content in the JSON response must be in English only.
             "risks_and_mitigations", "next_steps"
         ])
         
-        # 更新状态中的最终汇总 | Update final summary in state
-        state["final_summary"] = summary
         logger.debug(f"Summary keys: {list(summary.keys())}")
         
         # 记录完成 | Log completion
         completion_message = "✓ Aggregation Node Completed"
-        state["execution_log"].append(completion_message)
         print(f"✓ {completion_message}\n")
         logger.info(completion_message)
         logger.info("=" * 60)
         
-        return state
+        # 返回最终汇总 | Return final summary
+        return {
+            "final_summary": summary,
+            "execution_log": [log_message, completion_message]
+        }
     
     @log_function_call
     def execute_workflow(self, user_input: str) -> OrchestratorState:
         """
-        执行完整的工作流 | Execute complete workflow
-        使用 LangGraph 的 invoke 方法执行编译后的图
-        Execute the compiled graph using LangGraph's invoke method
+        执行完整的工作流（同步接口）| Execute complete workflow (synchronous interface)
+        在进程共享的事件循环上运行 aexecute_workflow 并等待结果
+        Runs aexecute_workflow on the process-wide event loop and waits for the result
+        
+        Args:
+            user_input: 用户的产品需求输入 | User's product requirement input
+            
+        Returns:
+            最终的编排器状态 | Final orchestrator state
+        """
+        return async_runtime.run_sync(self.aexecute_workflow(user_input))
+    
+    @log_function_call
+    async def aexecute_workflow(self, user_input: str) -> OrchestratorState:
+        """
+        异步执行完整的工作流 | Execute complete workflow asynchronously
+        使用 LangGraph 的 ainvoke 方法执行编译后的图
+        Execute the compiled graph using LangGraph's ainvoke method
         
         Args:
             user_input: 用户的产品需求输入 | User's product requirement input
@@ -402,7 +622,7 @@ IMPORTANT: All text content in the JSON response must be in English only.
         print("🌐 LangGraph 编排工作流")
         print("="*80 + "\n")
         
-        # 使用 LangGraph 的 invoke 方法执行工作流
+        # 使用 LangGraph 的 ainvoke 方法执行工作流
         # LangGraph 会自动：
         # 1. 按照定义的边顺序执行节点
         # 2. 在节点间传递状态
@@ -410,10 +630,13 @@ IMPORTANT: All text content in the JSON response must be in English only.
         # 4. 支持流式输出（如果使用 stream 方法）
         logger.info("Invoking LangGraph workflow...")
         logger.info("Workflow execution flow:")
-        logger.info("  START -> researcher -> evaluator -> aggregation -> doc_assistant -> END")
+        if self.topology == TOPOLOGY_PARALLEL:
+            logger.info("  START -> researcher -> (evaluator -> aggregation | doc_draft) -> merge -> END")
+        else:
+            logger.info("  START -> researcher -> evaluator -> aggregation -> doc_assistant -> END")
         
         try:
-            final_state = self.workflow.invoke(initial_state)
+            final_state = await self.workflow.ainvoke(initial_state)
             logger.info("✓ LangGraph workflow execution completed successfully")
         except Exception as e:
             logger.error(f"✗ LangGraph workflow execution failed: {str(e)}", exc_info=True)
@@ -424,36 +647,62 @@ IMPORTANT: All text content in the JSON response must be in English only.
         execution_time = (end_time - start_time).total_seconds()
         final_state["execution_time"] = execution_time
         logger.info(f"Workflow execution time: {execution_time:.2f} seconds")
+        logger.info(f"Node timings ({self.topology}): {final_state.get('node_timings', {})}")
         logger.info(f"Workflow completed at: {end_time.isoformat()}")
         logger.info("=" * 80)
         
         return final_state
     
-    def stream_workflow(self, user_input: str):
+    async def astream_workflow(self, user_input: str,
+                               token_callback: Optional[Callable[[str, str], None]] = None):
         """
         流式执行工作流 | Stream workflow execution
-        使用 LangGraph 的 stream 方法，可以实时看到每个节点的执行
+        使用 LangGraph 的 astream 方法，可以实时看到每个节点的执行
         
         Args:
             user_input: 用户的产品需求输入 | User's product requirement input
+            token_callback: 可选的 token 回调 (channel, delta) | Optional token callback (channel, delta)
             
         Yields:
-            每个节点执行后的状态 | State after each node execution
+            每个节点返回的状态更新 {node_name: update}，可用 apply_state_update 累积
+            Each node's state update {node_name: update}; accumulate with apply_state_update
         """
         # 创建初始状态 | Create initial state
-        initial_state = self.create_initial_state(user_input)
+        initial_state = self.create_initial_state(user_input, token_callback)
         
-        # 使用 stream 方法流式执行
-        # 这会返回一个生成器，每次 yield 一个节点的执行结果
-        for state in self.workflow.stream(initial_state):
+        # 使用 astream 方法流式执行，每次 yield 一个节点的执行结果
+        # astream yields one node's result at a time
+        async for state in self.workflow.astream(initial_state):
             yield state
     
-    def create_initial_state(self, user_input: str) -> OrchestratorState:
+    def stream_workflow(self, user_input: str, token_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        流式执行工作流（同步接口）| Stream workflow execution (synchronous interface)
+        在进程共享的事件循环上逐个取出 astream_workflow 的结果
+        Pulls astream_workflow results one at a time from the process-wide event loop
+        
+        Yields:
+            每个节点返回的状态更新 {node_name: update} | Each node's state update {node_name: update}
+        """
+        updates = self.astream_workflow(user_input, token_callback)
+        try:
+            while True:
+                try:
+                    yield async_runtime.run_sync(updates.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            # 调用方提前停止时关闭异步生成器，释放工作流 | Close the async generator if the caller stops early, releasing the workflow
+            async_runtime.run_sync(updates.aclose())
+    
+    def create_initial_state(self, user_input: str,
+                             token_callback: Optional[Callable[[str, str], None]] = None) -> OrchestratorState:
         """
         创建初始状态 | Create initial state
         
         Args:
             user_input: 用户的产品需求输入 | User's product requirement input
+            token_callback: 可选的 token 回调 | Optional token callback
             
         Returns:
             初始化的编排器状态 | Initialized orchestrator state
@@ -467,7 +716,10 @@ IMPORTANT: All text content in the JSON response must be in English only.
             "final_summary": {},  # 初始化为空 | Initialize as empty
             "execution_log": [],  # 初始化为空日志列表 | Initialize as empty log list
             "timestamp": datetime.now().isoformat(),  # 记录时间戳 | Record timestamp
-            "execution_time": 0.0  # 执行时间 | Execution time
+            "execution_time": 0.0,  # 执行时间 | Execution time
+            "workflow_topology": self.topology,  # 工作流拓扑 | Workflow topology
+            "node_timings": {},  # 各节点耗时 | Per-node duration
+            "token_callback": token_callback  # 流式回调 | Streaming callback
         }
         
         return initial_state
@@ -0,0 +1,266 @@
+"""
+LLM 响应缓存 | LLM Response Cache
+基于内容寻址的 LLM 响应缓存，按 (model, temperature, prompt, max_tokens) 的哈希作为键
+Content-addressed LLM response cache keyed on a hash of (model, temperature, prompt, max_tokens)
+
+两级缓存 | Two tiers:
+1. 内存 LRU 层 | In-memory LRU tier
+2. 磁盘 SQLite 层 | On-disk SQLite tier
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from logger_config import logger
+
+
+def make_cache_key(model: str, temperature: float, prompt: str, max_tokens: int) -> str:
+    """
+    生成缓存键 | Build the cache key
+
+    Returns:
+        请求参数的 SHA-256 十六进制摘要 | SHA-256 hex digest of the request parameters
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "prompt": prompt, "max_tokens": max_tokens},
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    响应缓存基类 | Base class for response caches
+    子类实现 get/set/clear 即可接入 SimpleLLM
+    Subclasses implement get/set/clear to plug into SimpleLLM
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存的响应 | Read a cached response
+
+        Returns:
+            缓存的响应，未命中时返回 None | Cached response, or None on a miss
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str):
+        """写入响应 | Store a response"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """清空缓存 | Remove all entries"""
+        pass
+
+    def _record(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+class MemoryLRUCache(ResponseCache):
+    """内存 LRU 缓存（带 TTL）| In-memory LRU cache with TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._record(entry is not None)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update({"entries": len(self._entries), "max_entries": self.max_entries})
+        return stats
+
+
+class SQLiteCache(ResponseCache):
+    """磁盘 SQLite 缓存（带 TTL 和条目上限）| On-disk SQLite cache with TTL and entry limit"""
+
+    def __init__(self, db_path: str, max_entries: int = 5000, ttl_seconds: float = 86400):
+        super().__init__()
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] < now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            elif row is not None:
+                self._conn.execute(
+                    "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self._conn.commit()
+        self._record(row is not None)
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now)
+            )
+            # 清理过期条目并按最近访问时间淘汰超额条目
+            # Drop expired entries and evict least recently accessed ones over the limit
+            self._conn.execute("DELETE FROM llm_responses WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        stats.update({"entries": count, "max_entries": self.max_entries, "db_path": self.db_path})
+        return stats
+
+
+class TieredResponseCache(ResponseCache):
+    """
+    两级缓存：先查内存，再查 SQLite，命中后回填内存
+    Two-tier cache: memory first, then SQLite, promoting disk hits into memory
+    """
+
+    def __init__(self, memory: MemoryLRUCache, disk: Optional[SQLiteCache] = None):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["memory"] = self.memory.get_stats()
+        stats["disk"] = self.disk.get_stats() if self.disk is not None else None
+        return stats
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    获取进程级共享的响应缓存（按配置创建）| Get the process-wide response cache (built from config)
+
+    Returns:
+        缓存实例，未启用时返回 None | Cache instance, or None when disabled
+    """
+    global _response_cache
+    from config import (
+        LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MEMORY_MAX_ENTRIES,
+        LLM_CACHE_DISK_ENABLED, LLM_CACHE_DB_PATH, LLM_CACHE_DISK_MAX_ENTRIES
+    )
+
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            memory = MemoryLRUCache(LLM_CACHE_MEMORY_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+            disk = None
+            if LLM_CACHE_DISK_ENABLED:
+                try:
+                    disk = SQLiteCache(LLM_CACHE_DB_PATH, LLM_CACHE_DISK_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+                except Exception as e:
+                    logger.warning(f"Failed to open LLM cache database, using memory only: {e}")
+            _response_cache = TieredResponseCache(memory, disk)
+            logger.info(f"LLM response cache initialized (disk={'on' if disk else 'off'})")
+        return _response_cache
@@ -4,6 +4,7 @@
 Configure unified logging system to record function calls and execution flow
 """
 
+import inspect
 import logging
 import os
 from datetime import datetime
@@ -75,6 +76,23 @@ def log_function_call(func):
         def my_function(arg1, arg2):
             ...
     """
+    if inspect.iscoroutinefunction(func):
+        # 协程函数保持为协程函数，异常在 await 时记录 | Keep coroutine functions async so errors are logged on await
+        async def async_wrapper(*args, **kwargs):
+            logger.debug(f"→ Calling {func.__module__}.{func.__name__}()")
+            logger.debug(f"  Args: {args}")
+            logger.debug(f"  Kwargs: {kwargs}")
+            try:
+                result = await func(*args, **kwargs)
+                logger.debug(f"✓ {func.__module__}.{func.__name__}() completed")
+                return result
+            except Exception as e:
+                logger.error(f"✗ {func.__module__}.{func.__name__}() failed: {str(e)}", exc_info=True)
+                raise
+        async_wrapper.__name__ = func.__name__
+        async_wrapper.__doc__ = func.__doc__
+        return async_wrapper
+
     def wrapper(*args, **kwargs):
         logger.debug(f"→ Calling {func.__module__}.{func.__name__}()")
         logger.debug(f"  Args: {args}")
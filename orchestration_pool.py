@@ -0,0 +1,127 @@
+"""
+编排任务池 | Orchestration Job Pool
+固定数量的执行槽位 + 有界任务队列，用于限制并发执行的编排任务
+Fixed number of execution slots plus a bounded job queue to cap concurrent orchestrations
+
+任务是协程函数，运行在进程共享的事件循环上（async_runtime），多个编排共享一个循环而不是各占一个线程
+Jobs are coroutine functions run on the process-wide event loop (async_runtime), so
+orchestrations share one loop instead of holding a thread each
+
+- 队列已满时 submit 抛出 PoolSaturatedError（Web 层返回 429）
+  submit raises PoolSaturatedError when the queue is full (the web layer returns 429)
+- 可查询排队位置、取消排队中的任务
+  Queue positions can be queried and queued jobs cancelled
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import async_runtime
+from logger_config import logger
+
+
+class PoolSaturatedError(Exception):
+    """任务队列已满 | The job queue is full"""
+    pass
+
+
+class OrchestrationPool:
+    """
+    有界编排任务池 | Bounded orchestration job pool
+
+    事件循环在首次提交时才启动，避免在 gunicorn fork 之前创建线程
+    The event loop starts on first submit so no thread is created before gunicorn forks
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 20):
+        """
+        Args:
+            max_workers: 同时执行的任务数 | Number of jobs executed concurrently
+            max_queue_size: 等待队列的最大长度 | Maximum number of waiting jobs
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._queue = OrderedDict()  # execution_id -> 协程函数，按提交顺序 | coroutine function, in submission order
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def _dispatch(self):
+        """在有空闲槽位时启动排队的任务 | Start queued jobs while slots are free"""
+        started = []
+        with self._lock:
+            while self._queue and len(self._running) < self.max_workers:
+                execution_id, job = self._queue.popitem(last=False)
+                self._running.add(execution_id)
+                started.append((execution_id, job))
+        for execution_id, job in started:
+            async_runtime.submit(self._run(execution_id, job))
+
+    async def _run(self, execution_id: str, job: Callable[[], Awaitable[Any]]):
+        try:
+            await job()
+        except Exception as e:
+            logger.error(f"[{execution_id}] Orchestration job failed: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._running.discard(execution_id)
+            self._dispatch()
+
+    def submit(self, execution_id: str, job: Callable[[], Awaitable[Any]]) -> int:
+        """
+        提交任务 | Submit a job
+
+        Args:
+            execution_id: 执行ID | Execution ID
+            job: 无参数的协程函数 | Coroutine function taking no arguments
+
+        Returns:
+            排队位置（0 表示已开始执行，1 表示下一个执行）| Queue position (0 means started, 1 means next to run)
+
+        Raises:
+            PoolSaturatedError: 队列已满 | The queue is full
+        """
+        with self._lock:
+            # 只有拿不到空闲槽位的任务才占用队列 | Only jobs that cannot take a free slot count against the queue
+            free_slots = max(0, self.max_workers - len(self._running))
+            if len(self._queue) + 1 - free_slots > self.max_queue_size:
+                raise PoolSaturatedError(
+                    f"Orchestration queue is full ({self.max_queue_size} jobs waiting)"
+                )
+            self._queue[execution_id] = job
+        self._dispatch()
+        return self.position(execution_id) or 0
+
+    def position(self, execution_id: str) -> Optional[int]:
+        """
+        查询排队位置 | Get the queue position
+
+        Returns:
+            1 起的排队位置；未在排队时返回 None | 1-based position, or None when not queued
+        """
+        with self._lock:
+            for position, queued_id in enumerate(self._queue, start=1):
+                if queued_id == execution_id:
+                    return position
+        return None
+
+    def cancel(self, execution_id: str) -> bool:
+        """
+        取消排队中的任务（已开始执行的任务无法取消）
+        Cancel a queued job (jobs that already started cannot be cancelled)
+
+        Returns:
+            是否成功取消 | Whether the job was cancelled
+        """
+        with self._lock:
+            return self._queue.pop(execution_id, None) is not None
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取任务池统计 | Get pool statistics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "running": len(self._running),
+                "queued": len(self._queue)
+            }
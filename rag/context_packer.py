@@ -0,0 +1,162 @@
+"""
+Context Packer
+Fits retrieved chunks into a token budget for the LLM prompt: chunks are
+ranked by score, the budget is shared out so short chunks are kept whole and
+long ones are trimmed evenly, and every cut falls on a sentence boundary.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .tokenization import TokenCounter, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+|\n\s*\n")
+
+ELLIPSIS = "..."
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the sentences of a text."""
+    spans = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        if match.start() > start:
+            spans.append((start, match.start()))
+        start = match.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _water_fill(costs: List[int], budget: int) -> List[int]:
+    """
+    Share a budget so that no item gets more than it needs and the rest is
+    split evenly (max-min fair allocation).
+    """
+    allocation = [0] * len(costs)
+    remaining = budget
+    pending = sorted(range(len(costs)), key=lambda i: costs[i])
+    while pending:
+        share = remaining // len(pending)
+        i = pending[0]
+        if costs[i] <= share:
+            allocation[i] = costs[i]
+            remaining -= costs[i]
+            pending.pop(0)
+            continue
+        for i in pending:
+            allocation[i] = share
+        break
+    return allocation
+
+
+class _Entry:
+    """A chunk being packed: its sentences and how many are taken."""
+
+    def __init__(self, document: Dict, header_tokens: int, count_tokens: TokenCounter):
+        self.document = document
+        self.header_tokens = header_tokens
+        content = document.get("content", "")
+        self.content = content
+        self.spans = _sentence_spans(content)
+        self.costs = [count_tokens(content[start:end]) + 1 for start, end in self.spans]
+        self.taken = 0
+        self.truncated_text: Optional[str] = None
+
+    @property
+    def full_cost(self) -> int:
+        return sum(self.costs)
+
+    def take_within(self, allowance: int) -> int:
+        """Add whole sentences while they fit; returns tokens added."""
+        added = 0
+        while self.taken < len(self.costs) and added + self.costs[self.taken] <= allowance:
+            added += self.costs[self.taken]
+            self.taken += 1
+        return added
+
+    def cut_first_sentence(self, allowance: int):
+        """Keep the part of the first sentence that fits, ending on a word boundary."""
+        start, end = self.spans[0]
+        ratio = max(0.0, min(1.0, (allowance - 2) / self.costs[0]))
+        cut = start + int((end - start) * ratio)
+        space = self.content.rfind(" ", start, cut)
+        if space > start:
+            cut = space
+        self.truncated_text = self.content[start:cut].rstrip() + " " + ELLIPSIS
+
+    def text(self) -> str:
+        if self.truncated_text is not None:
+            return self.truncated_text
+        if not self.taken:
+            return ""
+        text = self.content[self.spans[0][0]:self.spans[self.taken - 1][1]]
+        return text if self.taken == len(self.spans) else text + " " + ELLIPSIS
+
+
+def pack_context(
+    documents: List[Dict],
+    token_budget: int,
+    header_for=None,
+    count_tokens: TokenCounter = estimate_tokens,
+    min_entry_tokens: int = 40
+) -> List[Tuple[Dict, str]]:
+    """
+    Choose and trim chunks so the formatted context fits a token budget.
+
+    Chunks are ranked by "rrf_score" when present, otherwise "score". Taking
+    them in rank order, as many are kept as can each get min_entry_tokens of
+    content besides their citation header; the remaining budget is then
+    water-filled across them, each is trimmed to its share on a sentence
+    boundary, and tokens freed by the rounding go to the best-ranked chunks
+    that can use them.
+
+    Args:
+        documents: Retrieved chunks
+        token_budget: Maximum tokens for the whole context
+        header_for: Function (citation number, document) -> header text,
+            counted against the budget; defaults to no header
+        count_tokens: Token counter
+        min_entry_tokens: Smallest content share worth a citation slot
+
+    Returns:
+        List of (document, trimmed content) in rank order
+    """
+    key = "rrf_score" if documents and all("rrf_score" in doc for doc in documents) else "score"
+    ranked = sorted(documents, key=lambda doc: doc.get(key, 0.0), reverse=True)
+
+    entries: List[_Entry] = []
+    reserved = 0
+    for doc in ranked:
+        header = header_for(len(entries) + 1, doc) if header_for else ""
+        # Header plus quotes, separators and a possible trailing ellipsis
+        entry = _Entry(doc, count_tokens(header) + count_tokens(ELLIPSIS) + 3, count_tokens)
+        need = entry.header_tokens + min(min_entry_tokens, entry.full_cost)
+        if not entry.costs or reserved + need > token_budget:
+            continue
+        entries.append(entry)
+        reserved += need
+
+    content_budget = token_budget - sum(entry.header_tokens for entry in entries)
+    allocation = _water_fill([entry.full_cost for entry in entries], content_budget)
+
+    spare = content_budget
+    for entry, allowance in zip(entries, allocation):
+        spare -= entry.take_within(allowance)
+        if entry.taken == 0:
+            # The first sentence alone exceeds the share: cut it mid-sentence
+            entry.cut_first_sentence(allowance)
+            spare -= allowance
+
+    # Sentence rounding leaves tokens over; give them to the best-ranked chunks first
+    for entry in entries:
+        if entry.truncated_text is None:
+            spare -= entry.take_within(spare)
+
+    packed = [(entry.document, entry.text()) for entry in entries if entry.text()]
+    if len(packed) < len(documents):
+        logger.info(f"Context packing kept {len(packed)} of {len(documents)} chunks within {token_budget} tokens")
+    return packed
@@ -1,28 +1,73 @@
 """
 PDF Document Loader with Section Detection
 Extracts text from PDF files and detects section/chapter headings.
+
+Text extraction can run on a process pool: each task extracts one page range of
+one file, and results are yielded per file, in order, as soon as they are ready.
 """
 
 import os
 import re
 import logging
-from typing import List, Dict, Optional
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+def _extract_page_range(file_path: str, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, str]]:
+    """
+    Extract the raw text of pages [start, end) of a PDF (runs in a worker process).
+
+    Args:
+        file_path: Path to the PDF file
+        start: First page index (0-based)
+        end: Page index after the last page (defaults to the page count)
+
+    Returns:
+        List of (1-based page number, text) for pages with text
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    if end is None:
+        end = len(reader.pages)
+    pages = []
+    for index in range(start, end):
+        try:
+            text = reader.pages[index].extract_text()
+        except Exception as e:
+            logger.warning(f"Error extracting page {index + 1} from {Path(file_path).name}: {e}")
+            continue
+        if text and text.strip():
+            pages.append((index + 1, text))
+    return pages
+
+
 class PDFLoader:
     """Load and extract text from PDF documents with section detection."""
 
-    def __init__(self, documents_dir: str = "knowledge_base/documents"):
+    def __init__(
+        self,
+        documents_dir: str = "knowledge_base/documents",
+        max_workers: int = 1,
+        pages_per_task: int = 50
+    ):
         """
         Initialize the PDF loader.
 
         Args:
             documents_dir: Directory containing PDF files
+            max_workers: Number of extraction processes; 1 extracts in-process
+            pages_per_task: Pages per extraction task, so large files are split
+                across several workers
         """
         self.documents_dir = Path(documents_dir)
+        self.max_workers = max(1, max_workers)
+        self.pages_per_task = max(1, pages_per_task)
         self._section_patterns = [
             # Chapter patterns
             r'^(Chapter\s+\d+[:\.\s]+.+)$',
@@ -71,66 +116,232 @@ class PDFLoader:
         Returns:
             List of dictionaries with content and metadata
         """
+        documents = self._load_file(Path(file_path))
+        return documents if documents is not None else []
+
+    def _load_file(self, file_path: Path) -> Optional[List[Dict]]:
+        """
+        Extract a PDF in-process.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            Page records, or None if the file could not be read (as opposed
+            to a readable file without text, which gives an empty list)
+        """
         try:
-            from pypdf import PdfReader
+            import pypdf  # noqa: F401
         except ImportError:
             logger.error("pypdf not installed. Run: pip install pypdf")
-            return []
-
-        documents = []
-        file_path = Path(file_path)
+            return None
 
         if not file_path.exists():
             logger.error(f"PDF file not found: {file_path}")
-            return []
+            return None
 
         try:
-            reader = PdfReader(str(file_path))
-            current_section = "Introduction"
-
-            for page_num, page in enumerate(reader.pages, start=1):
-                try:
-                    text = page.extract_text()
-                    if not text or not text.strip():
-                        continue
-
-                    # Detect section from page content
-                    current_section = self._detect_section(text, current_section)
-
-                    documents.append({
-                        "content": text.strip(),
-                        "metadata": {
-                            "source": file_path.name,
-                            "page": page_num,
-                            "section": current_section
-                        }
-                    })
-                except Exception as e:
-                    logger.warning(f"Error extracting page {page_num} from {file_path.name}: {e}")
-                    continue
-
+            raw_pages = _extract_page_range(str(file_path))
+            documents = self._make_records(file_path.name, raw_pages)
             logger.info(f"Loaded {len(documents)} pages from {file_path.name}")
 
         except Exception as e:
             logger.error(f"Error loading PDF {file_path}: {e}")
-            return []
+            return None
 
         return documents
 
-    def load_all_documents(self) -> List[Dict]:
+    def _make_records(self, filename: str, raw_pages: List[Tuple[int, str]],
+                      current_section: str = "Introduction") -> List[Dict]:
         """
-        Load all PDF files from the documents directory.
+        Turn extracted page texts into page records, detecting sections in page order.
+
+        Args:
+            filename: Source file name
+            raw_pages: List of (page number, text) in page order
+            current_section: Section in effect before the first page
 
         Returns:
-            List of all documents with content and metadata
+            List of dictionaries with content and metadata
         """
-        all_documents = []
+        documents = []
+        for page_num, text in raw_pages:
+            # Detect section from page content
+            current_section = self._detect_section(text, current_section)
+            documents.append({
+                "content": text.strip(),
+                "metadata": {
+                    "source": filename,
+                    "page": page_num,
+                    "section": current_section
+                }
+            })
+        return documents
 
+    def _list_pdf_files(self) -> List[Path]:
+        """PDF files in the documents directory, sorted by name."""
         if not self.documents_dir.exists():
             logger.warning(f"Documents directory not found: {self.documents_dir}")
             return []
+        return sorted(self.documents_dir.glob("*.pdf"))
+
+    def _plan_tasks(self, file_paths: List[Path]) -> List[Tuple[Path, int, Optional[int]]]:
+        """
+        Split files into (path, start, end) page-range extraction tasks.
 
-        pdf_files = list(self.documents_dir.glob("*.pdf"))
+        Every file gets at least one task so files without text are still
+        reported; a file that cannot be opened gets a single task with end None.
+        """
+        from pypdf import PdfReader
+
+        tasks = []
+        for path in file_paths:
+            try:
+                page_count = len(PdfReader(str(path)).pages)
+            except Exception as e:
+                logger.error(f"Error loading PDF {path}: {e}")
+                tasks.append((path, 0, None))
+                continue
+            if page_count == 0:
+                tasks.append((path, 0, 0))
+                continue
+            for start in range(0, page_count, self.pages_per_task):
+                tasks.append((path, start, min(start + self.pages_per_task, page_count)))
+        return tasks
+
+    def iter_page_batches(self, file_paths: Optional[List[str]] = None) -> Iterator[Tuple[Path, List[Dict], bool]]:
+        """
+        Extract PDFs and yield page records one extraction task at a time.
+
+        With max_workers > 1 page ranges are extracted on a process pool; at most
+        two tasks per worker are in flight so results are consumed as they arrive.
+        Jobs of a single task or at most pages_per_task pages are extracted
+        in-process, since spawned workers re-import the main module.
+
+        Args:
+            file_paths: Files to load (defaults to all PDFs in the documents directory)
+
+        Yields:
+            (file path, page records of one page range, whether the file is complete),
+            in file and page order; every file ends with a batch marked complete.
+            The page records are None if the file, or any of its page ranges,
+            could not be extracted.
+        """
+        paths = [Path(p) for p in file_paths] if file_paths is not None else self._list_pdf_files()
+        if not paths:
+            return
+
+        if self.max_workers > 1:
+            try:
+                tasks = self._plan_tasks(paths)
+            except ImportError:
+                logger.error("pypdf not installed. Run: pip install pypdf")
+                return
+            page_total = sum(end - start for _, start, end in tasks if end is not None)
+            if len(tasks) > 1 and page_total > self.pages_per_task:
+                yield from self._iter_pool(tasks)
+                return
+
+        for path in paths:
+            yield path, self._load_file(path), True
+
+    def _iter_pool(self, tasks: List[Tuple[Path, int, Optional[int]]]) -> Iterator[Tuple[Path, List[Dict], bool]]:
+        """Run extraction tasks on a process pool, yielding as iter_page_batches does."""
+        # spawn avoids forking a web worker that already runs threads
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            task_iter = iter(tasks)
+            pending = deque()
+
+            def submit_next():
+                task = next(task_iter, None)
+                if task is not None:
+                    path, start, end = task
+                    if end is None:
+                        pending.append((path, None))
+                    else:
+                        pending.append((path, executor.submit(_extract_page_range, str(path), start, end)))
+
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            current_section, page_count, failed = "Introduction", 0, False
+            while pending:
+                path, future = pending.popleft()
+                submit_next()
+                file_done = not pending or pending[0][0] != path
+
+                if future is None:
+                    failed = True
+                else:
+                    try:
+                        pages = future.result()
+                    except Exception as e:
+                        logger.error(f"Error loading PDF {path}: {e}")
+                        failed = True
+
+                if failed:
+                    # A file with a missing page range is reported as failed as
+                    # a whole, so it is not recorded as fully indexed
+                    if file_done:
+                        current_section, page_count, failed = "Introduction", 0, False
+                        yield path, None, True
+                    continue
+
+                # Sections carry over between page ranges of the same file
+                records = self._make_records(path.name, pages, current_section)
+                if records:
+                    current_section = records[-1]["metadata"]["section"]
+                page_count += len(records)
+
+                if file_done:
+                    logger.info(f"Loaded {page_count} pages from {path.name}")
+                    current_section, page_count = "Introduction", 0
+                yield path, records, file_done
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_files(self, file_paths: Optional[List[str]] = None) -> Iterator[Tuple[Path, List[Dict]]]:
+        """
+        Extract PDFs and yield each file's page records as soon as the file is done.
+
+        Args:
+            file_paths: Files to load (defaults to all PDFs in the documents directory)
+
+        Yields:
+            (file path, list of page records) in file order
+        """
+        records = []
+        for path, batch, file_done in self.iter_page_batches(file_paths):
+            records.extend(batch or [])
+            if file_done:
+                yield path, records
+                records = []
+
+    def iter_documents(self, file_paths: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Stream page records of all PDFs, so chunking can start before extraction finishes.
+
+        Args:
+            file_paths: Files to load (defaults to all PDFs in the documents directory)
+
+        Yields:
+            Page records with content and metadata
+        """
+        for _, documents, _ in self.iter_page_batches(file_paths):
+            yield from documents or []
+
+    def load_all_documents(self) -> List[Dict]:
+        """
+        Load all PDF files from the documents directory.
+
+        Returns:
+            List of all documents with content and metadata
+        """
+        pdf_files = self._list_pdf_files()
 
         if not pdf_files:
             logger.warning(f"No PDF files found in {self.documents_dir}")
@@ -138,9 +349,7 @@ class PDFLoader:
 
         logger.info(f"Found {len(pdf_files)} PDF files to process")
 
-        for pdf_file in pdf_files:
-            documents = self.load_pdf(str(pdf_file))
-            all_documents.extend(documents)
+        all_documents = list(self.iter_documents([str(path) for path in pdf_files]))
 
         logger.info(f"Total pages loaded: {len(all_documents)}")
         return all_documents
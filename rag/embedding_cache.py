@@ -0,0 +1,262 @@
+"""
+Chunk Embedding Cache
+On-disk cache of chunk embeddings keyed by (model, chunk content hash).
+
+Embeddings are rows of a float32 matrix file read through a NumPy memmap; a
+parallel text file lists the content hash of each row. Both files are
+append-only, so a full rebuild, a re-chunk that reproduces the same text or a
+restart after a crash only embeds text that has never been embedded before.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkEmbeddingCache:
+    """Append-only memmapped embedding matrix indexed by chunk content hash."""
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: int = 200000):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            model_name: Embedding model name; each model has its own files
+            max_entries: Rows kept; past this the oldest rows are compacted away
+        """
+        self.cache_dir = Path(cache_dir)
+        self.model_name = model_name
+        self.max_entries = max_entries
+
+        stem = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.matrix_path = self.cache_dir / f"{stem}.f32"
+        self.hashes_path = self.cache_dir / f"{stem}.hashes"
+        self.meta_path = self.cache_dir / f"{stem}.json"
+        self.lock_path = self.cache_dir / f"{stem}.lock"
+
+        self.dimension: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._reset_index()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._file_lock(exclusive=True):
+            self._load_meta()
+
+    def _reset_index(self):
+        self._index: Dict[str, int] = {}
+        self._rows = 0
+        self._hashes_offset = 0
+        self._hashes_inode = None
+        self._memmap = None
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Lock the cache files against other processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read embedding cache metadata {self.meta_path}: {e}")
+            return None
+        return meta if meta.get("model") == self.model_name else None
+
+    def _load_meta(self):
+        """Read the dimension, discarding files written for another model."""
+        meta = self._read_meta()
+        if meta is None:
+            self._remove_files()
+            return
+        self.dimension = meta["dimension"]
+
+    def _remove_files(self):
+        for path in (self.matrix_path, self.hashes_path, self.meta_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.dimension = None
+        self._reset_index()
+
+    def _refresh(self):
+        """Pick up rows appended (or a compaction done) by any process."""
+        try:
+            stat = os.stat(self.hashes_path)
+        except FileNotFoundError:
+            if self._rows:
+                self._reset_index()
+            return
+
+        if stat.st_ino != self._hashes_inode or stat.st_size < self._hashes_offset:
+            self._reset_index()
+            self._hashes_inode = stat.st_ino
+            if self.dimension is None:
+                meta = self._read_meta()
+                self.dimension = meta["dimension"] if meta else None
+
+        if stat.st_size > self._hashes_offset:
+            with open(self.hashes_path, "rb") as f:
+                f.seek(self._hashes_offset)
+                data = f.read(stat.st_size - self._hashes_offset)
+            # Only consume complete lines
+            end = data.rfind(b"\n") + 1
+            for content_hash in data[:end].decode("ascii").splitlines():
+                self._index[content_hash] = self._rows
+                self._rows += 1
+            self._hashes_offset += end
+
+    def _matrix(self, min_rows: int):
+        """Memmap of the matrix covering at least min_rows rows."""
+        if self._memmap is None or self._memmap.shape[0] < min_rows:
+            import numpy as np
+            rows = os.path.getsize(self.matrix_path) // (4 * self.dimension)
+            self._memmap = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        return self._memmap
+
+    def get_many(self, content_hashes: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up embeddings by chunk content hash.
+
+        Args:
+            content_hashes: SHA-256 digests of chunk texts
+
+        Returns:
+            Mapping of hash to embedding for the hashes that are cached
+        """
+        if not content_hashes:
+            return {}
+
+        with self._lock, self._file_lock(exclusive=False):
+            self._refresh()
+            rows = {h: self._index[h] for h in content_hashes if h in self._index}
+            found = {}
+            if rows and self.dimension is not None:
+                matrix = self._matrix(max(rows.values()) + 1)
+                found = {h: matrix[row].tolist() for h, row in rows.items()}
+            self.hits += len(found)
+            self.misses += len(content_hashes) - len(found)
+        return found
+
+    def put_many(self, content_hashes: List[str], embeddings: List[List[float]]) -> int:
+        """
+        Store embeddings that are not cached yet.
+
+        Args:
+            content_hashes: SHA-256 digests of chunk texts
+            embeddings: Embedding of each text
+
+        Returns:
+            Number of embeddings added
+        """
+        import numpy as np
+
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            new = {}
+            for content_hash, embedding in zip(content_hashes, embeddings):
+                if content_hash not in self._index and content_hash not in new:
+                    new[content_hash] = embedding
+            if not new:
+                return 0
+
+            matrix = np.asarray(list(new.values()), dtype=np.float32)
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dimension": self.dimension}, f)
+            elif matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match cache dimension {self.dimension}"
+                )
+
+            # Drop a partial row left by an interrupted write so rows stay aligned
+            row_bytes = 4 * self.dimension
+            if self.matrix_path.exists() and os.path.getsize(self.matrix_path) > self._rows * row_bytes:
+                os.truncate(self.matrix_path, self._rows * row_bytes)
+
+            # Rows first, then hashes: a hash is only visible once its row exists
+            with open(self.matrix_path, "ab") as f:
+                f.write(matrix.tobytes())
+            with open(self.hashes_path, "ab") as f:
+                f.write("".join(f"{h}\n" for h in new).encode("ascii"))
+            self._refresh()
+
+            if self._rows > self.max_entries:
+                self._compact()
+        return len(new)
+
+    def _compact(self):
+        """Keep the newest rows, leaving headroom so compaction is infrequent."""
+        import numpy as np
+
+        keep = max(1, self.max_entries * 3 // 4)
+        hashes = sorted(self._index, key=self._index.get)[-keep:]
+        matrix = self._matrix(self._rows)
+        rows = np.asarray([matrix[self._index[h]] for h in hashes], dtype=np.float32)
+
+        matrix_tmp = self.matrix_path.with_suffix(".f32.tmp")
+        hashes_tmp = self.hashes_path.with_suffix(".hashes.tmp")
+        rows.tofile(str(matrix_tmp))
+        with open(hashes_tmp, "wb") as f:
+            f.write("".join(f"{h}\n" for h in hashes).encode("ascii"))
+        self._memmap = None
+        os.replace(matrix_tmp, self.matrix_path)
+        os.replace(hashes_tmp, self.hashes_path)
+
+        self._reset_index()
+        self._refresh()
+        logger.info(f"Compacted embedding cache to {len(hashes)} entries")
+
+    def clear(self):
+        """Delete every cached embedding."""
+        with self._lock, self._file_lock(exclusive=True):
+            self._remove_files()
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, hit rate and file size
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            size = self.matrix_path.stat().st_size if self.matrix_path.exists() else 0
+            return {
+                "entries": len(self._index),
+                "max_entries": self.max_entries,
+                "dimension": self.dimension,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size_mb": round(size / (1024 * 1024), 2),
+                "path": str(self.matrix_path)
+            }
@@ -4,7 +4,10 @@ Uses sentence-transformers for generating text embeddings.
 """
 
 import logging
-from typing import List
+import threading
+from typing import List, Optional
+
+from .query_cache import QueryEmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,19 +15,26 @@ logger = logging.getLogger(__name__)
 class EmbeddingModel:
     """Wrapper for sentence-transformers embedding model."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", query_cache: Optional[QueryEmbeddingCache] = None):
         """
         Initialize the embedding model.
 
         Args:
             model_name: Name of the sentence-transformers model to use
+            query_cache: Cache consulted by embed_query (None disables caching)
         """
         self.model_name = model_name
+        self.query_cache = query_cache
         self._model = None
+        self._load_lock = threading.Lock()
 
     def _load_model(self):
-        """Lazy load the model on first use."""
-        if self._model is None:
+        """Lazy load the model on first use (thread-safe)."""
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is not None:
+                return
             try:
                 # 设置离线模式，避免网络超时问题
                 # Set offline mode to avoid network timeout issues
@@ -81,15 +91,60 @@ class EmbeddingModel:
         Returns:
             Embedding vector
         """
+        # A cache hit skips the forward pass (and loading the model)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(self.model_name, query)
+            if cached is not None:
+                return cached
+
         self._load_model()
 
         try:
-            embedding = self._model.encode(query, convert_to_numpy=True)
-            return embedding.tolist()
+            embedding = self._model.encode(query, convert_to_numpy=True).tolist()
         except Exception as e:
             logger.error(f"Error generating query embedding: {e}")
             raise
 
+        if self.query_cache is not None:
+            self.query_cache.set(self.model_name, query, embedding)
+        return embedding
+
+    def embed_queries(self, queries: List[str], batch_size: int = 32) -> List[List[float]]:
+        """
+        Generate embeddings for several queries in one encode batch.
+
+        Cached queries are served from the cache; only the rest are encoded.
+
+        Args:
+            queries: Query texts to embed
+            batch_size: Batch size for processing
+
+        Returns:
+            Embedding vector of each query, in order
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(queries)
+        if self.query_cache is not None:
+            for i, query in enumerate(queries):
+                embeddings[i] = self.query_cache.get(self.model_name, query)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            self._load_model()
+            try:
+                encoded = self._model.encode(
+                    [queries[i] for i in missing],
+                    batch_size=batch_size,
+                    convert_to_numpy=True
+                ).tolist()
+            except Exception as e:
+                logger.error(f"Error generating query embeddings: {e}")
+                raise
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+                if self.query_cache is not None:
+                    self.query_cache.set(self.model_name, queries[i], embedding)
+        return embeddings
+
     @property
     def dimension(self) -> int:
         """Get the embedding dimension."""
@@ -0,0 +1,177 @@
+"""
+Index Manifest
+Tracks per-file content hashes and per-chunk hashes of the indexed knowledge base
+so re-indexing only processes added, changed and removed files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def hash_file(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        file_path: Path to the file
+        block_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """
+    Compute the SHA-256 digest of a chunk's text.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """JSON manifest of indexed files and their chunks."""
+
+    def __init__(self, path: str, settings: Optional[Dict] = None):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: Path of the manifest JSON file
+            settings: Indexing settings (chunking, embedding model); a manifest
+                written with different settings is discarded and
+                settings_changed is set, since the chunks it described no
+                longer match
+        """
+        self.path = Path(path)
+        self.settings = settings or {}
+        self.settings_changed = False
+        self._files: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """Load the manifest from disk, starting empty if missing, unreadable or stale."""
+        self._files = {}
+        self.settings_changed = False
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read index manifest {self.path}: {e}")
+            return
+
+        if data.get("version") != MANIFEST_VERSION or data.get("settings") != self.settings:
+            logger.info("Index manifest settings changed, a full re-index is required")
+            self.settings_changed = True
+            return
+        self._files = data.get("files", {})
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "settings": self.settings, "files": self._files},
+                f,
+                ensure_ascii=False
+            )
+        os.replace(tmp_path, self.path)
+
+    def files(self) -> List[str]:
+        """Names of all indexed files."""
+        return list(self._files.keys())
+
+    def get(self, filename: str) -> Optional[Dict]:
+        """Manifest entry of a file, or None if not indexed."""
+        return self._files.get(filename)
+
+    def chunk_ids(self) -> Set[str]:
+        """IDs of all indexed chunks."""
+        return {chunk["id"] for entry in self._files.values() for chunk in entry.get("chunks", [])}
+
+    def chunk_count(self) -> int:
+        """Total number of indexed chunks."""
+        return sum(len(entry.get("chunks", [])) for entry in self._files.values())
+
+    def set_file(self, filename: str, file_hash: str, size: int, mtime: float,
+                 chunks: List[Dict], pages: int = 0):
+        """
+        Record an indexed file.
+
+        Args:
+            filename: File name (the chunks' source)
+            file_hash: SHA-256 of the file contents
+            size: File size in bytes
+            mtime: File modification time
+            chunks: List of {"id", "hash"} for every stored chunk
+            pages: Number of pages with text
+        """
+        self._files[filename] = {
+            "sha256": file_hash,
+            "size": size,
+            "mtime": mtime,
+            "pages": pages,
+            "chunks": chunks
+        }
+
+    def remove(self, filename: str) -> Optional[Dict]:
+        """Forget a file, returning its previous entry."""
+        return self._files.pop(filename, None)
+
+    def clear(self):
+        """Forget all files."""
+        self._files = {}
+        self.settings_changed = False
+
+    def copy_from(self, other: "IndexManifest"):
+        """Replace this manifest's entries with a copy of another manifest's."""
+        self._files = json.loads(json.dumps(other._files))
+
+    def is_unchanged(self, filename: str, file_path: str) -> bool:
+        """
+        Check whether a file matches its manifest entry.
+
+        Size and modification time are compared first; the content hash is only
+        computed when they differ, so touching a file does not force re-indexing.
+
+        Args:
+            filename: File name
+            file_path: Path to the file
+
+        Returns:
+            True if the indexed copy is current
+        """
+        entry = self._files.get(filename)
+        if entry is None:
+            return False
+        stat = os.stat(file_path)
+        if stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+            return True
+        if stat.st_size != entry["size"]:
+            return False
+        if hash_file(file_path) == entry["sha256"]:
+            # Content identical, refresh the cheap check for next time
+            entry["mtime"] = stat.st_mtime
+            return True
+        return False
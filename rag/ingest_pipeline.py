@@ -0,0 +1,384 @@
+"""
+Streaming Ingest Pipeline
+Extract -> chunk -> embed -> upsert in bounded batches.
+
+Extraction and chunking, embedding, and vector store writes run on separate
+threads connected by bounded queues. Stages overlap in time, a slow stage
+applies backpressure to the ones before it, and peak memory is bounded by the
+batch size and queue depth instead of the size of the corpus.
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .index_manifest import IndexManifest, hash_file, hash_text
+from .vector_store import make_chunk_id
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed through the queues
+_DONE = object()
+
+
+class IngestCancelled(Exception):
+    """Raised when an ingest run is cancelled."""
+    pass
+
+
+class IngestProgress:
+    """Thread-safe counters describing a running ingest."""
+
+    def __init__(self, files_total: int = 0):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.files_total = files_total
+        self.files_done = 0
+        self.pages = 0
+        self.chunks = 0
+        self.embedded = 0
+        self.reused = 0
+        self.cached = 0
+        self.upserted = 0
+        self.deleted = 0
+        self.failed_files: List[str] = []
+        self.current_file = None
+
+    def add(self, **counts):
+        """Increment counters by name."""
+        with self._lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def set_current_file(self, filename: Optional[str]):
+        with self._lock:
+            self.current_file = filename
+
+    def add_failed_file(self, filename: str):
+        with self._lock:
+            self.failed_files.append(filename)
+            self.files_done += 1
+
+    def to_dict(self) -> Dict:
+        """Snapshot of the counters, including throughput."""
+        with self._lock:
+            elapsed = time.time() - self.started_at
+            return {
+                "files_total": self.files_total,
+                "files_done": self.files_done,
+                "current_file": self.current_file,
+                "pages": self.pages,
+                "chunks": self.chunks,
+                "embedded": self.embedded,
+                "reused": self.reused,
+                "cached": self.cached,
+                "upserted": self.upserted,
+                "deleted": self.deleted,
+                "failed_files": list(self.failed_files),
+                "elapsed_seconds": round(elapsed, 2),
+                "embeddings_per_second": round(self.embedded / elapsed, 2) if elapsed > 0 else 0.0
+            }
+
+
+class _FileDone:
+    """Marks the end of a file; carries what the writer needs to update the manifest."""
+
+    def __init__(self, path: Path, is_new: bool, chunk_refs: List[Dict], stale_ids: List[str], pages: int):
+        self.path = path
+        self.is_new = is_new
+        self.chunk_refs = chunk_refs
+        self.stale_ids = stale_ids
+        self.pages = pages
+
+
+class _FileFailed:
+    """Marks a file whose extraction failed; carries the chunk IDs already sent for it."""
+
+    def __init__(self, path: Path, sent_ids: List[str]):
+        self.path = path
+        self.sent_ids = sent_ids
+
+
+class IngestPipeline:
+    """Incremental extract -> chunk -> embed -> upsert pipeline for a set of files."""
+
+    def __init__(
+        self,
+        loader,
+        chunker,
+        embeddings,
+        vector_store,
+        manifest: IndexManifest,
+        batch_size: int = 64,
+        queue_size: int = 4,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        embedding_cache=None,
+        lexical_index=None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            loader: PDFLoader used for extraction
+            chunker: TextChunker used for chunking
+            embeddings: EmbeddingModel used for embedding
+            vector_store: VectorStore receiving the chunks
+            manifest: Index manifest, updated as each file completes
+            batch_size: Chunks per embedding and upsert batch
+            queue_size: Maximum batches waiting between two stages
+            progress_callback: Called with a progress snapshot after every batch and file
+            cancel_event: When set, the run stops and raises IngestCancelled
+            embedding_cache: ChunkEmbeddingCache consulted before embedding (optional)
+            lexical_index: LexicalIndex kept in step with the vector store (optional)
+        """
+        self.loader = loader
+        self.chunker = chunker
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.manifest = manifest
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.embedding_cache = embedding_cache
+        self.lexical_index = lexical_index
+        self.progress = IngestProgress()
+
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self, file_paths: List[Path]) -> List[Tuple[str, bool]]:
+        """
+        Index the given files.
+
+        Args:
+            file_paths: Added or changed files
+
+        Returns:
+            List of (file name, whether it was newly added) for the indexed files
+
+        Raises:
+            IngestCancelled: The run was cancelled; files completed so far are kept
+        """
+        self.progress = IngestProgress(files_total=len(file_paths))
+        if not file_paths:
+            return []
+
+        chunk_queue = queue.Queue(maxsize=self.queue_size)
+        embedded_queue = queue.Queue(maxsize=self.queue_size)
+        workers = [
+            threading.Thread(target=self._guard, args=(self._produce, file_paths, chunk_queue),
+                             name="ingest-extract", daemon=True),
+            threading.Thread(target=self._guard, args=(self._embed, chunk_queue, embedded_queue),
+                             name="ingest-embed", daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            return self._write(embedded_queue)
+        except IngestCancelled:
+            if self._error is not None:
+                raise self._error
+            raise
+        finally:
+            self._stop.set()
+            for worker in workers:
+                worker.join()
+
+    # ------------------------------------------------------------------
+    # Queue helpers
+    # ------------------------------------------------------------------
+
+    def _stopping(self) -> bool:
+        return self._stop.is_set() or (self.cancel_event is not None and self.cancel_event.is_set())
+
+    def _put(self, target: queue.Queue, item):
+        while True:
+            if self._stopping():
+                raise IngestCancelled()
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source: queue.Queue):
+        while True:
+            if self._stopping():
+                raise IngestCancelled()
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _guard(self, stage: Callable, *args):
+        """Run a stage thread, stopping the pipeline if it fails."""
+        try:
+            stage(*args)
+        except IngestCancelled:
+            pass
+        except BaseException as e:
+            logger.error(f"Ingest stage {threading.current_thread().name} failed: {e}")
+            self._error = e
+            self._stop.set()
+
+    def _report(self):
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(self.progress.to_dict())
+            except Exception as e:
+                logger.warning(f"Ingest progress callback failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _produce(self, file_paths: List[Path], out: queue.Queue):
+        """Extract and chunk, emitting batches of chunks that are not stored yet."""
+        current = None
+        batches = self.loader.iter_page_batches([str(p) for p in file_paths])
+        try:
+            for path, pages, file_done in batches:
+                if self._stopping():
+                    raise IngestCancelled()
+
+                if path != current:
+                    current = path
+                    old_entry = self.manifest.get(path.name)
+                    is_new = old_entry is None
+                    old_chunks = old_entry["chunks"] if old_entry else []
+                    old_ids = {entry["id"] for entry in old_chunks}
+                    old_id_by_hash = {entry["hash"]: entry["id"] for entry in old_chunks}
+                    chunk_refs, pending, page_count = [], [], 0
+                    self.progress.set_current_file(path.name)
+
+                if pages is None:
+                    # Extraction failed: leave the file's manifest entry and
+                    # stored chunks alone so it is retried on the next run, and
+                    # take back what this run already wrote for it
+                    unsent = {chunk_id for chunk_id, _, _, _ in pending}
+                    sent_ids = [ref["id"] for ref in chunk_refs
+                                if ref["id"] not in old_ids and ref["id"] not in unsent]
+                    pending = []
+                    self._put(out, _FileFailed(path, sent_ids))
+                    continue
+
+                chunks = self.chunker.chunk_documents(pages)
+                page_count += len(pages)
+                kept = 0
+                for chunk in chunks:
+                    chunk_hash = hash_text(chunk["content"])
+                    chunk_id = make_chunk_id(chunk, chunk_hash)
+                    chunk_refs.append({"id": chunk_id, "hash": chunk_hash})
+                    if chunk_id in old_ids:
+                        kept += 1  # already stored under the same id
+                        continue
+                    pending.append((chunk_id, chunk_hash, chunk, old_id_by_hash.get(chunk_hash)))
+                    if len(pending) >= self.batch_size:
+                        self._put(out, pending)
+                        pending = []
+                self.progress.add(pages=len(pages), chunks=len(chunks), reused=kept)
+
+                if file_done:
+                    if pending:
+                        self._put(out, pending)
+                        pending = []
+                    new_ids = {ref["id"] for ref in chunk_refs}
+                    stale_ids = [chunk_id for chunk_id in old_ids if chunk_id not in new_ids]
+                    self._put(out, _FileDone(path, is_new, chunk_refs, stale_ids, page_count))
+        finally:
+            # Shuts down the extraction processes when stopped early
+            batches.close()
+
+        self._put(out, _DONE)
+
+    def _embed(self, source: queue.Queue, out: queue.Queue):
+        """
+        Embed chunk batches. Embeddings are looked up first in the vector store
+        (chunks that moved within a file), then in the embedding cache; only
+        the remaining texts go through the model.
+        """
+        while True:
+            item = self._get(source)
+            if item is _DONE or isinstance(item, (_FileDone, _FileFailed)):
+                self._put(out, item)
+                if item is _DONE:
+                    return
+                continue
+
+            reuse_ids = [reuse_id for _, _, _, reuse_id in item if reuse_id]
+            reused = self.vector_store.get_embeddings(reuse_ids) if reuse_ids else {}
+            embeddings = [reused.get(reuse_id) if reuse_id else None for _, _, _, reuse_id in item]
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            reused_count = len(item) - len(missing)
+
+            cached_count = 0
+            if missing and self.embedding_cache is not None:
+                cached = self.embedding_cache.get_many([item[i][1] for i in missing])
+                for i in missing:
+                    embeddings[i] = cached.get(item[i][1])
+                cached_count = len(cached)
+                missing = [i for i in missing if embeddings[i] is None]
+
+            if missing:
+                computed = self.embeddings.embed_texts([item[i][2]["content"] for i in missing])
+                for i, embedding in zip(missing, computed):
+                    embeddings[i] = embedding
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put_many([item[i][1] for i in missing], computed)
+
+            self.progress.add(embedded=len(missing), reused=reused_count, cached=cached_count)
+            self._put(out, (item, embeddings))
+
+    def _write(self, source: queue.Queue) -> List[Tuple[str, bool]]:
+        """Upsert embedded batches (vector and lexical index) and record completed files in the manifest."""
+        indexed = []
+        while True:
+            item = self._get(source)
+            if item is _DONE:
+                break
+
+            if isinstance(item, _FileFailed):
+                self.vector_store.delete_documents(item.sent_ids)
+                if self.lexical_index is not None:
+                    self.lexical_index.remove(item.sent_ids)
+                logger.warning(f"Extraction of {item.path.name} failed, its previous index entry is kept")
+                self.progress.add_failed_file(item.path.name)
+                self._report()
+                continue
+
+            if isinstance(item, _FileDone):
+                path = item.path
+                self.vector_store.delete_documents(item.stale_ids)
+                if self.lexical_index is not None:
+                    self.lexical_index.remove(item.stale_ids)
+                stat = path.stat()
+                self.manifest.set_file(
+                    path.name, hash_file(str(path)), stat.st_size, stat.st_mtime,
+                    chunks=item.chunk_refs, pages=item.pages
+                )
+                indexed.append((path.name, item.is_new))
+                self.progress.add(files_done=1, deleted=len(item.stale_ids))
+                self._report()
+                continue
+
+            batch, embeddings = item
+            chunks = [chunk for _, _, chunk, _ in batch]
+            ids = [chunk_id for chunk_id, _, _, _ in batch]
+            self.vector_store.add_documents(chunks, embeddings, ids=ids)
+            if self.lexical_index is not None:
+                self.lexical_index.add(
+                    ids,
+                    [chunk["content"] for chunk in chunks],
+                    [chunk["metadata"].get("source", "") for chunk in chunks]
+                )
+            self.progress.add(upserted=len(batch))
+            self._report()
+
+        self.progress.set_current_file(None)
+        return indexed
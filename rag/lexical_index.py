@@ -0,0 +1,249 @@
+"""
+Lexical Index
+BM25 inverted index over chunk texts, maintained alongside the vector index so
+exact terms (product names, standard IDs, acronyms) can be matched even when
+dense similarity misses them.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_INDEX_VERSION = 1
+
+# Latin/digit words, optionally joined by - _ . / (e.g. "ISO-27001", "v2.1"),
+# or single CJK characters
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*|[\u3400-\u4dbf\u4e00-\u9fff]")
+_PARTS = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into BM25 terms.
+
+    Compound identifiers are kept whole and also split into their parts, so
+    "ISO-27001" matches both "iso-27001" and "27001".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lower-cased terms
+    """
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        terms.append(token)
+        parts = _PARTS.findall(token)
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in _STOPWORDS)
+    return terms
+
+
+class LexicalIndex:
+    """BM25 index of chunk texts, persisted as JSON next to the manifest."""
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index.
+
+        Args:
+            path: Path of the index JSON file
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalisation
+        """
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._reset()
+        self.load()
+
+    def _reset(self):
+        # chunk ID -> (source, length, {term: frequency})
+        self._docs: Dict[str, Tuple[str, int, Dict[str, int]]] = {}
+        # term -> {chunk ID: frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._dirty = False
+
+    def load(self):
+        """Load the index from disk, starting empty if missing, unreadable or stale."""
+        with self._lock:
+            self._reset()
+            try:
+                self._loaded_mtime = self.path.stat().st_mtime
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                self._loaded_mtime = None
+                return
+            except Exception as e:
+                logger.warning(f"Could not read lexical index {self.path}: {e}")
+                return
+
+            if data.get("version") != LEXICAL_INDEX_VERSION:
+                logger.info("Lexical index format changed, it will be rebuilt")
+                return
+            for chunk_id, (source, length, frequencies) in data.get("docs", {}).items():
+                self._insert(chunk_id, source, length, frequencies)
+
+    def refresh(self):
+        """Reload after another process saved a newer copy."""
+        if self._dirty:
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def save(self):
+        """Write the index atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": LEXICAL_INDEX_VERSION, "docs": {k: list(v) for k, v in self._docs.items()}},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = self.path.stat().st_mtime
+            self._dirty = False
+
+    def _insert(self, chunk_id: str, source: str, length: int, frequencies: Dict[str, int]):
+        self._docs[chunk_id] = (source, length, frequencies)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[chunk_id] = frequency
+
+    def _discard(self, chunk_id: str):
+        entry = self._docs.pop(chunk_id, None)
+        if entry is None:
+            return
+        _, length, frequencies = entry
+        self._total_length -= length
+        for term in frequencies:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(chunk_id, None)
+                if not posting:
+                    del self._postings[term]
+
+    def add(self, ids: List[str], texts: List[str], sources: List[str]):
+        """
+        Index chunks, replacing any already indexed under the same ID.
+
+        Args:
+            ids: Chunk IDs
+            texts: Chunk texts
+            sources: Source file name of each chunk
+        """
+        with self._lock:
+            for chunk_id, text, source in zip(ids, texts, sources):
+                terms = tokenize(text)
+                frequencies: Dict[str, int] = {}
+                for term in terms:
+                    frequencies[term] = frequencies.get(term, 0) + 1
+                self._discard(chunk_id)
+                self._insert(chunk_id, source, len(terms), frequencies)
+            self._dirty = True
+
+    def remove(self, ids: List[str]):
+        """Remove chunks by ID."""
+        if not ids:
+            return
+        with self._lock:
+            for chunk_id in ids:
+                self._discard(chunk_id)
+            self._dirty = True
+
+    def remove_sources(self, sources: List[str]):
+        """Remove every chunk of the given source files."""
+        if not sources:
+            return
+        doomed = set(sources)
+        with self._lock:
+            for chunk_id in [i for i, (source, _, _) in self._docs.items() if source in doomed]:
+                self._discard(chunk_id)
+            self._dirty = True
+
+    def copy_from(self, other: "LexicalIndex", only_ids: Optional[Set[str]] = None):
+        """Replace the contents with a copy of another index (only the given chunk IDs, if any)."""
+        with other._lock:
+            docs = {k: (s, n, dict(f)) for k, (s, n, f) in other._docs.items()
+                    if only_ids is None or k in only_ids}
+        with self._lock:
+            self._reset()
+            for chunk_id, (source, length, frequencies) in docs.items():
+                self._insert(chunk_id, source, length, frequencies)
+            self._dirty = True
+
+    def clear(self):
+        """Remove every chunk."""
+        with self._lock:
+            self._reset()
+            self._dirty = True
+
+    def delete(self):
+        """Delete the index file."""
+        with self._lock:
+            self._reset()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank chunks by BM25 score.
+
+        Args:
+            query: Search query
+            top_k: Number of results to return
+
+        Returns:
+            List of (chunk ID, score), best first; chunks sharing no term are omitted
+        """
+        self.refresh()
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._docs)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for chunk_id, frequency in posting.items():
+                    length = self._docs[chunk_id][1]
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,566 @@
+"""
+NumPy Vector Store
+In-process vector index for small corpora: L2-normalised float32 embeddings in
+a memory-mapped .npy file plus a JSON sidecar with IDs, texts and metadata.
+
+A query is one matrix-vector product and an argpartition, with no client round
+trips. Writes are applied in memory and persisted atomically by flush(): every
+flush writes the matrix under a new generation name and then swaps in the
+sidecar that names it, so readers never pair a matrix with the wrong IDs.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .vector_store import WRITE_BATCH_SIZE, make_chunk_id, select_records
+
+logger = logging.getLogger(__name__)
+
+
+def _matches(metadata: Dict, where: Optional[Dict]) -> bool:
+    """Evaluate a Chroma-style equality / $in filter against metadata."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _Snapshot:
+    """Immutable view of the index; replaced as a whole on every write."""
+
+    def __init__(self, matrix, ids: List[str], documents: List[str], metadatas: List[Dict]):
+        self.matrix = matrix
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.rows = {doc_id: row for row, doc_id in enumerate(ids)}
+
+
+class NumpyVectorStore:
+    """Memory-mapped NumPy vector store with the VectorStore interface."""
+
+    def __init__(
+        self,
+        persist_directory: str = "vector_db/chroma_db",
+        collection_name: str = "product_knowledge"
+    ):
+        """
+        Initialize the vector store.
+
+        Args:
+            persist_directory: Directory for persistent storage
+            collection_name: Name of the collection (file stem)
+        """
+        self.persist_directory = Path(persist_directory)
+        self.collection_name = collection_name
+        # Matrix file of stores written before generations were introduced
+        self.matrix_path = self.persist_directory / f"{collection_name}.npy"
+        self.sidecar_path = self.persist_directory / f"{collection_name}.json"
+        self._matrix_file: Optional[str] = None
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._loaded_mtime = None
+        self._dirty = False
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loading and persistence
+    # ------------------------------------------------------------------
+
+    def _init_client(self):
+        """Load the index from disk, or pick up a newer copy flushed by another process."""
+        try:
+            mtime = os.stat(self.sidecar_path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+
+        if self._snapshot is not None and (self._dirty or mtime == self._loaded_mtime):
+            return
+
+        with self._lock:
+            if self._snapshot is not None and (self._dirty or mtime == self._loaded_mtime):
+                return
+            self._snapshot, self._matrix_file = self._load()
+            self._buffer = None
+            self._loaded_mtime = mtime
+            logger.info(f"Collection '{self.collection_name}' has {len(self._snapshot.ids)} documents")
+
+    def _load(self, attempts: int = 3):
+        """
+        Read the sidecar and the matrix generation it names.
+
+        Returns:
+            Tuple of (snapshot, matrix file name)
+        """
+        import numpy as np
+
+        for attempt in range(attempts):
+            try:
+                with open(self.sidecar_path, "r", encoding="utf-8") as f:
+                    sidecar = json.load(f)
+            except FileNotFoundError:
+                return _Snapshot(None, [], [], []), None
+
+            ids = sidecar["ids"]
+            matrix_file = sidecar.get("matrix", self.matrix_path.name)
+            try:
+                matrix = np.load(self.persist_directory / matrix_file, mmap_mode="r") if ids else None
+            except FileNotFoundError:
+                if attempt + 1 < attempts:
+                    # Another process flushed a newer generation and removed this one
+                    continue
+                logger.error(f"Matrix file {matrix_file} of NumPy vector store '{self.collection_name}' is missing")
+                raise
+            except Exception as e:
+                logger.error(f"Error loading NumPy vector store {matrix_file}: {e}")
+                raise
+
+            rows = 0 if matrix is None else matrix.shape[0]
+            if rows != len(ids):
+                raise ValueError(
+                    f"NumPy vector store '{self.collection_name}' is inconsistent: "
+                    f"{matrix_file} has {rows} rows for {len(ids)} IDs"
+                )
+            return _Snapshot(matrix, ids, sidecar["documents"], sidecar["metadatas"]), matrix_file
+
+    def _remove_matrix_file(self, matrix_file: Optional[str]):
+        if not matrix_file:
+            return
+        try:
+            os.remove(self.persist_directory / matrix_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # e.g. still mapped by a reader on a platform that forbids unlinking it
+            logger.warning(f"Could not remove old matrix file {matrix_file}: {e}")
+
+    def flush(self):
+        """
+        Persist pending writes atomically.
+
+        The matrix is written under a new generation name, then the sidecar
+        naming it replaces the old one, and only then is the previous
+        generation removed; a crash at any point leaves a consistent pair.
+        """
+        import numpy as np
+
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = self._snapshot
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+
+            matrix_file = f"{self.collection_name}.{uuid.uuid4().hex[:16]}.npy"
+            matrix_tmp = self.persist_directory / (matrix_file + ".tmp")
+            with open(matrix_tmp, "wb") as f:
+                np.save(f, snapshot.matrix if snapshot.matrix is not None else np.zeros((0, 0), dtype=np.float32))
+            os.replace(matrix_tmp, self.persist_directory / matrix_file)
+
+            sidecar_tmp = self.sidecar_path.with_suffix(".json.tmp")
+            with open(sidecar_tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "matrix": matrix_file,
+                        "ids": snapshot.ids,
+                        "documents": snapshot.documents,
+                        "metadatas": snapshot.metadatas
+                    },
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(sidecar_tmp, self.sidecar_path)
+
+            previous, self._matrix_file = self._matrix_file, matrix_file
+            self._loaded_mtime = os.stat(self.sidecar_path).st_mtime
+            self._dirty = False
+            if previous != matrix_file:
+                self._remove_matrix_file(previous)
+        logger.info(f"Flushed {len(snapshot.ids)} documents to {matrix_file}")
+
+    def _append_rows(self, matrix, vectors):
+        """
+        Append rows, growing a private buffer geometrically.
+
+        Rows past the end of a published snapshot are never read through it,
+        so they can be written in place; appends cost O(rows added).
+        """
+        import numpy as np
+
+        rows = 0 if matrix is None else matrix.shape[0]
+        needed = rows + len(vectors)
+        buffer = self._buffer
+        if buffer is None or matrix is None or matrix.base is not buffer or needed > buffer.shape[0]:
+            buffer = np.empty((max(needed, 2 * rows, 256), vectors.shape[1]), dtype=np.float32)
+            if rows:
+                buffer[:rows] = matrix
+            self._buffer = buffer
+        buffer[rows:needed] = vectors
+        return buffer[:needed]
+
+    # ------------------------------------------------------------------
+    # VectorStore interface
+    # ------------------------------------------------------------------
+
+    def add_documents(
+        self,
+        documents: List[Dict],
+        embeddings: List[List[float]],
+        ids: Optional[List[str]] = None
+    ) -> int:
+        """
+        Add documents with embeddings to the vector store.
+
+        Writes are upserts: documents whose ID already exists are replaced.
+
+        Args:
+            documents: List of documents with content and metadata
+            embeddings: List of embedding vectors
+            ids: Optional list of document IDs (defaults to make_chunk_id)
+
+        Returns:
+            Number of documents added
+        """
+        import numpy as np
+
+        if not documents or not embeddings:
+            return 0
+        if len(documents) != len(embeddings):
+            raise ValueError("Number of documents must match number of embeddings")
+        if ids is None:
+            ids = [make_chunk_id(doc) for doc in documents]
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        self._init_client()
+        with self._lock:
+            snapshot = self._snapshot
+            matrix = snapshot.matrix
+            all_ids, contents, metadatas = list(snapshot.ids), list(snapshot.documents), list(snapshot.metadatas)
+            rows = dict(snapshot.rows)
+            replaced_rows, replaced, appended = [], [], []
+            for doc_id, doc, vector in zip(ids, documents, vectors):
+                metadata = dict(doc.get("metadata", {}))
+                row = rows.get(doc_id)
+                if row is not None:
+                    replaced_rows.append(row)
+                    replaced.append(vector)
+                    contents[row] = doc["content"]
+                    metadatas[row] = metadata
+                    continue
+                rows[doc_id] = len(all_ids)
+                all_ids.append(doc_id)
+                contents.append(doc["content"])
+                metadatas.append(metadata)
+                appended.append(vector)
+
+            if replaced_rows:
+                # Copy rather than overwrite rows a concurrent query may be reading
+                matrix = np.array(matrix, dtype=np.float32)
+                matrix[replaced_rows] = np.asarray(replaced)
+                self._buffer = None
+            if appended:
+                matrix = self._append_rows(matrix, np.asarray(appended))
+            self._snapshot = _Snapshot(matrix, all_ids, contents, metadatas)
+            self._dirty = True
+
+        logger.info(f"Upserted {len(documents)} documents to vector store")
+        return len(documents)
+
+    def query(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict]:
+        """
+        Query the vector store for similar documents.
+
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of results to return
+            where: Optional filter conditions (equality and $in)
+            include_embeddings: Also return each match's stored "embedding"
+
+        Returns:
+            List of matching documents with cosine similarity scores
+        """
+        return self.query_many([query_embedding], top_k, where, include_embeddings)[0]
+
+    def query_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict]]:
+        """
+        Query the vector store for several embeddings with one matrix product.
+
+        Args:
+            query_embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            where: Optional filter conditions (equality and $in)
+            include_embeddings: Also return each match's stored "embedding"
+
+        Returns:
+            List of matching documents with cosine similarity scores for each query, in order
+        """
+        import numpy as np
+
+        self._init_client()
+        snapshot = self._snapshot
+        if not query_embeddings:
+            return []
+        if snapshot.matrix is None or not snapshot.ids:
+            logger.warning("Vector store is empty")
+            return [[] for _ in query_embeddings]
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        scores = (queries / np.where(norms == 0, 1, norms)) @ snapshot.matrix.T
+
+        if where:
+            mask = np.array([_matches(metadata, where) for metadata in snapshot.metadatas])
+            scores = np.where(mask, scores, -np.inf)
+            candidates = int(mask.sum())
+        else:
+            candidates = len(snapshot.ids)
+
+        k = min(top_k, candidates)
+        if k <= 0:
+            return [[] for _ in query_embeddings]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        batches = []
+        for query_scores, rows in zip(scores, top):
+            rows = rows[np.argsort(-query_scores[rows])]
+            documents = []
+            for row in rows:
+                document = {
+                    "id": snapshot.ids[row],
+                    "content": snapshot.documents[row],
+                    "metadata": snapshot.metadatas[row],
+                    "score": float(query_scores[row])
+                }
+                if include_embeddings:
+                    document["embedding"] = snapshot.matrix[row].tolist()
+                documents.append(document)
+            batches.append(documents)
+        return batches
+
+    def _delete_rows(self, keep) -> int:
+        """Replace the snapshot with the rows for which keep(row) is true."""
+        self._init_client()
+        with self._lock:
+            snapshot = self._snapshot
+            ids, metadatas = snapshot.ids, snapshot.metadatas
+            kept = [row for row in range(len(ids)) if keep(row, ids, metadatas)]
+            deleted = len(ids) - len(kept)
+            if deleted:
+                self._snapshot = _Snapshot(
+                    snapshot.matrix[kept] if kept else None,
+                    [ids[row] for row in kept],
+                    [snapshot.documents[row] for row in kept],
+                    [metadatas[row] for row in kept]
+                )
+                self._buffer = None
+                self._dirty = True
+        return deleted
+
+    def delete_documents(self, ids: List[str], batch_size: int = WRITE_BATCH_SIZE) -> int:
+        """
+        Delete documents by ID.
+
+        Args:
+            ids: Document IDs to delete
+            batch_size: Unused; kept for interface compatibility
+
+        Returns:
+            Number of IDs submitted for deletion
+        """
+        if not ids:
+            return 0
+        doomed = set(ids)
+        self._delete_rows(lambda row, all_ids, metadatas: all_ids[row] not in doomed)
+        logger.info(f"Deleted {len(ids)} documents from vector store")
+        return len(ids)
+
+    def delete_by_source(self, sources: List[str], batch_size: int = 50) -> None:
+        """
+        Delete every chunk of the given source documents.
+
+        Args:
+            sources: Source file names (the chunks' "source" metadata)
+            batch_size: Unused; kept for interface compatibility
+        """
+        if not sources:
+            return
+        doomed = set(sources)
+        self._delete_rows(lambda row, all_ids, metadatas: metadatas[row].get("source") not in doomed)
+        logger.info(f"Deleted chunks of {len(sources)} source documents from vector store")
+
+    def get_embeddings(self, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Fetch stored (normalised) embeddings by document ID.
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            Mapping of ID to embedding for the IDs that exist
+        """
+        self._init_client()
+        snapshot = self._snapshot
+        return {
+            doc_id: snapshot.matrix[snapshot.rows[doc_id]].tolist()
+            for doc_id in ids
+            if doc_id in snapshot.rows
+        }
+
+    def get_documents(self, ids: List[str]) -> List[Dict]:
+        """
+        Fetch stored documents by ID.
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            Documents with id, content, metadata and embedding, for the IDs that exist
+        """
+        self._init_client()
+        snapshot = self._snapshot
+        return [
+            {
+                "id": doc_id,
+                "content": snapshot.documents[snapshot.rows[doc_id]],
+                "metadata": snapshot.metadatas[snapshot.rows[doc_id]],
+                "embedding": snapshot.matrix[snapshot.rows[doc_id]].tolist()
+            }
+            for doc_id in ids
+            if doc_id in snapshot.rows
+        ]
+
+    def iter_records(self, batch_size: int = WRITE_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Iterate over all records in batches.
+
+        Yields:
+            Dictionaries with ids, embeddings, documents and metadatas
+        """
+        self._init_client()
+        snapshot = self._snapshot
+        for start in range(0, len(snapshot.ids), batch_size):
+            end = start + batch_size
+            yield {
+                "ids": snapshot.ids[start:end],
+                "embeddings": snapshot.matrix[start:end].tolist(),
+                "documents": snapshot.documents[start:end],
+                "metadatas": snapshot.metadatas[start:end]
+            }
+
+    def copy_from(self, source, batch_size: int = WRITE_BATCH_SIZE, stop_event=None, progress_callback=None,
+                  only_ids: Optional[Set[str]] = None) -> int:
+        """
+        Copy every record of another store, embeddings included.
+
+        Args:
+            source: Vector store to copy from
+            batch_size: Records per batch
+            stop_event: threading.Event; copying stops early once it is set
+            progress_callback: Called with the number of records copied so far
+            only_ids: Copy only records with these IDs (default: all)
+
+        Returns:
+            Number of records copied
+        """
+        copied = 0
+        for batch in source.iter_records(batch_size):
+            if stop_event is not None and stop_event.is_set():
+                break
+            if only_ids is not None:
+                batch = select_records(batch, only_ids)
+                if not batch["ids"]:
+                    continue
+            self.add_documents(
+                [{"content": content, "metadata": metadata}
+                 for content, metadata in zip(batch["documents"], batch["metadatas"])],
+                batch["embeddings"],
+                ids=batch["ids"]
+            )
+            copied += len(batch["ids"])
+            if progress_callback is not None:
+                progress_callback(copied)
+
+        logger.info(f"Copied {copied} documents from '{source.collection_name}' to '{self.collection_name}'")
+        return copied
+
+    def delete_collection(self):
+        """Delete the entire collection."""
+        with self._lock:
+            matrix_files = [self.matrix_path, *self.persist_directory.glob(f"{self.collection_name}.*.npy")]
+            for path in (self.sidecar_path, *matrix_files):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._snapshot = _Snapshot(None, [], [], [])
+            self._matrix_file = None
+            self._buffer = None
+            self._loaded_mtime = None
+            self._dirty = False
+        logger.info(f"Deleted collection '{self.collection_name}'")
+
+    def clear_collection(self):
+        """Clear all documents from the collection."""
+        with self._lock:
+            self._snapshot = _Snapshot(None, [], [], [])
+            self._buffer = None
+            self._dirty = True
+        self.flush()
+        logger.info(f"Cleared collection '{self.collection_name}'")
+
+    def count(self, refresh: bool = False) -> int:
+        """
+        Number of documents in the collection.
+
+        Args:
+            refresh: Unused; the count is always read from the loaded snapshot
+
+        Returns:
+            Document count
+        """
+        self._init_client()
+        return len(self._snapshot.ids)
+
+    def get_stats(self, refresh: bool = False) -> Dict:
+        """
+        Get statistics about the vector store.
+
+        Args:
+            refresh: Unused; kept for interface compatibility
+
+        Returns:
+            Dictionary with collection statistics
+        """
+        return {
+            "collection_name": self.collection_name,
+            "document_count": self.count(),
+            "persist_directory": str(self.persist_directory)
+        }
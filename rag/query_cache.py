@@ -0,0 +1,190 @@
+"""
+Query Embedding Cache
+LRU cache of query embeddings keyed by (model name, normalised query text),
+with an optional SQLite tier so cached queries survive restarts.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalise a query so trivially different spellings share a cache entry.
+
+    Applies Unicode NFKC normalisation, collapses runs of whitespace and
+    strips the ends. Case is preserved because cased models embed it.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Normalised text
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def make_query_key(model_name: str, text: str) -> str:
+    """
+    Build the cache key of a query.
+
+    Args:
+        model_name: Embedding model name
+        text: Query text (normalised here)
+
+    Returns:
+        SHA-256 hex digest of the model name and normalised text
+    """
+    payload = f"{model_name}\n{normalize_query(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """In-memory LRU of query embeddings, optionally backed by SQLite."""
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None, max_disk_entries: int = 20000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of embeddings kept in memory
+            db_path: SQLite file for persistence (None keeps the cache in memory only)
+            max_disk_entries: Maximum number of embeddings kept on disk
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, embedding BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_embeddings_accessed ON query_embeddings (accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, model_name: str, text: str) -> Optional[List[float]]:
+        """
+        Look up a query embedding.
+
+        Args:
+            model_name: Embedding model name
+            text: Query text
+
+        Returns:
+            The cached embedding, or None on a miss
+        """
+        key = make_query_key(model_name, text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT embedding FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE query_embeddings SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._conn.commit()
+                    embedding = array("f", row[0]).tolist()
+                    self._remember(key, embedding)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return embedding
+
+            self.misses += 1
+            return None
+
+    def set(self, model_name: str, text: str, embedding: List[float]):
+        """
+        Store a query embedding.
+
+        Args:
+            model_name: Embedding model name
+            text: Query text
+            embedding: Embedding vector
+        """
+        key = make_query_key(model_name, text)
+        embedding = list(embedding)
+        with self._lock:
+            self._remember(key, embedding)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, embedding, accessed_at) VALUES (?, ?, ?)",
+                    (key, array("f", embedding).tobytes(), time.time())
+                )
+                self._conn.execute(
+                    "DELETE FROM query_embeddings WHERE key IN ("
+                    "SELECT key FROM query_embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, embedding: List[float]):
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached embedding and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM query_embeddings")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts, hit rate and entry counts
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            disk_entries = None
+            if self._conn is not None:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "db_path": self.db_path
+            }
@@ -3,18 +3,37 @@ RAG Retriever
 Main interface for document ingestion and retrieval with citation support.
 """
 
+import heapq
+import json
 import logging
-from typing import List, Dict, Tuple, Optional
+import math
+import os
+import threading
+import time
+from typing import List, Dict, Tuple, Optional, Union
 from pathlib import Path
 
 from .document_loader import PDFLoader
-from .text_chunker import TextChunker
+from .text_chunker import create_chunker
 from .embeddings import EmbeddingModel
-from .vector_store import VectorStore
+from .query_cache import QueryEmbeddingCache
+from .embedding_cache import ChunkEmbeddingCache
+from .vector_store import VectorStore, create_vector_store
+from .index_manifest import IndexManifest
+from .lexical_index import LexicalIndex
+from .selection import mmr_select, merge_adjacent_chunks
+from .context_packer import pack_context
+from .ingest_pipeline import IngestPipeline, IngestCancelled
 
 logger = logging.getLogger(__name__)
 
 
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
 class RAGRetriever:
     """Main RAG interface for document retrieval with citation support."""
 
@@ -25,7 +44,24 @@ class RAGRetriever:
         collection_name: str = "product_knowledge",
         embedding_model: str = "all-MiniLM-L6-v2",
         chunk_size: int = 1000,
-        chunk_overlap: int = 150
+        chunk_overlap: int = 150,
+        chunk_unit: str = "chars",
+        extract_workers: int = 1,
+        pages_per_task: int = 50,
+        ingest_batch_size: int = 64,
+        ingest_queue_size: int = 4,
+        query_cache_size: int = 1024,
+        query_cache_path: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
+        embedding_cache_max_entries: int = 200000,
+        vector_backend: str = "chroma",
+        hybrid_search: bool = True,
+        hybrid_candidates: int = 20,
+        rrf_k: int = 60,
+        mmr_lambda: float = 0.7,
+        mmr_candidates: int = 20,
+        merge_adjacent: bool = True,
+        context_token_budget: int = 1500
     ):
         """
         Initialize the RAG retriever.
@@ -35,86 +71,270 @@ class RAGRetriever:
             persist_directory: Directory for vector database storage
             collection_name: Name of the vector store collection
             embedding_model: Name of the sentence-transformers model
-            chunk_size: Size of text chunks in characters
-            chunk_overlap: Overlap between chunks in characters
+            chunk_size: Size of text chunks in chunk_unit
+            chunk_overlap: Overlap between chunks in chunk_unit
+            chunk_unit: Unit of chunk sizes, "chars" or "tokens" (estimated LLM tokens)
+            extract_workers: Number of PDF extraction processes (1 extracts in-process)
+            pages_per_task: Pages per extraction task when using several processes
+            ingest_batch_size: Chunks per embedding and upsert batch during ingestion
+            ingest_queue_size: Batches buffered between ingestion stages
+            query_cache_size: Query embeddings kept in memory (0 disables the cache)
+            query_cache_path: SQLite file persisting query embeddings (optional)
+            embedding_cache_dir: Directory of the persistent chunk embedding cache (optional)
+            embedding_cache_max_entries: Chunk embeddings kept in that cache
+            vector_backend: Vector store backend, "chroma" or "numpy"
+            hybrid_search: Fuse BM25 keyword results with dense results
+            hybrid_candidates: Results taken from each retriever before fusion
+            rrf_k: Reciprocal-rank-fusion constant (higher flattens rank differences)
+            mmr_lambda: Relevance/diversity trade-off of MMR selection (1.0 disables MMR)
+            mmr_candidates: Candidates retrieved for MMR to choose from
+            merge_adjacent: Merge retrieved chunks that are consecutive on the same page
+            context_token_budget: Default token budget of format_context_with_citations
         """
         self.documents_dir = documents_dir
         self.persist_directory = persist_directory
+        self.vector_backend = vector_backend
+        self.hybrid_search = hybrid_search
+        self.hybrid_candidates = hybrid_candidates
+        self.rrf_k = rrf_k
+        self.mmr_lambda = mmr_lambda
+        self.mmr_candidates = mmr_candidates
+        self.merge_adjacent = merge_adjacent
+        self.context_token_budget = context_token_budget
+        self.ingest_batch_size = ingest_batch_size
+        self.ingest_queue_size = ingest_queue_size
 
         # Initialize components
-        self.loader = PDFLoader(documents_dir)
-        self.chunker = TextChunker(chunk_size, chunk_overlap)
-        self.embeddings = EmbeddingModel(embedding_model)
-        self.vector_store = VectorStore(persist_directory, collection_name)
+        self.loader = PDFLoader(documents_dir, extract_workers, pages_per_task)
+        self.chunker = create_chunker(chunk_size, chunk_overlap, chunk_unit)
+        self.query_cache = QueryEmbeddingCache(query_cache_size, query_cache_path) if query_cache_size > 0 else None
+        self.embeddings = EmbeddingModel(embedding_model, self.query_cache)
+        self.embedding_cache = None
+        if embedding_cache_dir:
+            self.embedding_cache = ChunkEmbeddingCache(embedding_cache_dir, embedding_model, embedding_cache_max_entries)
+
+        # Settings recorded in the manifest of indexed files (used for
+        # incremental re-indexing); a change forces a full re-index
+        self.collection_name = collection_name
+        self._manifest_settings = {
+            "collection_name": collection_name,
+            "vector_backend": vector_backend,
+            "embedding_model": embedding_model,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "chunk_unit": chunk_unit
+        }
+
+        # rebuild_index builds a new collection and swaps it in; the pointer
+        # file records the active one so every process follows the swap
+        self._active_path = Path(persist_directory) / f"{collection_name}_active.json"
+        self._active_mtime = None
+        self._open_collection(self._read_active().get("collection", collection_name))
+        self._index_lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+        # Warm-up state reported by get_readiness
+        self._warmup_lock = threading.Lock()
+        self._warmup_thread = None
+        self._warmup = {"status": "cold", "started_at": None, "seconds": None, "error": None}
 
         logger.info("RAG Retriever initialized")
 
-    def ingest_documents(self, clear_existing: bool = True) -> Dict:
+    def ingest_documents(self, clear_existing: bool = True, progress_callback=None) -> Dict:
         """
         Load, chunk, embed, and store all PDF documents.
 
         Args:
-            clear_existing: Whether to clear existing documents before ingestion
+            clear_existing: Whether to clear existing documents before ingestion;
+                otherwise only added, changed and removed files are processed
+            progress_callback: Called with progress snapshots while indexing
 
         Returns:
             Dictionary with ingestion statistics
         """
         logger.info("Starting document ingestion...")
 
-        # Clear existing documents if requested
-        if clear_existing:
-            try:
-                self.vector_store.clear_collection()
-            except Exception as e:
-                logger.warning(f"Could not clear collection: {e}")
+        with self._index_lock:
+            self._refresh_active()
+            # Clear existing documents if requested
+            if clear_existing:
+                try:
+                    self.vector_store.clear_collection()
+                except Exception as e:
+                    logger.warning(f"Could not clear collection: {e}")
+                self.manifest.clear()
+                self.lexical_index.clear()
 
-        # Load all PDFs
-        documents = self.loader.load_all_documents()
-        if not documents:
-            return {
-                "status": "warning",
-                "message": "No documents found to ingest",
-                "documents_processed": 0,
-                "chunks_created": 0
-            }
+            return self._update_index(self.vector_store, self.manifest, self.lexical_index, progress_callback)
 
-        # Get unique document names
-        doc_names = set(doc["metadata"]["source"] for doc in documents)
+    def update_index(self, progress_callback=None) -> Dict:
+        """
+        Incrementally re-index the documents directory.
 
-        # Chunk documents
-        chunked_docs = self.chunker.chunk_documents(documents)
-        if not chunked_docs:
-            return {
-                "status": "error",
-                "message": "Failed to chunk documents",
-                "documents_processed": len(doc_names),
-                "chunks_created": 0
-            }
+        Files whose content hash matches the manifest are skipped, added and
+        changed files are re-chunked (re-using stored embeddings of unchanged
+        chunks) and vectors of removed files are deleted.
 
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(chunked_docs)} chunks...")
-        texts = [doc["content"] for doc in chunked_docs]
-        embeddings = self.embeddings.embed_texts(texts)
+        Args:
+            progress_callback: Called with progress snapshots while indexing
+
+        Returns:
+            Dictionary with ingestion statistics
+        """
+        with self._index_lock:
+            self._refresh_active()
+            return self._update_index(self.vector_store, self.manifest, self.lexical_index, progress_callback)
+
+    def _reconcile_index(self, vector_store: VectorStore, manifest: IndexManifest, lexical_index: LexicalIndex):
+        """Make the manifest and the stored chunks agree before indexing into them."""
+        # Chunks written with other chunking or embedding settings cannot be
+        # matched against the new ones; drop them and index everything again
+        if manifest.settings_changed:
+            logger.info("Indexing settings changed, clearing the vector store")
+            vector_store.clear_collection()
+            lexical_index.clear()
+            manifest.clear()
+        # The manifest only describes a populated collection; if the vector
+        # store was wiped externally, index everything again
+        elif manifest.files() and vector_store.count(refresh=True) == 0:
+            logger.info("Vector store is empty, discarding index manifest")
+            manifest.clear()
+            lexical_index.clear()
+        # Conversely, chunks the manifest does not track (e.g. it was discarded
+        # after a settings change) would never be replaced or deleted; start
+        # from an empty collection instead
+        elif not manifest.files() and vector_store.count(refresh=True) > 0:
+            logger.info("Index manifest does not track the stored chunks, clearing the vector store")
+            vector_store.clear_collection()
+            lexical_index.clear()
+
+    def _update_index(self, vector_store: VectorStore, manifest: IndexManifest, lexical_index: LexicalIndex,
+                      progress_callback=None, cancel_event=None) -> Dict:
+        started = time.time()
+        self._reconcile_index(vector_store, manifest, lexical_index)
+
+        documents_dir = self.loader.documents_dir
+        current = {}
+        if documents_dir.exists():
+            current = {path.name: path for path in sorted(documents_dir.glob("*.pdf"))}
+
+        stats = {
+            "files_added": [],
+            "files_changed": [],
+            "files_removed": [],
+            "files_unchanged": 0,
+            "files_failed": [],
+            "pages_processed": 0,
+            "chunks_created": 0,
+            "chunks_embedded": 0,
+            "chunks_reused": 0,
+            "chunks_cached": 0,
+            "chunks_deleted": 0
+        }
 
-        # Store in vector database
-        self.vector_store.add_documents(chunked_docs, embeddings)
+        # Delete vectors of removed files
+        for filename in manifest.files():
+            if filename not in current:
+                entry = manifest.remove(filename)
+                stats["chunks_deleted"] += len(entry.get("chunks", []))
+                stats["files_removed"].append(filename)
+        vector_store.delete_by_source(stats["files_removed"])
+        lexical_index.remove_sources(stats["files_removed"])
+
+        # Index added and changed files; extraction, chunking, embedding and
+        # upserts run as overlapping stages over bounded batches
+        to_index = []
+        for filename, path in current.items():
+            if manifest.is_unchanged(filename, str(path)):
+                stats["files_unchanged"] += 1
+            else:
+                to_index.append(path)
+
+        indexed, progress = self._run_pipeline(
+            to_index, vector_store, manifest, lexical_index, progress_callback, cancel_event
+        )
+        for filename, is_new in indexed:
+            stats["files_added" if is_new else "files_changed"].append(filename)
+        stats["pages_processed"] = progress["pages"]
+        stats["chunks_created"] = progress["upserted"]
+        stats["chunks_embedded"] = progress["embedded"]
+        stats["chunks_reused"] = progress["reused"]
+        stats["chunks_cached"] = progress["cached"]
+        stats["chunks_deleted"] += progress["deleted"]
+        stats["files_failed"] = progress["failed_files"]
+
+        processed = stats["files_added"] + stats["files_changed"]
+        if not current and not stats["files_removed"]:
+            status, message = "warning", "No documents found to ingest"
+        elif stats["files_failed"]:
+            status, message = "warning", f"Could not extract {len(stats['files_failed'])} documents, they will be retried"
+        elif not processed and not stats["files_removed"]:
+            status, message = "success", "Index is up to date"
+        else:
+            status, message = "success", "Documents ingested successfully"
 
         result = {
-            "status": "success",
-            "message": "Documents ingested successfully",
-            "documents_processed": len(doc_names),
-            "pages_processed": len(documents),
-            "chunks_created": len(chunked_docs),
-            "document_names": list(doc_names)
+            "status": status,
+            "message": message,
+            "documents_processed": len(processed),
+            "document_names": processed,
+            **stats,
+            "elapsed_seconds": round(time.time() - started, 2)
         }
 
         logger.info(f"Ingestion complete: {result}")
         return result
 
+    def _run_pipeline(self, paths: List[Path], vector_store: VectorStore, manifest: IndexManifest,
+                      lexical_index: LexicalIndex, progress_callback=None,
+                      cancel_event=None) -> Tuple[List[Tuple[str, bool]], Dict]:
+        """
+        Index files through the streaming ingest pipeline.
+
+        Args:
+            paths: Added or changed files
+            vector_store: Collection receiving the chunks
+            manifest: Manifest of that collection
+            lexical_index: BM25 index of that collection
+            progress_callback: Called with progress snapshots while indexing
+            cancel_event: threading.Event that cancels the run when set
+
+        Returns:
+            Tuple of (indexed (file name, is new) pairs, final progress snapshot)
+        """
+        pipeline = IngestPipeline(
+            self.loader,
+            self.chunker,
+            self.embeddings,
+            vector_store,
+            manifest,
+            batch_size=self.ingest_batch_size,
+            queue_size=self.ingest_queue_size,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            embedding_cache=self.embedding_cache,
+            lexical_index=lexical_index
+        )
+        try:
+            indexed = pipeline.run(paths)
+        finally:
+            # Keep files completed before a failure so they are not redone;
+            # vectors are flushed first so the manifest never gets ahead of them
+            vector_store.flush()
+            lexical_index.save()
+            manifest.save()
+        return indexed, pipeline.progress.to_dict()
+
     def retrieve(self, query: str, top_k: int = 5) -> List[Dict]:
         """
         Retrieve relevant document chunks for a query.
 
+        With hybrid search the dense and BM25 result lists are merged by
+        reciprocal-rank fusion; "score" stays the cosine similarity. MMR then
+        picks top_k diverse chunks from a larger candidate pool, and chunks
+        adjacent on the same page are merged into one entry (so fewer than
+        top_k entries may be returned).
+
         Args:
             query: Search query
             top_k: Number of results to return
@@ -128,21 +348,171 @@ class RAGRetriever:
         # Generate query embedding
         query_embedding = self.embeddings.embed_query(query)
 
-        # Query vector store
-        results = self.vector_store.query(query_embedding, top_k)
-
+        results = self._search([query], [query_embedding], top_k)
         logger.info(f"Retrieved {len(results)} documents for query: {query[:50]}...")
         return results
 
+    def retrieve_many(self, queries: Union[List[str], Dict[str, str]], top_k: int = 5) -> List[Dict]:
+        """
+        Retrieve chunks for several focused sub-queries at once.
+
+        All queries are embedded in one encode batch and searched with one
+        vector store call; their rankings are fused by reciprocal rank and
+        deduplicated before MMR selection and merging, as in retrieve.
+
+        Args:
+            queries: Query texts, or a mapping of aspect label to query text
+            top_k: Number of results to return in total
+
+        Returns:
+            List of relevant documents; "aspects" lists the labels (or query
+            texts) that retrieved each one, best rank first, and
+            "aspect_ranks" maps each of them to its rank
+        """
+        if isinstance(queries, dict):
+            pairs = [(label, text) for label, text in queries.items() if text]
+        else:
+            pairs = [(text, text) for text in queries if text]
+        if not pairs:
+            return []
+        labels = [label for label, _ in pairs]
+        texts = [text for _, text in pairs]
+
+        query_embeddings = self.embeddings.embed_queries(texts)
+
+        results = self._search(texts, query_embeddings, top_k, labels)
+        logger.info(f"Retrieved {len(results)} documents for {len(texts)} queries")
+        return results
+
+    def _search(self, queries: List[str], query_embeddings: List[List[float]], top_k: int,
+                labels: Optional[List[str]] = None) -> List[Dict]:
+        """Candidate retrieval, rank fusion, MMR selection and merging for one or more queries."""
+        self._refresh_active()
+        vector_store, lexical_index = self.vector_store, self.lexical_index
+        use_mmr = self.mmr_lambda < 1.0
+        pool = max(top_k, self.mmr_candidates) if use_mmr else top_k
+        per_query = max(pool, self.hybrid_candidates) if self.hybrid_search else pool
+
+        # Rankings are (query index, "dense" or "lexical", {chunk ID: rank})
+        dense_lists = vector_store.query_many(query_embeddings, per_query, include_embeddings=use_mmr)
+        documents = {}
+        rankings = []
+        for q, dense in enumerate(dense_lists):
+            for doc in dense:
+                known = documents.get(doc["id"])
+                if known is None or doc["score"] > known["score"]:
+                    documents[doc["id"]] = doc
+            rankings.append((q, "dense", {doc["id"]: rank for rank, doc in enumerate(dense, start=1)}))
+        if self.hybrid_search:
+            self._ensure_lexical_index()
+            for q, query in enumerate(queries):
+                lexical = lexical_index.search(query, per_query)
+                if lexical:
+                    rankings.append((q, "lexical", {chunk_id: rank for rank, (chunk_id, _) in enumerate(lexical, start=1)}))
+
+        if len(rankings) == 1:
+            # A single dense ranking: nothing to fuse
+            results = list(dense_lists[0][:pool])
+        else:
+            fused = {}
+            for _, _, ranks in rankings:
+                for chunk_id, rank in ranks.items():
+                    fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (self.rrf_k + rank)
+            top = heapq.nlargest(pool, fused, key=fused.get)
+
+            # Keyword-only hits are fetched from the store and scored like dense hits
+            for doc in vector_store.get_documents([chunk_id for chunk_id in top if chunk_id not in documents]):
+                embedding = doc["embedding"] if use_mmr else doc.pop("embedding")
+                doc["score"] = max(
+                    _cosine_similarity(query_embedding, embedding) for query_embedding in query_embeddings
+                ) if embedding is not None else 0.0
+                documents[doc["id"]] = doc
+
+            results = []
+            for chunk_id in top:
+                if chunk_id not in documents:
+                    continue  # Lexical index ahead of the vector store
+                doc = {**documents[chunk_id], "rrf_score": fused[chunk_id]}
+                for kind in ("dense", "lexical"):
+                    ranks = [r[chunk_id] for _, k, r in rankings if k == kind and chunk_id in r]
+                    doc[f"{kind}_rank"] = min(ranks) if ranks else None
+                results.append(doc)
+
+        if labels is not None:
+            for i, doc in enumerate(results):
+                aspect_ranks = {}
+                for q, _, ranks in rankings:
+                    if doc["id"] in ranks:
+                        rank = ranks[doc["id"]]
+                        aspect_ranks[labels[q]] = min(rank, aspect_ranks.get(labels[q], rank))
+                results[i] = {
+                    **doc,
+                    "aspects": sorted(aspect_ranks, key=aspect_ranks.get),
+                    "aspect_ranks": aspect_ranks
+                }
+
+        # Drop near-duplicate neighbours (chunks share overlap text)
+        if use_mmr:
+            results = [
+                {key: value for key, value in doc.items() if key != "embedding"}
+                for doc in mmr_select(results, top_k, self.mmr_lambda)
+            ]
+        if self.merge_adjacent:
+            results = merge_adjacent_chunks(results)
+        return results
+
+    def _ensure_lexical_index(self):
+        """
+        Build the BM25 index from the vector store if it is missing, e.g. for a
+        collection indexed before hybrid search existed.
+
+        Skipped while an index update holds the lock; that update keeps the
+        lexical index in step itself.
+        """
+        lexical_index = self.lexical_index
+        if len(lexical_index):
+            return
+        lexical_index.refresh()
+        if len(lexical_index) or not self._index_lock.acquire(blocking=False):
+            return
+        try:
+            lexical_index, vector_store = self.lexical_index, self.vector_store
+            if len(lexical_index) or vector_store.count() == 0:
+                return
+            for batch in vector_store.iter_records():
+                lexical_index.add(
+                    batch["ids"],
+                    batch["documents"],
+                    [metadata.get("source", "") for metadata in batch["metadatas"]]
+                )
+            lexical_index.save()
+            logger.info(f"Built lexical index for '{self.active_collection}' with {len(lexical_index)} chunks")
+        finally:
+            self._index_lock.release()
+
+    @staticmethod
+    def _citation_header(number: int, doc: Dict) -> str:
+        metadata = doc.get("metadata", {})
+        source = metadata.get("source", "Unknown Document")
+        section = metadata.get("section", "Unknown Section")
+        page = metadata.get("page", "?")
+        return f'[{number}] From "{source}", {section} (Page {page}):'
+
     def format_context_with_citations(
         self,
-        documents: List[Dict]
+        documents: List[Dict],
+        token_budget: Optional[int] = None
     ) -> Tuple[str, List[Dict]]:
         """
         Format retrieved documents as context with citations.
 
+        The context is packed into a token budget: documents are ranked by
+        score, trimmed on sentence boundaries to share the budget, and those
+        that cannot get a useful share are left out (see pack_context).
+
         Args:
             documents: List of retrieved documents
+            token_budget: Maximum context tokens (defaults to context_token_budget)
 
         Returns:
             Tuple of (formatted context string, list of citations)
@@ -150,32 +520,34 @@ class RAGRetriever:
         if not documents:
             return "", []
 
+        budget = token_budget if token_budget is not None else self.context_token_budget
+        packed = pack_context(documents, budget, header_for=self._citation_header)
+
         context_parts = []
         citations = []
 
-        for i, doc in enumerate(documents, start=1):
+        for i, (doc, content) in enumerate(packed, start=1):
             metadata = doc.get("metadata", {})
-            content = doc.get("content", "")
             score = doc.get("score", 0)
 
-            # Extract citation info
-            source = metadata.get("source", "Unknown Document")
-            section = metadata.get("section", "Unknown Section")
-            page = metadata.get("page", "?")
-
             # Build citation
             citation = {
                 "id": i,
-                "document": source,
-                "section": section,
-                "page": page,
+                "document": metadata.get("source", "Unknown Document"),
+                "section": metadata.get("section", "Unknown Section"),
+                "page": metadata.get("page", "?"),
                 "relevance_score": round(score, 3)
             }
+            if "start_offset" in metadata and "end_offset" in metadata:
+                # Character range of the chunk in the page text, for highlighting
+                citation["start_offset"] = metadata["start_offset"]
+                citation["end_offset"] = metadata["end_offset"]
+            if doc.get("aspects"):
+                citation["aspects"] = doc["aspects"]
             citations.append(citation)
 
             # Build context entry
-            context_entry = f'[{i}] From "{source}", {section} (Page {page}):\n"{content[:500]}{"..." if len(content) > 500 else ""}"'
-            context_parts.append(context_entry)
+            context_parts.append(f'{self._citation_header(i, doc)}\n"{content}"')
 
         context_str = "\n\n".join(context_parts)
         return context_str, citations
@@ -187,20 +559,100 @@ class RAGRetriever:
         Returns:
             Dictionary with system status information
         """
-        stats = self.vector_store.get_stats()
+        self._refresh_active()
+        # Off the query path, so read the live count (other workers may have written)
+        stats = self.vector_store.get_stats(refresh=True)
         doc_list = self.loader.get_document_list()
 
         return {
             "enabled": True,
+            "collection": self.active_collection,
+            "vector_backend": self.vector_backend,
             "documents_in_knowledge_base": len(doc_list),
             "chunks_in_vector_store": stats["document_count"],
+            "chunks_in_lexical_index": len(self.lexical_index),
+            "hybrid_search": self.hybrid_search,
             "persist_directory": stats["persist_directory"],
+            "query_cache": self.query_cache.get_stats() if self.query_cache else None,
+            "embedding_cache": self.embedding_cache.get_stats() if self.embedding_cache else None,
             "documents": doc_list
         }
 
+    def get_chunk_count(self) -> int:
+        """
+        Number of chunks in the active collection.
+
+        Cheap enough for the query path: the count is cached by the vector
+        store for a few seconds, unlike get_status which re-reads it and also
+        lists the documents directory.
+
+        Returns:
+            Chunk count
+        """
+        self._refresh_active()
+        return self.vector_store.count()
+
+    def warm_up(self) -> Dict:
+        """
+        Load the embedding model and open the vector store ahead of the first query.
+
+        Runs one embedding and one single-result query so model weights and the
+        collection's index are resident (and loads or builds the BM25 index);
+        the query bypasses the query cache.
+
+        Returns:
+            Readiness dictionary (see get_readiness)
+        """
+        with self._warmup_lock:
+            self._warmup.update(status="warming", started_at=time.time(), seconds=None, error=None)
+
+        started = time.time()
+        try:
+            embedding = self.embeddings.embed_texts(["warm-up"])[0]
+            self._refresh_active()
+            self.vector_store.query(embedding, top_k=1)
+            if self.hybrid_search:
+                self._ensure_lexical_index()
+        except Exception as e:
+            logger.error(f"RAG warm-up failed: {e}")
+            with self._warmup_lock:
+                self._warmup.update(status="error", seconds=round(time.time() - started, 2), error=str(e))
+            return self.get_readiness()
+
+        with self._warmup_lock:
+            self._warmup.update(status="ready", seconds=round(time.time() - started, 2))
+        logger.info(f"RAG warm-up finished in {self._warmup['seconds']}s")
+        return self.get_readiness()
+
+    def start_warm_up(self) -> bool:
+        """
+        Run warm_up on a background thread.
+
+        Returns:
+            True if a warm-up was started, False if one already ran or is running
+        """
+        with self._warmup_lock:
+            if self._warmup["status"] in ("warming", "ready"):
+                return False
+            self._warmup["status"] = "warming"
+            self._warmup_thread = threading.Thread(target=self.warm_up, name="rag-warm-up", daemon=True)
+            self._warmup_thread.start()
+        return True
+
+    def get_readiness(self) -> Dict:
+        """
+        Report whether the embedding model and vector store are loaded.
+
+        Returns:
+            Dictionary with "ready", the warm-up status ("cold", "warming",
+            "ready" or "error"), its duration and error
+        """
+        with self._warmup_lock:
+            return {"ready": self._warmup["status"] == "ready", **self._warmup}
+
     def add_document(self, file_path: str) -> Dict:
         """
-        Add a single document to the knowledge base.
+        Add (or refresh) a single document in the knowledge base.
 
         Args:
             file_path: Path to the PDF file
@@ -208,36 +660,238 @@ class RAGRetriever:
         Returns:
             Dictionary with ingestion result
         """
-        # Load the document
-        documents = self.loader.load_pdf(file_path)
-        if not documents:
+        path = Path(file_path)
+        if not path.exists():
+            return {
+                "status": "error",
+                "message": f"Failed to load document: {file_path}"
+            }
+
+        with self._index_lock:
+            self._refresh_active()
+            self._reconcile_index(self.vector_store, self.manifest, self.lexical_index)
+            if self.manifest.is_unchanged(path.name, str(path)):
+                return {
+                    "status": "success",
+                    "message": "Document is already indexed",
+                    "pages_processed": 0,
+                    "chunks_created": 0
+                }
+            _, progress = self._run_pipeline([path], self.vector_store, self.manifest, self.lexical_index)
+
+        if progress["failed_files"] or not progress["pages"]:
             return {
                 "status": "error",
                 "message": f"Failed to load document: {file_path}"
             }
 
-        # Chunk documents
-        chunked_docs = self.chunker.chunk_documents(documents)
+        return {
+            "status": "success",
+            "message": f"Document added successfully",
+            "pages_processed": progress["pages"],
+            "chunks_created": progress["upserted"],
+            "chunks_embedded": progress["embedded"],
+            "chunks_reused": progress["reused"],
+            "chunks_cached": progress["cached"],
+            "chunks_deleted": progress["deleted"]
+        }
+
+    def remove_document(self, filename: str) -> Dict:
+        """
+        Remove a document's chunks from the vector store.
 
-        # Generate embeddings
-        texts = [doc["content"] for doc in chunked_docs]
-        embeddings = self.embeddings.embed_texts(texts)
+        Args:
+            filename: Source file name
 
-        # Store in vector database
-        self.vector_store.add_documents(chunked_docs, embeddings)
+        Returns:
+            Dictionary with removal result
+        """
+        with self._index_lock:
+            self._refresh_active()
+            entry = self.manifest.remove(filename)
+            self.vector_store.delete_by_source([filename])
+            self.lexical_index.remove_sources([filename])
+            self.vector_store.flush()
+            self.lexical_index.save()
+            self.manifest.save()
 
         return {
             "status": "success",
-            "message": f"Document added successfully",
-            "pages_processed": len(documents),
-            "chunks_created": len(chunked_docs)
+            "message": f"Document removed from index",
+            "chunks_deleted": len(entry.get("chunks", [])) if entry else 0
         }
 
-    def rebuild_index(self) -> Dict:
+    def rebuild_index(self, full: bool = False, progress_callback=None, cancel_event=None) -> Dict:
         """
-        Rebuild the entire vector index from documents.
+        Bring the vector index in line with the documents directory without
+        disturbing queries.
+
+        The index is built into a new collection while queries keep using the
+        active one; the new collection is swapped in only once it is complete.
+        An incremental rebuild first copies the active collection's vectors so
+        only added and changed files are embedded. The index lock is held only
+        to snapshot the manifest and, at the end, to catch up with documents
+        added or removed meanwhile and swap.
+
+        Args:
+            full: Re-embed everything instead of processing only added,
+                changed and removed files
+            progress_callback: Called with progress snapshots; each has a
+                "phase" of "copying", "indexing" or "swapping"
+            cancel_event: threading.Event; when set the rebuild stops, the new
+                collection is dropped and IngestCancelled is raised
 
         Returns:
             Dictionary with rebuild result
         """
-        return self.ingest_documents(clear_existing=True)
+        def report(phase: str, **fields):
+            if progress_callback is not None:
+                progress_callback({"phase": phase, **fields})
+
+        with self._rebuild_lock:
+            with self._index_lock:
+                self._refresh_active()
+                source_store, source_lexical = self.vector_store, self.lexical_index
+                if self.manifest.settings_changed or (
+                        not self.manifest.files() and source_store.count(refresh=True) > 0):
+                    # The active chunks are not tracked by a current manifest,
+                    # copying them would carry them into the new collection
+                    full = True
+                name = f"{self.collection_name}_{int(time.time() * 1000)}"
+                vector_store = self._create_store(name)
+                manifest = IndexManifest(self._manifest_path(name), self._manifest_settings)
+                lexical_index = LexicalIndex(self._lexical_path(name))
+                if not full:
+                    manifest.copy_from(self.manifest)
+            logger.info(f"Rebuilding index into collection '{name}' (full={full})")
+
+            try:
+                # Copying and indexing run without the index lock so document
+                # uploads and deletions are not held up; only chunks tracked by
+                # the manifest snapshot are copied, and changes made meanwhile
+                # are caught up with before the swap
+                if not full:
+                    tracked = manifest.chunk_ids()
+                    report("copying", chunks_copied=0)
+                    vector_store.copy_from(
+                        source_store,
+                        stop_event=cancel_event,
+                        progress_callback=lambda copied: report("copying", chunks_copied=copied),
+                        only_ids=tracked
+                    )
+                    lexical_index.copy_from(source_lexical, only_ids=tracked)
+                if cancel_event is not None and cancel_event.is_set():
+                    raise IngestCancelled()
+
+                result = self._update_index(
+                    vector_store, manifest, lexical_index,
+                    lambda snapshot: report("indexing", **snapshot),
+                    cancel_event
+                )
+                if cancel_event is not None and cancel_event.is_set():
+                    raise IngestCancelled()
+
+                with self._index_lock:
+                    self._refresh_active()
+                    catch_up = self._update_index(vector_store, manifest, lexical_index, cancel_event=cancel_event)
+                    for key, value in catch_up.items():
+                        if isinstance(value, list):
+                            result[key] = result[key] + value
+                        elif key.startswith(("chunks_", "pages_", "documents_")):
+                            result[key] += value
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise IngestCancelled()
+
+                    report("swapping")
+                    self._activate(name, vector_store, manifest, lexical_index)
+            except BaseException:
+                self._drop_collection(name, vector_store)
+                raise
+
+        result["collection"] = name
+        return result
+
+    def _create_store(self, collection_name: str) -> VectorStore:
+        return create_vector_store(self.vector_backend, self.persist_directory, collection_name)
+
+    def _manifest_path(self, collection_name: str) -> str:
+        return os.path.join(self.persist_directory, f"{collection_name}_manifest.json")
+
+    def _lexical_path(self, collection_name: str) -> str:
+        return os.path.join(self.persist_directory, f"{collection_name}_bm25.json")
+
+    def _read_active(self) -> Dict:
+        """Read the active-collection pointer ({} if there is none)."""
+        try:
+            with open(self._active_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not read active collection pointer {self._active_path}: {e}")
+            return {}
+
+    def _open_collection(self, name: str):
+        """Point queries and index updates at a collection."""
+        self.manifest = IndexManifest(self._manifest_path(name), self._manifest_settings)
+        self.vector_store = self._create_store(name)
+        self.lexical_index = LexicalIndex(self._lexical_path(name))
+        self.active_collection = name
+        try:
+            self._active_mtime = self._active_path.stat().st_mtime
+        except FileNotFoundError:
+            self._active_mtime = None
+
+    def _refresh_active(self):
+        """Follow a collection swap made by another process."""
+        try:
+            mtime = self._active_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._active_mtime:
+            return
+        name = self._read_active().get("collection", self.collection_name)
+        if name != self.active_collection:
+            logger.info(f"Active collection changed to '{name}'")
+            self._open_collection(name)
+        else:
+            self._active_mtime = mtime
+
+    def _activate(self, name: str, vector_store: VectorStore, manifest: IndexManifest,
+                  lexical_index: LexicalIndex):
+        """
+        Atomically make a collection the active one.
+
+        The previous collection is kept until the next swap so other processes
+        that have not noticed the swap yet can still query it.
+        """
+        previous = self.active_collection
+        retired = self._read_active().get("previous")
+
+        self._active_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._active_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"collection": name, "previous": previous}, f)
+        os.replace(tmp_path, self._active_path)
+
+        self.manifest = manifest
+        self.vector_store = vector_store
+        self.lexical_index = lexical_index
+        self.active_collection = name
+        self._active_mtime = self._active_path.stat().st_mtime
+        logger.info(f"Swapped active collection '{previous}' -> '{name}'")
+
+        if retired and retired not in (name, previous):
+            self._drop_collection(retired)
+
+    def _drop_collection(self, name: str, vector_store: Optional[VectorStore] = None):
+        """Delete a collection and its manifest, logging failures."""
+        try:
+            (vector_store or self._create_store(name)).delete_collection()
+        except Exception as e:
+            logger.warning(f"Could not delete collection '{name}': {e}")
+        for path in (self._manifest_path(name), self._lexical_path(name)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,172 @@
+"""
+Result Selection
+Redundancy-aware post-processing of retrieved chunks: maximal marginal
+relevance (MMR) selection and merging of adjacent chunks from the same page.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prefix length used to locate where one chunk's overlap starts in another
+_OVERLAP_PROBE = 32
+
+
+def mmr_select(candidates: List[Dict], k: int, lambda_mult: float = 0.7) -> List[Dict]:
+    """
+    Pick k candidates by maximal marginal relevance.
+
+    Each step takes the candidate maximising
+    lambda * relevance - (1 - lambda) * max similarity to those already picked,
+    computed over the whole candidate embedding matrix at once. Relevance is
+    the fused rank score when present, otherwise the similarity score, scaled
+    so the best candidate has relevance 1.
+
+    Args:
+        candidates: Retrieved chunks with an "embedding" field, best first
+        k: Number of chunks to select
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only
+
+    Returns:
+        Selected chunks in selection order
+    """
+    if len(candidates) <= k:
+        return list(candidates)
+
+    import numpy as np
+
+    embeddings = [doc.get("embedding") for doc in candidates]
+    dimension = next((len(e) for e in embeddings if e is not None), None)
+    if dimension is None:
+        return list(candidates[:k])
+    matrix = np.array(
+        [e if e is not None else np.zeros(dimension) for e in embeddings],
+        dtype=np.float32
+    )
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+
+    key = "rrf_score" if all("rrf_score" in doc for doc in candidates) else "score"
+    relevance = np.array([doc.get(key, 0.0) for doc in candidates], dtype=np.float32)
+    best_relevance = relevance.max()
+    relevance = relevance / best_relevance if best_relevance > 0 else np.ones_like(relevance)
+
+    similarity = matrix @ matrix.T
+    max_similarity = np.full(len(candidates), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    selected = []
+    for _ in range(k):
+        penalty = np.where(np.isfinite(max_similarity), max_similarity, 0.0)
+        scores = lambda_mult * relevance - (1 - lambda_mult) * penalty
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[:, best])
+
+    return [candidates[i] for i in selected]
+
+
+def _join_overlapping(first: str, second: str) -> str:
+    """Concatenate two consecutive chunks, dropping the text they share."""
+    probe = second[:_OVERLAP_PROBE]
+    if probe:
+        position = first.find(probe, max(0, len(first) - len(second)))
+        while position != -1:
+            if second.startswith(first[position:]):
+                return first + second[len(first) - position:]
+            position = first.find(probe, position + 1)
+    return first + "\n" + second
+
+
+def _join_chunks(content: str, previous: Dict, chunk: Dict) -> str:
+    """Append a chunk to merged content ending with the previous chunk."""
+    previous_end = previous.get("metadata", {}).get("end_offset")
+    chunk_start = chunk.get("metadata", {}).get("start_offset")
+    text = chunk["content"]
+    if isinstance(previous_end, int) and isinstance(chunk_start, int):
+        # Chunks are slices of the page text, so the offsets give the overlap
+        if chunk_start >= previous_end:
+            return content + "\n" + text
+        return content + text[previous_end - chunk_start:]
+    return _join_overlapping(content, text)
+
+
+def _chunk_position(doc: Dict) -> Optional[tuple]:
+    metadata = doc.get("metadata", {})
+    index = metadata.get("chunk_index")
+    if index is None:
+        return None
+    try:
+        return metadata.get("source"), metadata.get("page"), int(index)
+    except (TypeError, ValueError):
+        return None
+
+
+def merge_adjacent_chunks(documents: List[Dict]) -> List[Dict]:
+    """
+    Merge retrieved chunks that are consecutive on the same page.
+
+    A run of neighbouring chunks becomes one entry at the position of its
+    best-ranked member, with the overlap between them removed, the best
+    score kept, "chunk_indices" listing the merged chunks, the offsets
+    spanning the run and any "aspects" combined.
+
+    Args:
+        documents: Retrieved chunks, best first
+
+    Returns:
+        Chunks with adjacent runs merged, order otherwise preserved
+    """
+    positions = {i: _chunk_position(doc) for i, doc in enumerate(documents)}
+    by_position = {pos: i for i, pos in positions.items() if pos is not None}
+
+    merged = []
+    consumed = set()
+    for i, doc in enumerate(documents):
+        if i in consumed:
+            continue
+        position = positions[i]
+        if position is None:
+            merged.append(doc)
+            continue
+
+        # Walk back to the start of the run, then forward to its end
+        source, page, index = position
+        start = index
+        while (source, page, start - 1) in by_position:
+            start -= 1
+        members = []
+        end = start
+        while (source, page, end) in by_position:
+            members.append(by_position[(source, page, end)])
+            end += 1
+        if len(members) == 1:
+            merged.append(doc)
+            continue
+
+        consumed.update(members)
+        first = documents[members[0]]
+        content = first["content"]
+        metadata = {**first["metadata"], "chunk_indices": list(range(start, end))}
+        for previous, member in zip(members, members[1:]):
+            content = _join_chunks(content, documents[previous], documents[member])
+            if "end_offset" in metadata:
+                metadata["end_offset"] = documents[member]["metadata"].get("end_offset")
+        entry = {
+            **doc,
+            "content": content,
+            "metadata": metadata,
+            "score": max(documents[m].get("score", 0.0) for m in members)
+        }
+        if "aspects" in doc:
+            # Attribution of a merged entry covers all of its chunks
+            entry["aspects"] = list(dict.fromkeys(
+                aspect for m in [i] + members for aspect in documents[m].get("aspects", [])
+            ))
+        merged.append(entry)
+
+    if len(merged) < len(documents):
+        logger.info(f"Merged {len(documents)} retrieved chunks into {len(merged)} context entries")
+    return merged
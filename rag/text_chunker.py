@@ -4,63 +4,186 @@ Splits documents into optimal chunks for embedding and retrieval.
 """
 
 import logging
-from typing import List, Dict
+import re
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from .tokenization import TokenCounter, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# Boundaries between paragraphs and sentences, searched within a span of the
+# page text so no sub-strings are copied; a sentence break keeps its first
+# character (the punctuation mark) in the preceding sentence
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+_SENTENCE_BREAK = re.compile(r"[.!?]\s+|[\u3002\uff01\uff1f]\s*")
+_WORD = re.compile(r"\S+")
+_WORD_START = re.compile(r"(?<!\S)\S")
+
+# Characters scanned per overlap token when looking for the overlap start
+_MAX_CHARS_PER_TOKEN = 8
+
 
 class TextChunker:
     """Split documents into chunks while preserving metadata."""
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 150):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 150,
+        count_tokens: Optional[TokenCounter] = None
+    ):
         """
         Initialize the text chunker.
 
         Args:
-            chunk_size: Maximum size of each chunk in characters
-            chunk_overlap: Number of overlapping characters between chunks
+            chunk_size: Maximum size of each chunk, overlap excluded
+            chunk_overlap: Size of the text repeated from the previous chunk
+            count_tokens: Token counter; when given, sizes are in tokens,
+                otherwise in characters
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-
-    def _split_into_sentences(self, text: str) -> List[str]:
+        self.count_tokens = count_tokens
+
+    def _measure(self, text: str, start: int, end: int) -> int:
+        if self.count_tokens is None:
+            return end - start
+        return self.count_tokens(text[start:end])
+
+    @staticmethod
+    def _strip(text: str, start: int, end: int) -> Tuple[int, int]:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
+
+    @staticmethod
+    def _sentences(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        for match in _SENTENCE_BREAK.finditer(text, start, end):
+            stop = match.start() + 1
+            if stop > start:
+                yield start, stop
+            start = match.end()
+        if start < end:
+            yield start, end
+
+    def _hard_split(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """Cut a span with no usable boundary into windows that fit a chunk."""
+        while start < end:
+            stop = min(end, start + self.chunk_size)
+            size = self._measure(text, start, stop)
+            while size > self.chunk_size and stop - start > 1:
+                stop = start + (stop - start) // 2
+                size = self._measure(text, start, stop)
+            yield start, stop, size
+            start = stop
+
+    def _units(self, text: str) -> Iterator[Tuple[int, int, int]]:
         """
-        Split text into sentences.
-
-        Args:
-            text: Text to split
-
-        Returns:
-            List of sentences
+        Yield (start, end, size) of the pieces chunks are packed from: whole
+        paragraphs where they fit, else their sentences, else their words,
+        else fixed windows. Each level is only searched inside a piece too
+        large for the level above, so every character is scanned a bounded
+        number of times.
         """
-        # Simple sentence splitting on common delimiters
-        import re
-        # Split on period, exclamation, question mark followed by space or newline
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        limit = self.chunk_size
+        start = 0
+        paragraph_breaks = _PARAGRAPH_BREAK.finditer(text)
+        while start < len(text):
+            match = next(paragraph_breaks, None)
+            p_start, p_end = self._strip(text, start, match.start() if match else len(text))
+            start = match.end() if match else len(text)
+            if p_start == p_end:
+                continue
+            size = self._measure(text, p_start, p_end)
+            if size <= limit:
+                yield p_start, p_end, size
+                continue
+            for s_start, s_end in self._sentences(text, p_start, p_end):
+                size = self._measure(text, s_start, s_end)
+                if size <= limit:
+                    yield s_start, s_end, size
+                    continue
+                for word in _WORD.finditer(text, s_start, s_end):
+                    w_start, w_end = word.span()
+                    size = self._measure(text, w_start, w_end)
+                    if size <= limit:
+                        yield w_start, w_end, size
+                    else:
+                        yield from self._hard_split(text, w_start, w_end)
 
-    def _split_into_paragraphs(self, text: str) -> List[str]:
+    def _overlap_start(self, text: str, start: int, end: int, next_start: int) -> int:
+        """
+        Where the chunk starting with the unit at next_start begins, repeating
+        the end of the previous chunk's content [start, end) as overlap. The
+        overlap never covers the whole content, so chunk starts increase.
         """
-        Split text into paragraphs.
+        if self.chunk_overlap <= 0:
+            return next_start
+        if self.count_tokens is None:
+            # The whitespace before next_start counts towards the overlap
+            low = max(start + 1, next_start - self.chunk_overlap)
+            # Begin at a word; with no word start in reach, skip the overlap
+            # rather than repeat a fragment from mid-word
+            match = _WORD_START.search(text, low, end)
+            return match.start() if match else next_start
+
+        low = max(start + 1, end - _MAX_CHARS_PER_TOKEN * self.chunk_overlap)
+        word_starts = [m.start() for m in _WORD_START.finditer(text, low, end)]
+        if not word_starts and not any(c.isspace() for c in text[low:end]):
+            # Unspaced text (e.g. CJK): a character is at most about one token
+            overlap_start = max(start + 1, end - self.chunk_overlap)
+            return overlap_start if overlap_start < end else next_start
+        overlap_start, used = next_start, 0
+        for word_start in reversed(word_starts):
+            used += self.count_tokens(text[word_start:overlap_start])
+            if used > self.chunk_overlap:
+                break
+            overlap_start = word_start
+        return overlap_start
+
+    def chunk_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Split text into chunks, returned as offsets into the text.
+
+        Paragraphs, then sentences, then words are packed greedily up to
+        chunk_size; each chunk after the first also starts up to
+        chunk_overlap earlier, at a word start, so it repeats the end of the
+        previous one (or has no overlap if no word starts in reach). Chunks are contiguous slices of the text, so the offsets can be
+        used to highlight a cited passage. Runs in time linear in the text.
 
         Args:
-            text: Text to split
+            text: Text to chunk
 
         Returns:
-            List of paragraphs
+            List of (start, end) character offsets
         """
-        # Split on double newlines or multiple newlines
-        paragraphs = text.split('\n\n')
-        result = []
-        for p in paragraphs:
-            p = p.strip()
-            if p:
-                result.append(p)
-        return result
+        chunks = []
+        chunk_start = chunk_end = None
+        content_start = size = 0
+        by_chars = self.count_tokens is None
+
+        for unit_start, unit_end, unit_size in self._units(text):
+            if chunk_end is not None:
+                # Units are separated by whitespace only, which costs no tokens
+                grown = size + unit_size + (unit_start - chunk_end if by_chars else 0)
+                if grown <= self.chunk_size:
+                    chunk_end, size = unit_end, grown
+                    continue
+                chunks.append((chunk_start, chunk_end))
+                chunk_start = self._overlap_start(text, content_start, chunk_end, unit_start)
+            else:
+                chunk_start = unit_start
+            content_start, chunk_end, size = unit_start, unit_end, unit_size
+
+        if chunk_end is not None:
+            chunks.append((chunk_start, chunk_end))
+        return chunks
 
     def chunk_text(self, text: str) -> List[str]:
         """
-        Split text into chunks of approximately chunk_size characters.
+        Split text into chunks of approximately chunk_size.
 
         Args:
             text: Text to chunk
@@ -68,64 +191,16 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        if len(text) <= self.chunk_size:
-            return [text]
-
-        chunks = []
-        paragraphs = self._split_into_paragraphs(text)
-
-        current_chunk = ""
-
-        for paragraph in paragraphs:
-            # If paragraph itself is too long, split by sentences
-            if len(paragraph) > self.chunk_size:
-                sentences = self._split_into_sentences(paragraph)
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) + 1 <= self.chunk_size:
-                        current_chunk += (" " if current_chunk else "") + sentence
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk)
-                        # If single sentence is too long, split by characters
-                        if len(sentence) > self.chunk_size:
-                            # Split long sentence into smaller pieces
-                            for i in range(0, len(sentence), self.chunk_size - self.chunk_overlap):
-                                chunk = sentence[i:i + self.chunk_size]
-                                chunks.append(chunk)
-                            current_chunk = ""
-                        else:
-                            current_chunk = sentence
-            else:
-                # Add paragraph to current chunk if it fits
-                if len(current_chunk) + len(paragraph) + 2 <= self.chunk_size:
-                    current_chunk += ("\n\n" if current_chunk else "") + paragraph
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk)
-                    current_chunk = paragraph
-
-        # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(current_chunk)
-
-        # Add overlap between chunks
-        if self.chunk_overlap > 0 and len(chunks) > 1:
-            overlapped_chunks = []
-            for i, chunk in enumerate(chunks):
-                if i > 0:
-                    # Add overlap from previous chunk
-                    prev_chunk = chunks[i - 1]
-                    overlap_text = prev_chunk[-self.chunk_overlap:] if len(prev_chunk) > self.chunk_overlap else prev_chunk
-                    chunk = overlap_text + " " + chunk
-                overlapped_chunks.append(chunk)
-            chunks = overlapped_chunks
-
-        return chunks
+        return [text[start:end] for start, end in self.chunk_spans(text)]
 
     def chunk_documents(self, documents: List[Dict]) -> List[Dict]:
         """
         Split documents into chunks while preserving metadata.
 
+        Each chunk's metadata records its position ("chunk_index",
+        "total_chunks") and its character range in the page text
+        ("start_offset", "end_offset").
+
         Args:
             documents: List of documents with content and metadata
 
@@ -141,18 +216,39 @@ class TextChunker:
             if not content:
                 continue
 
-            chunks = self.chunk_text(content)
+            spans = self.chunk_spans(content)
 
-            for i, chunk in enumerate(chunks):
+            for i, (start, end) in enumerate(spans):
                 chunked_doc = {
-                    "content": chunk,
+                    "content": content[start:end],
                     "metadata": {
                         **metadata,
                         "chunk_index": i,
-                        "total_chunks": len(chunks)
+                        "total_chunks": len(spans),
+                        "start_offset": start,
+                        "end_offset": end
                     }
                 }
                 chunked_documents.append(chunked_doc)
 
         logger.info(f"Created {len(chunked_documents)} chunks from {len(documents)} documents")
         return chunked_documents
+
+
+def create_chunker(chunk_size: int, chunk_overlap: int, unit: str = "chars") -> TextChunker:
+    """
+    Create a text chunker sized in the given unit.
+
+    Args:
+        chunk_size: Maximum size of each chunk
+        chunk_overlap: Overlap between chunks
+        unit: "chars" for characters or "tokens" for estimated LLM tokens
+
+    Returns:
+        TextChunker instance
+    """
+    if unit == "chars":
+        return TextChunker(chunk_size, chunk_overlap)
+    if unit == "tokens":
+        return TextChunker(chunk_size, chunk_overlap, estimate_tokens)
+    raise ValueError(f"Unknown chunk size unit: {unit}")
@@ -3,12 +3,83 @@ Vector Store using ChromaDB
 Manages document storage and retrieval with persistent storage.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import List, Dict, Iterator, Optional, Set
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of records per ChromaDB write/delete call
+WRITE_BATCH_SIZE = 500
+
+# Seconds a cached collection count is trusted; writes by other processes
+# (e.g. remove_document in another worker) become visible after this long
+COUNT_CACHE_SECONDS = 5.0
+
+
+def select_records(batch: Dict, ids: Set[str]) -> Dict:
+    """
+    Keep the records of an iter_records batch whose ID is in a set.
+
+    Args:
+        batch: Dictionary of parallel "ids", "embeddings", "documents" and "metadatas" lists
+        ids: IDs to keep
+
+    Returns:
+        Batch of the same shape with only the kept records
+    """
+    keep = [i for i, doc_id in enumerate(batch["ids"]) if doc_id in ids]
+    return {key: [values[i] for i in keep] for key, values in batch.items()}
+
+
+def make_chunk_id(document: Dict, content_hash: Optional[str] = None) -> str:
+    """
+    Build a deterministic ID for a chunk from its source, page, chunk index and content.
+
+    Re-adding the same chunk always yields the same ID, so writes are idempotent.
+
+    Args:
+        document: Chunk with content and metadata
+        content_hash: Precomputed SHA-256 of the content (optional)
+
+    Returns:
+        Chunk ID of the form "source:page:chunk_index:hash16"
+    """
+    metadata = document.get("metadata", {})
+    if content_hash is None:
+        content_hash = hashlib.sha256(document["content"].encode("utf-8")).hexdigest()
+    return (
+        f"{metadata.get('source', 'unknown')}:{metadata.get('page', 0)}:"
+        f"{metadata.get('chunk_index', 0)}:{content_hash[:16]}"
+    )
+
+
+def create_vector_store(
+    backend: str = "chroma",
+    persist_directory: str = "vector_db/chroma_db",
+    collection_name: str = "product_knowledge"
+):
+    """
+    Create a vector store for the configured backend.
+
+    Args:
+        backend: "chroma" (ChromaDB) or "numpy" (in-process memmapped index)
+        persist_directory: Directory for persistent storage
+        collection_name: Name of the collection
+
+    Returns:
+        VectorStore or NumpyVectorStore
+    """
+    if backend == "chroma":
+        return VectorStore(persist_directory, collection_name)
+    if backend == "numpy":
+        from .numpy_vector_store import NumpyVectorStore
+        return NumpyVectorStore(persist_directory, collection_name)
+    raise ValueError(f"Unknown vector store backend: {backend}")
+
 
 class VectorStore:
     """ChromaDB vector store for document storage and retrieval."""
@@ -29,10 +100,20 @@ class VectorStore:
         self.collection_name = collection_name
         self._client = None
         self._collection = None
+        self._init_lock = threading.Lock()
+        # Cached collection size; None means unknown. Writes through this
+        # instance reset it and it expires after COUNT_CACHE_SECONDS, so the
+        # query path rarely needs a count() round trip
+        self._count = None
+        self._count_expires = 0.0
 
     def _init_client(self):
-        """Initialize ChromaDB client and collection."""
-        if self._client is None:
+        """Initialize ChromaDB client and collection (thread-safe)."""
+        if self._client is not None:
+            return
+        with self._init_lock:
+            if self._client is not None:
+                return
             try:
                 import chromadb
                 from chromadb.config import Settings
@@ -41,19 +122,22 @@ class VectorStore:
                 self.persist_directory.mkdir(parents=True, exist_ok=True)
 
                 # Initialize persistent client
-                self._client = chromadb.PersistentClient(
+                client = chromadb.PersistentClient(
                     path=str(self.persist_directory),
                     settings=Settings(anonymized_telemetry=False)
                 )
 
                 # Get or create collection
-                self._collection = self._client.get_or_create_collection(
+                self._collection = client.get_or_create_collection(
                     name=self.collection_name,
                     metadata={"hnsw:space": "cosine"}
                 )
+                # Published last: other threads treat a set client as fully initialized
+                self._client = client
 
                 logger.info(f"ChromaDB initialized at {self.persist_directory}")
-                logger.info(f"Collection '{self.collection_name}' has {self._collection.count()} documents")
+                self._count = self._collection.count()
+                logger.info(f"Collection '{self.collection_name}' has {self._count} documents")
 
             except ImportError:
                 logger.error("chromadb not installed. Run: pip install chromadb")
@@ -71,10 +155,13 @@ class VectorStore:
         """
         Add documents with embeddings to the vector store.
 
+        Writes are upserts: documents whose ID already exists are replaced
+        rather than duplicated.
+
         Args:
             documents: List of documents with content and metadata
             embeddings: List of embedding vectors
-            ids: Optional list of document IDs
+            ids: Optional list of document IDs (defaults to make_chunk_id)
 
         Returns:
             Number of documents added
@@ -87,14 +174,13 @@ class VectorStore:
         if len(documents) != len(embeddings):
             raise ValueError("Number of documents must match number of embeddings")
 
-        # Generate IDs if not provided
+        # Generate content-derived IDs if not provided
         if ids is None:
-            existing_count = self._collection.count()
-            ids = [f"doc_{existing_count + i}" for i in range(len(documents))]
+            ids = [make_chunk_id(doc) for doc in documents]
 
         # Prepare data for ChromaDB
         contents = [doc["content"] for doc in documents]
-        metadatas = [doc.get("metadata", {}) for doc in documents]
+        metadatas = [dict(doc.get("metadata", {})) for doc in documents]
 
         # Convert metadata values to strings (ChromaDB requirement)
         for metadata in metadatas:
@@ -103,23 +189,28 @@ class VectorStore:
                     metadata[key] = str(value)
 
         try:
-            self._collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=contents,
-                metadatas=metadatas
-            )
-            logger.info(f"Added {len(documents)} documents to vector store")
+            for start in range(0, len(ids), WRITE_BATCH_SIZE):
+                end = start + WRITE_BATCH_SIZE
+                self._collection.upsert(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    documents=contents[start:end],
+                    metadatas=metadatas[start:end]
+                )
+            logger.info(f"Upserted {len(documents)} documents to vector store")
             return len(documents)
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
             raise
+        finally:
+            self._count = None
 
     def query(
         self,
         query_embedding: List[float],
         top_k: int = 5,
-        where: Optional[Dict] = None
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False
     ) -> List[Dict]:
         """
         Query the vector store for similar documents.
@@ -128,51 +219,252 @@ class VectorStore:
             query_embedding: Query embedding vector
             top_k: Number of results to return
             where: Optional filter conditions
+            include_embeddings: Also return each match's stored "embedding"
 
         Returns:
             List of matching documents with scores
         """
-        self._init_client()
+        return self.query_many([query_embedding], top_k, where, include_embeddings)[0]
+
+    def query_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict]]:
+        """
+        Query the vector store for several embeddings in one call.
+
+        Args:
+            query_embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            where: Optional filter conditions
+            include_embeddings: Also return each match's stored "embedding"
+
+        Returns:
+            List of matching documents with scores for each query, in order
+        """
+        empty = [[] for _ in query_embeddings]
+        if not query_embeddings:
+            return empty
 
-        if self._collection.count() == 0:
+        count = self.count()
+        if count == 0:
             logger.warning("Vector store is empty")
-            return []
+            return empty
 
         try:
             results = self._collection.query(
-                query_embeddings=[query_embedding],
-                n_results=min(top_k, self._collection.count()),
+                query_embeddings=query_embeddings,
+                n_results=min(top_k, count),
                 where=where,
-                include=["documents", "metadatas", "distances"]
+                include=["documents", "metadatas", "distances"] + (["embeddings"] if include_embeddings else [])
             )
 
             # Format results
-            documents = []
-            if results and results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
+            batches = []
+            for q, ids in enumerate(results["ids"] if results and results["ids"] else []):
+                documents = []
+                for i, doc_id in enumerate(ids):
                     # Convert distance to similarity score (cosine distance to similarity)
-                    distance = results["distances"][0][i] if results["distances"] else 0
+                    distance = results["distances"][q][i] if results["distances"] else 0
                     score = 1 - distance  # Convert distance to similarity
 
-                    documents.append({
+                    document = {
                         "id": doc_id,
-                        "content": results["documents"][0][i] if results["documents"] else "",
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                        "content": results["documents"][q][i] if results["documents"] else "",
+                        "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
                         "score": score
-                    })
+                    }
+                    if include_embeddings:
+                        document["embedding"] = list(results["embeddings"][q][i])
+                    documents.append(document)
+                batches.append(documents)
 
-            return documents
+            return batches + empty[len(batches):]
 
         except Exception as e:
             logger.error(f"Error querying vector store: {e}")
+            return empty
+
+    def delete_documents(self, ids: List[str], batch_size: int = WRITE_BATCH_SIZE) -> int:
+        """
+        Delete documents by ID.
+
+        Args:
+            ids: Document IDs to delete
+            batch_size: Number of IDs per delete call
+
+        Returns:
+            Number of IDs submitted for deletion
+        """
+        self._init_client()
+        if not ids:
+            return 0
+
+        try:
+            for start in range(0, len(ids), batch_size):
+                self._collection.delete(ids=ids[start:start + batch_size])
+        finally:
+            self._count = None
+        logger.info(f"Deleted {len(ids)} documents from vector store")
+        return len(ids)
+
+    def delete_by_source(self, sources: List[str], batch_size: int = 50) -> None:
+        """
+        Delete every chunk of the given source documents.
+
+        Args:
+            sources: Source file names (the chunks' "source" metadata)
+            batch_size: Number of sources per delete call
+        """
+        self._init_client()
+        if not sources:
+            return
+
+        try:
+            for start in range(0, len(sources), batch_size):
+                batch = sources[start:start + batch_size]
+                where = {"source": batch[0]} if len(batch) == 1 else {"source": {"$in": batch}}
+                self._collection.delete(where=where)
+        finally:
+            self._count = None
+        logger.info(f"Deleted chunks of {len(sources)} source documents from vector store")
+
+    def get_embeddings(self, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Fetch stored embeddings by document ID.
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            Mapping of ID to embedding for the IDs that exist
+        """
+        self._init_client()
+        if not ids:
+            return {}
+
+        results = self._collection.get(ids=ids, include=["embeddings"])
+        embeddings = results.get("embeddings")
+        if embeddings is None:
+            return {}
+        return {
+            doc_id: (embedding.tolist() if hasattr(embedding, "tolist") else list(embedding))
+            for doc_id, embedding in zip(results["ids"], embeddings)
+        }
+
+    def get_documents(self, ids: List[str]) -> List[Dict]:
+        """
+        Fetch stored documents by ID.
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            Documents with id, content, metadata and embedding, for the IDs that exist
+        """
+        self._init_client()
+        if not ids:
             return []
 
+        results = self._collection.get(ids=ids, include=["documents", "metadatas", "embeddings"])
+        embeddings = results.get("embeddings")
+        return [
+            {
+                "id": doc_id,
+                "content": results["documents"][i] if results["documents"] else "",
+                "metadata": results["metadatas"][i] if results["metadatas"] else {},
+                "embedding": list(embeddings[i]) if embeddings is not None else None
+            }
+            for i, doc_id in enumerate(results["ids"])
+        ]
+
+    def iter_records(self, batch_size: int = WRITE_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Iterate over all records in batches.
+
+        Args:
+            batch_size: Records per read call
+
+        Yields:
+            Dictionaries with ids, embeddings, documents and metadatas
+        """
+        self._init_client()
+
+        offset = 0
+        while True:
+            results = self._collection.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=batch_size,
+                offset=offset
+            )
+            if not results["ids"]:
+                return
+            offset += len(results["ids"])
+            yield {
+                "ids": results["ids"],
+                "embeddings": results["embeddings"],
+                "documents": results["documents"],
+                "metadatas": results["metadatas"]
+            }
+
+    def copy_from(
+        self,
+        source,
+        batch_size: int = WRITE_BATCH_SIZE,
+        stop_event=None,
+        progress_callback=None,
+        only_ids: Optional[Set[str]] = None
+    ) -> int:
+        """
+        Copy every record of another collection, embeddings included.
+
+        Args:
+            source: Vector store to copy from (any backend with iter_records)
+            batch_size: Records per read/write call
+            stop_event: threading.Event; copying stops early once it is set
+            progress_callback: Called with the number of records copied so far
+            only_ids: Copy only records with these IDs (default: all)
+
+        Returns:
+            Number of records copied
+        """
+        self._init_client()
+
+        copied = 0
+        for batch in source.iter_records(batch_size):
+            if stop_event is not None and stop_event.is_set():
+                break
+            if only_ids is not None:
+                batch = select_records(batch, only_ids)
+                if not batch["ids"]:
+                    continue
+            self._collection.upsert(
+                ids=batch["ids"],
+                embeddings=batch["embeddings"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"]
+            )
+            self._count = None
+            copied += len(batch["ids"])
+            if progress_callback is not None:
+                progress_callback(copied)
+
+        logger.info(f"Copied {copied} documents from '{source.collection_name}' to '{self.collection_name}'")
+        return copied
+
+    def flush(self):
+        """Persist pending writes (ChromaDB writes through, so this is a no-op)."""
+
     def delete_collection(self):
         """Delete the entire collection."""
         self._init_client()
         try:
             self._client.delete_collection(self.collection_name)
             self._collection = None
+            self._count = None
             logger.info(f"Deleted collection '{self.collection_name}'")
         except Exception as e:
             logger.error(f"Error deleting collection: {e}")
@@ -188,21 +480,47 @@ class VectorStore:
                 name=self.collection_name,
                 metadata={"hnsw:space": "cosine"}
             )
+            self._count = 0
             logger.info(f"Cleared collection '{self.collection_name}'")
         except Exception as e:
             logger.error(f"Error clearing collection: {e}")
             raise
 
-    def get_stats(self) -> Dict:
+    def count(self, refresh: bool = False) -> int:
+        """
+        Number of documents in the collection.
+
+        The value is cached until the next write through this instance or for
+        at most COUNT_CACHE_SECONDS, so writes by other processes become
+        visible. An empty result is always re-checked.
+
+        Args:
+            refresh: Ask ChromaDB instead of using the cached value
+
+        Returns:
+            Document count
+        """
+        self._init_client()
+        count = self._count
+        now = time.monotonic()
+        if refresh or not count or now >= self._count_expires:
+            count = self._collection.count()
+            self._count = count
+            self._count_expires = now + COUNT_CACHE_SECONDS
+        return count
+
+    def get_stats(self, refresh: bool = False) -> Dict:
         """
         Get statistics about the vector store.
 
+        Args:
+            refresh: Re-read the document count instead of using the cache
+
         Returns:
             Dictionary with collection statistics
         """
-        self._init_client()
         return {
             "collection_name": self.collection_name,
-            "document_count": self._collection.count(),
+            "document_count": self.count(refresh),
             "persist_directory": str(self.persist_directory)
         }
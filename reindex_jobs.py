@@ -0,0 +1,201 @@
+"""
+后台重建索引任务 | Background Reindex Jobs
+在后台线程中重建向量索引，请求立即返回任务ID，之后可查询进度或取消
+Rebuilds the vector index on a background thread; the request returns a job ID
+immediately and progress can then be polled or the job cancelled
+
+- 重建期间查询继续使用旧索引，完成后原子切换 | Queries use the old index until the atomic swap at the end
+- 任务状态保存在 ExecutionStateStore 中，sqlite 后端时任意 worker 都能查询和取消
+  Job state lives in an ExecutionStateStore, so with the sqlite backend any worker can read or cancel a job
+- 同一时间只运行一个任务 | Only one job runs at a time
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from execution_store import ExecutionStateStore
+from logger_config import logger
+from rag.ingest_pipeline import IngestCancelled
+
+# 未结束的任务状态 | Statuses of unfinished jobs
+ACTIVE_STATUSES = ("queued", "running")
+
+# 进度写入存储的最小间隔（秒）| Minimum interval between progress writes to the store (seconds)
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# 取消标记单独存放的键后缀，避免与进度写入互相覆盖 | Key suffix of the cancel flag, stored apart so progress writes cannot overwrite it
+CANCEL_KEY_SUFFIX = ":cancel"
+
+
+class ReindexInProgressError(Exception):
+    """已有重建任务在运行 | A reindex job is already running"""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Reindex job {job_id} is already running")
+        self.job_id = job_id
+
+
+class ReindexJobManager:
+    """
+    后台重建索引任务管理器 | Background reindex job manager
+
+    任务状态 | Job state:
+    - status: queued / running / completed / error / cancelled
+    - phase: copying / indexing / swapping / done
+    - progress: 文件、页、分块、嵌入速度等计数 | Counters for files, pages, chunks and embeddings/sec
+    - result: 完成后的索引统计 | Indexing statistics once completed
+    """
+
+    def __init__(self, retriever, store: ExecutionStateStore, stale_seconds: float = 600,
+                 ttl_seconds: float = 3600, max_finished: int = 20):
+        """
+        Args:
+            retriever: RAGRetriever 实例 | RAGRetriever instance
+            store: 任务状态存储 | Job state store
+            stale_seconds: 运行中任务超过该时间未更新视为已失效 | Running jobs without updates for this long are dead
+            ttl_seconds: 已结束任务的保留时间 | How long finished jobs are kept
+            max_finished: 已结束任务的最大保留数量 | Maximum number of finished jobs kept
+        """
+        self.retriever = retriever
+        self.store = store
+        self.stale_seconds = stale_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._cancel_events: Dict[str, threading.Event] = {}  # 本进程运行的任务 | Jobs running in this process
+
+    def _update(self, job_id: str, **fields) -> Dict[str, Any]:
+        """合并字段到任务状态并写回 | Merge fields into the job state and write it back"""
+        state = self.store.get(job_id) or {'job_id': job_id}
+        state.update(fields)
+        self.store.set(job_id, state)
+        return state
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        """是否已请求取消（任意 worker）| Whether cancellation was requested (by any worker)"""
+        return self.store.get(job_id + CANCEL_KEY_SUFFIX) is not None
+
+    def _active_job_id(self) -> Optional[str]:
+        """查找未结束的任务，顺带标记失效的任务 | Find the unfinished job, marking dead ones as failed"""
+        now = time.time()
+        for job_id, status, updated_at in self.store.list_meta():
+            if status not in ACTIVE_STATUSES:
+                continue
+            if job_id in self._cancel_events or now - updated_at <= self.stale_seconds:
+                return job_id
+            # 运行该任务的 worker 已退出 | The worker running it has exited
+            logger.warning(f"[reindex {job_id}] No progress for {self.stale_seconds}s, marking as failed")
+            self._update(job_id, status='error', error='Reindex job stopped responding', finished_at=now)
+            self.store.delete(job_id + CANCEL_KEY_SUFFIX)
+        return None
+
+    def start(self, full: bool = False) -> Dict[str, Any]:
+        """
+        启动重建任务 | Start a reindex job
+
+        Args:
+            full: 全量重建（重新嵌入所有文档）| Full rebuild (re-embed every document)
+
+        Returns:
+            新任务的状态 | State of the new job
+
+        Raises:
+            ReindexInProgressError: 已有任务在运行 | A job is already running
+        """
+        with self._lock:
+            self.store.evict_finished(self.ttl_seconds, self.max_finished)
+            active_id = self._active_job_id()
+            if active_id is not None:
+                raise ReindexInProgressError(active_id)
+
+            job_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            cancel_event = threading.Event()
+            self._cancel_events[job_id] = cancel_event
+            state = {
+                'job_id': job_id,
+                'status': 'queued',
+                'full': full,
+                'phase': None,
+                'progress': {},
+                'result': None,
+                'error': None,
+                'cancel_requested': False,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self.store.set(job_id, state)
+
+        threading.Thread(
+            target=self._run, args=(job_id, full, cancel_event), name=f"reindex-{job_id}", daemon=True
+        ).start()
+        logger.info(f"[reindex {job_id}] Started (full={full})")
+        return state
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务状态 | Get a job's state"""
+        state = self.store.get(job_id)
+        if state is not None and state['status'] in ACTIVE_STATUSES and self._cancel_requested(job_id):
+            state['cancel_requested'] = True
+        return state
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        请求取消任务，已完成的部分会被丢弃，查询继续使用旧索引
+        Request cancellation; work done so far is discarded and queries keep using the old index
+
+        Returns:
+            任务状态，不存在时返回 None | Job state, or None if not found
+        """
+        state = self.store.get(job_id)
+        if state is None or state['status'] not in ACTIVE_STATUSES:
+            return state
+
+        with self._lock:
+            cancel_event = self._cancel_events.get(job_id)
+        if cancel_event is not None:
+            cancel_event.set()
+        # 运行在其他 worker 时，该 worker 在下次写进度时读取此标记 | A job in another worker picks this up on its next progress write
+        self.store.set(job_id + CANCEL_KEY_SUFFIX, {'job_id': job_id, 'status': 'cancel_requested'})
+        logger.info(f"[reindex {job_id}] Cancellation requested")
+        state['cancel_requested'] = True
+        return state
+
+    def _run(self, job_id: str, full: bool, cancel_event: threading.Event):
+        self._update(job_id, status='running', started_at=time.time())
+        last = {'phase': None, 'written_at': 0.0, 'progress': {}}
+
+        def on_progress(snapshot: Dict[str, Any]):
+            phase = snapshot.pop('phase')
+            if snapshot:
+                last['progress'] = snapshot
+            now = time.time()
+            if phase == last['phase'] and now - last['written_at'] < PROGRESS_WRITE_INTERVAL:
+                return
+            last['phase'], last['written_at'] = phase, now
+            self._update(job_id, phase=phase, progress=last['progress'])
+            if self._cancel_requested(job_id):
+                cancel_event.set()
+
+        try:
+            result = self.retriever.rebuild_index(
+                full=full, progress_callback=on_progress, cancel_event=cancel_event
+            )
+            self._update(job_id, status='completed', phase='done', progress=last['progress'],
+                         result=result, finished_at=time.time())
+            logger.info(f"[reindex {job_id}] Completed: {result}")
+        except IngestCancelled:
+            self._update(job_id, status='cancelled', progress=last['progress'], finished_at=time.time())
+            logger.info(f"[reindex {job_id}] Cancelled, old index kept")
+        except Exception as e:
+            logger.error(f"[reindex {job_id}] Failed: {e}", exc_info=True)
+            self._update(job_id, status='error', progress=last['progress'], error=str(e),
+                         finished_at=time.time())
+        finally:
+            if self._cancel_requested(job_id):
+                self._update(job_id, cancel_requested=True)
+                self.store.delete(job_id + CANCEL_KEY_SUFFIX)
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
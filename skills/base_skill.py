@@ -7,7 +7,7 @@ Each skill focuses on a single dimension of product research.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -54,12 +54,14 @@ class BaseSkill(ABC):
         """
         pass
 
-    async def analyze(self, user_input: str) -> Dict[str, Any]:
+    async def analyze(self, user_input: str,
+                      on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         执行分析并返回结果 | Execute analysis and return result
 
         Args:
             user_input: 用户输入的产品需求 | User's product requirement input
+            on_token: 可选的流式回调 | Optional streaming callback for response deltas
 
         Returns:
             Dict[str, Any]: 包含分析结果的字典 | Dictionary containing analysis result
@@ -68,7 +70,7 @@ class BaseSkill(ABC):
 
         try:
             prompt = self.get_prompt(user_input)
-            response = await self.llm.ainvoke(prompt)
+            response = await self.llm.ainvoke(prompt, on_token=on_token)
 
             logger.info(f"Skill {self.name} completed successfully")
             return {self.get_output_key(): response}
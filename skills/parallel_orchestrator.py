@@ -7,7 +7,7 @@ Uses asyncio.gather for concurrent API calls.
 
 import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List, Optional
 
 from .core_requirements_skill import CoreRequirementsSkill
 from .target_users_skill import TargetUsersSkill
@@ -57,12 +57,14 @@ class ParallelSkillOrchestrator:
         # 将字面字符串 \n 替换为实际换行符
         return text.replace('\\n', '\n')
 
-    async def research(self, user_input: str) -> Dict[str, Any]:
+    async def research(self, user_input: str,
+                       on_token: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
         """
         并行执行所有 Skill | Execute all Skills in parallel
 
         Args:
             user_input: 用户输入的产品需求 | User's product requirement input
+            on_token: 可选的流式回调 (output_key, delta) | Optional streaming callback (output_key, delta)
 
         Returns:
             Dict[str, Any]: 包含所有维度分析结果的字典
@@ -71,7 +73,10 @@ class ParallelSkillOrchestrator:
         logger.info(f"Starting parallel research with {len(self.skills)} skills")
 
         # 创建所有 skill 的异步任务
-        tasks = [skill.analyze(user_input) for skill in self.skills]
+        tasks = [
+            skill.analyze(user_input, self._skill_token_callback(skill, on_token))
+            for skill in self.skills
+        ]
 
         # 并行执行所有任务，允许部分失败
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -92,20 +97,32 @@ class ParallelSkillOrchestrator:
 
         return final_result
 
-    async def research_with_timeout(self, user_input: str, timeout: float = 120.0) -> Dict[str, Any]:
+    @staticmethod
+    def _skill_token_callback(skill, on_token: Optional[Callable[[str, str], None]]):
+        """
+        为单个 Skill 绑定输出字段名 | Bind a skill's output key to the streaming callback
+        """
+        if on_token is None:
+            return None
+        output_key = skill.get_output_key()
+        return lambda delta: on_token(output_key, delta)
+
+    async def research_with_timeout(self, user_input: str, timeout: float = 120.0,
+                                    on_token: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
         """
         带超时的并行执行 | Parallel execution with timeout
 
         Args:
             user_input: 用户输入的产品需求 | User's product requirement input
             timeout: 超时时间（秒）| Timeout in seconds
+            on_token: 可选的流式回调 (output_key, delta) | Optional streaming callback (output_key, delta)
 
         Returns:
             Dict[str, Any]: 包含所有维度分析结果的字典
                            Dictionary containing analysis results from all dimensions
         """
         try:
-            return await asyncio.wait_for(self.research(user_input), timeout=timeout)
+            return await asyncio.wait_for(self.research(user_input, on_token), timeout=timeout)
         except asyncio.TimeoutError:
             logger.error(f"Parallel research timed out after {timeout} seconds")
             return {
@@ -6,6 +6,19 @@ let eventSource = null;
 // 打字机效果状态管理
 const typewriterState = {};
 
+// LLM token 流缓冲区（按通道）
+let tokenBuffers = {};
+
+// SSE 累积的执行状态（服务端只推送增量）
+let streamState = { status: null, current_step: null, steps: [] };
+
+// token 通道到结果区域的映射
+const TOKEN_CHANNEL_TARGETS = {
+    'research': 'researchResult',
+    'evaluation': 'evaluationResult',
+    'documentation': 'documentationResult'
+};
+
 // 进度映射
 const AGENT_PROGRESS = {
     'initializing': { percent: 5, text: 'Initializing workflow...' },
@@ -76,6 +89,9 @@ async function startOrchestration() {
         if (response.ok) {
             currentExecutionId = data.execution_id;
             addLog('info', 'Orchestration started, Execution ID: ' + currentExecutionId);
+            if (data.queue_position > 1) {
+                addLog('info', `Waiting in queue, position ${data.queue_position}`);
+            }
 
             // Start SSE connection for streaming updates
             startSSEConnection();
@@ -96,6 +112,8 @@ function startSSEConnection() {
         eventSource.close();
     }
 
+    tokenBuffers = {};
+    streamState = { status: null, current_step: null, steps: [] };
     eventSource = new EventSource(`/api/stream/${currentExecutionId}`);
 
     eventSource.onmessage = function(event) {
@@ -116,8 +134,18 @@ function startSSEConnection() {
             return;
         }
 
-        // 更新执行状态
-        updateExecutionState(data);
+        // 处理 LLM token 增量
+        if (data.token_deltas) {
+            appendTokenDeltas(data.token_deltas);
+        }
+
+        // 合并状态增量并更新执行状态
+        if (data.status !== undefined || data.current_step !== undefined || data.new_steps) {
+            if (data.status !== undefined) streamState.status = data.status;
+            if (data.current_step !== undefined) streamState.current_step = data.current_step;
+            if (data.new_steps) streamState.steps = streamState.steps.concat(data.new_steps);
+            updateExecutionState(streamState);
+        }
 
         // 处理流式中间结果（打字机效果）
         if (data.partial_research) {
@@ -128,6 +156,7 @@ function startSSEConnection() {
             const evalResult = data.partial_evaluation;
             if (typeof evalResult === 'object' && evalResult.citations && evalResult.citations.length > 0) {
                 // 有 citations，使用专门的处理方式
+                stopTypewriter('evaluationResult');
                 const evalEl = document.getElementById('evaluationResult');
                 const citations = evalResult.citations;
                 const evalWithoutCitations = { ...evalResult };
@@ -879,10 +908,56 @@ function streamTypewriter(elementId, content) {
     typeNextChunk(elementId, element, state);
 }
 
+// 停止打字机动画（由最终渲染接管）
+function stopTypewriter(elementId) {
+    const state = typewriterState[elementId];
+    if (state && state.isTyping) {
+        state.cancelled = true;
+    }
+}
+
+// 追加 LLM token 增量并实时显示
+function appendTokenDeltas(deltas) {
+    const touched = new Set();
+    Object.keys(deltas).forEach(channel => {
+        tokenBuffers[channel] = (tokenBuffers[channel] || '') + deltas[channel];
+        touched.add(channel.split('.')[0]);
+    });
+
+    touched.forEach(group => {
+        const elementId = TOKEN_CHANNEL_TARGETS[group];
+        if (!elementId) return;
+
+        let text;
+        if (group === 'research') {
+            // 四个 Skill 并行输出，按维度分节显示
+            text = Object.keys(tokenBuffers)
+                .filter(channel => channel.startsWith('research.'))
+                .map(channel => {
+                    const title = channel.substring('research.'.length)
+                        .split('_')
+                        .map(word => word.charAt(0).toUpperCase() + word.slice(1))
+                        .join(' ');
+                    return `## ${title}\n\n${tokenBuffers[channel]}`;
+                })
+                .join('\n\n');
+        } else {
+            text = tokenBuffers[group] || '';
+        }
+        streamTypewriter(elementId, text);
+    });
+}
+
 function typeNextChunk(elementId, element, state) {
     const chunkSize = 10; // 每次显示10个字符
     const delay = 20;     // 20ms间隔
 
+    if (state.cancelled) {
+        state.isTyping = false;
+        state.cancelled = false;
+        return;
+    }
+
     if (state.displayedLength < state.fullContent.length) {
         // 计算下一个chunk
         const nextLength = Math.min(
@@ -1097,12 +1172,22 @@ async function reindexDocuments() {
 
         const data = await response.json();
 
-        if (data.status === 'success') {
-            alert(`Indexing completed!\n\nDocuments: ${data.documents_processed}\nChunks created: ${data.chunks_created}`);
-        } else if (data.status === 'warning') {
-            alert(data.message || 'No documents to index');
+        // 409: a reindex is already running, follow that job instead
+        if (!response.ok && response.status !== 409) {
+            throw new Error(data.error || 'Unknown error');
+        }
+
+        const job = await pollReindexJob(data.job_id, statusEl);
+        const result = job.result || {};
+
+        if (job.status === 'completed' && result.status === 'warning') {
+            alert(result.message || 'No documents to index');
+        } else if (job.status === 'completed') {
+            alert(`Indexing completed!\n\nDocuments: ${result.documents_processed}\nChunks created: ${result.chunks_created}`);
+        } else if (job.status === 'cancelled') {
+            alert('Indexing cancelled, the previous index is still in use');
         } else {
-            alert('Indexing failed: ' + (data.message || 'Unknown error'));
+            alert('Indexing failed: ' + (job.error || 'Unknown error'));
         }
 
         loadRAGStatus();
@@ -1119,6 +1204,28 @@ async function reindexDocuments() {
     }
 }
 
+// Poll a background reindex job until it finishes, showing its progress
+async function pollReindexJob(jobId, statusEl) {
+    while (true) {
+        const response = await fetch(`/api/documents/reindex/${encodeURIComponent(jobId)}`);
+        const job = await response.json();
+        if (!response.ok) {
+            throw new Error(job.error || 'Unknown error');
+        }
+        if (!['queued', 'running'].includes(job.status)) {
+            return job;
+        }
+
+        const progress = job.progress || {};
+        if (job.phase === 'indexing') {
+            statusEl.textContent = `Indexing... ${progress.files_done || 0}/${progress.files_total || 0} files, ${progress.chunks || 0} chunks`;
+        } else if (job.phase === 'copying') {
+            statusEl.textContent = `Preparing... ${progress.chunks_copied || 0} chunks`;
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 // Format citations for display
 function formatCitations(citations) {
     if (!citations || citations.length === 0) return '';
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+执行事件通道测试 | Execution Event Channel Tests
+验证中途订阅不丢失也不重复增量，以及 drain 的合并 | Checks that mid-execution subscribers neither miss nor duplicate deltas, and drain's coalescing
+
+运行 | Run: python -m pytest test_execution_events.py  或 | or  python test_execution_events.py
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from execution_events import ExecutionChannel, drain, merge_delta
+
+DELTA_COUNT = 2000
+
+
+def make_delta(i: int):
+    """第 i 个增量：一个步骤、两个通道的 token 和一个覆盖键 | Delta i: one step, tokens on two channels and an overwritten key"""
+    delta = {'status': 'running', 'current_step': f'step-{i}', 'token_deltas': {'research': f'{i},'}}
+    if i % 3 == 0:
+        delta['new_steps'] = [{'step': i}]
+    if i % 5 == 0:
+        delta['token_deltas']['evaluation'] = f'e{i};'
+    return delta
+
+
+def expected_state():
+    state = {}
+    for i in range(DELTA_COUNT):
+        merge_delta(state, make_delta(i))
+    state['status'] = 'completed'
+    return state
+
+
+def read_until_closed(subscriber):
+    """读取并合并到通道关闭 | Drain and merge until the channel closes"""
+    state, closed = {}, False
+    while not closed:
+        message, closed = drain(subscriber, timeout=5)
+        if message is None and not closed:
+            raise AssertionError("no message within 5s")
+        if message:
+            merge_delta(state, message)
+    return state
+
+
+def test_mid_execution_subscribers_see_every_delta_once():
+    channel = ExecutionChannel()
+    subscriber_count = 8
+    # 发布线程在每个检查点通知一个订阅者加入，但不暂停发布 | The publisher signals one subscriber per checkpoint without pausing
+    checkpoints = [threading.Event() for _ in range(subscriber_count)]
+    all_joined = threading.Event()
+    step = DELTA_COUNT // subscriber_count
+
+    def publish():
+        for i in range(DELTA_COUNT):
+            channel.publish(make_delta(i))
+            if i % step == 0 and i // step < subscriber_count:
+                checkpoints[i // step].set()
+        channel.publish({'status': 'completed'})
+        # 所有订阅者加入后才关闭 | Close only once every subscriber has joined
+        all_joined.wait(10)
+        channel.close()
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+
+    results, readers = [], []
+    for checkpoint in checkpoints:
+        checkpoint.wait(10)
+        snapshot, subscriber = channel.subscribe()
+        assert subscriber is not None
+
+        def read(snapshot=snapshot, subscriber=subscriber):
+            state = merge_delta({}, snapshot)
+            merge_delta(state, read_until_closed(subscriber))
+            results.append(state)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        readers.append(reader)
+    all_joined.set()
+
+    publisher.join(10)
+    for reader in readers:
+        reader.join(10)
+
+    expected = expected_state()
+    assert len(results) == subscriber_count
+    for state in results:
+        assert state['new_steps'] == expected['new_steps']
+        assert state['token_deltas'] == expected['token_deltas']
+        assert state == expected
+
+
+def test_drain_coalesces_queued_deltas():
+    channel = ExecutionChannel()
+    channel.publish({'status': 'running', 'new_steps': ['a'], 'token_deltas': {'x': 'he'}})
+    snapshot, subscriber = channel.subscribe()
+    assert snapshot == {'status': 'running', 'new_steps': ['a'], 'token_deltas': {'x': 'he'}}
+
+    channel.publish({'new_steps': ['b'], 'token_deltas': {'x': 'll'}})
+    channel.publish({'current_step': 'evaluation', 'token_deltas': {'x': 'o', 'y': '!'}})
+    channel.publish({'new_steps': ['c', 'd']})
+
+    message, closed = drain(subscriber, timeout=1)
+    assert not closed
+    assert message == {
+        'new_steps': ['b', 'c', 'd'],
+        'token_deltas': {'x': 'llo', 'y': '!'},
+        'current_step': 'evaluation'
+    }
+
+    # 队列为空时超时 | Times out when nothing is queued
+    assert drain(subscriber, timeout=0.01) == (None, False)
+
+    # 关闭前积压的增量随结束标记一起返回 | Deltas queued before close come back with the end marker
+    channel.publish({'status': 'completed'})
+    channel.close()
+    assert drain(subscriber, timeout=1) == ({'status': 'completed'}, True)
+
+    # 关闭后订阅只得到快照 | Subscribing after close only returns the snapshot
+    snapshot, late = channel.subscribe()
+    assert late is None
+    assert snapshot['new_steps'] == ['a', 'b', 'c', 'd']
+    assert snapshot['token_deltas'] == {'x': 'hello', 'y': '!'}
+    assert snapshot['status'] == 'completed'
+
+
+def test_snapshot_is_a_copy():
+    channel = ExecutionChannel()
+    channel.publish({'new_steps': ['a'], 'token_deltas': {'x': 'a'}})
+    snapshot, _ = channel.subscribe()
+    snapshot['new_steps'].append('mutated')
+    snapshot['token_deltas']['x'] += 'mutated'
+    channel.publish({'new_steps': ['b']})
+    again, _ = channel.subscribe()
+    assert again == {'new_steps': ['a', 'b'], 'token_deltas': {'x': 'a'}}
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"All {len(tests)} tests passed")
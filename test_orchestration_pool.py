@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+编排任务池测试 | Orchestration Pool Tests
+验证准入、队列已满（429）、排队位置与取消 | Checks admission, the saturated (429) path, queue positions and cancellation
+
+运行 | Run: python -m pytest test_orchestration_pool.py  或 | or  python test_orchestration_pool.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from orchestration_pool import OrchestrationPool, PoolSaturatedError
+
+
+def make_job(gate: threading.Event, started: list, name: str):
+    """返回一个等待 gate 的协程函数 | Return a coroutine function that waits for the gate"""
+    async def job():
+        started.append(name)
+        while not gate.is_set():
+            await asyncio.sleep(0.01)
+    return job
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_free_slots_admit_without_queue():
+    # max_queue_size=0 表示不允许等待，但空闲槽位仍可接收任务 | No waiting allowed, but free slots still take jobs
+    gate, started = threading.Event(), []
+    pool = OrchestrationPool(max_workers=2, max_queue_size=0)
+    try:
+        assert pool.submit("a", make_job(gate, started, "a")) == 0
+        assert pool.submit("b", make_job(gate, started, "b")) == 0
+        wait_for(lambda: sorted(started) == ["a", "b"])
+        try:
+            pool.submit("c", make_job(gate, started, "c"))
+        except PoolSaturatedError:
+            pass
+        else:
+            raise AssertionError("a job was queued beyond max_queue_size")
+        assert pool.get_stats()["queued"] == 0
+    finally:
+        gate.set()
+    wait_for(lambda: pool.get_stats()["running"] == 0)
+    assert pool.submit("d", make_job(gate, started, "d")) == 0
+
+
+def test_queue_positions_and_saturation():
+    gate, started = threading.Event(), []
+    pool = OrchestrationPool(max_workers=1, max_queue_size=2)
+    try:
+        assert pool.submit("a", make_job(gate, started, "a")) == 0
+        assert pool.submit("b", make_job(gate, started, "b")) == 1
+        assert pool.submit("c", make_job(gate, started, "c")) == 2
+        try:
+            pool.submit("d", make_job(gate, started, "d"))
+        except PoolSaturatedError:
+            pass
+        else:
+            raise AssertionError("the full queue accepted a job")
+
+        assert pool.position("a") is None  # 已在执行 | Already running
+        assert pool.position("b") == 1 and pool.position("c") == 2
+        assert pool.position("unknown") is None
+    finally:
+        gate.set()
+    wait_for(lambda: started == ["a", "b", "c"])
+    wait_for(lambda: pool.get_stats()["running"] == 0)
+
+
+def test_cancel_queued_job():
+    gate, started = threading.Event(), []
+    pool = OrchestrationPool(max_workers=1, max_queue_size=5)
+    try:
+        pool.submit("a", make_job(gate, started, "a"))
+        pool.submit("b", make_job(gate, started, "b"))
+        pool.submit("c", make_job(gate, started, "c"))
+        wait_for(lambda: started == ["a"])
+
+        assert not pool.cancel("a")  # 已开始的任务不能取消 | Started jobs cannot be cancelled
+        assert pool.cancel("b")
+        assert not pool.cancel("b")
+        assert pool.position("c") == 1
+    finally:
+        gate.set()
+    wait_for(lambda: pool.get_stats()["running"] == 0 and pool.get_stats()["queued"] == 0)
+    assert started == ["a", "c"]
+
+
+def test_failed_job_frees_its_slot():
+    gate, started = threading.Event(), []
+    pool = OrchestrationPool(max_workers=1, max_queue_size=1)
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    pool.submit("a", failing)
+    wait_for(lambda: pool.get_stats()["running"] == 0)
+    gate.set()
+    assert pool.submit("b", make_job(gate, started, "b")) == 0
+    wait_for(lambda: started == ["b"])
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"All {len(tests)} tests passed")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+文本分块测试 | Text Chunker Tests
+验证分块偏移、重叠与大小限制 | Checks chunk offsets, overlap and size limits
+
+运行 | Run: python -m pytest test_text_chunker.py  或 | or  python test_text_chunker.py
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.text_chunker import TextChunker, create_chunker
+from rag.tokenization import estimate_tokens
+
+WORDS = ["product", "user", "market", "analysis", "requirement", "AI", "homework", "app",
+         "competitor", "insight", "2024", "growth", "retention", "feature", "a", "the"]
+
+
+def make_text(seed: int, paragraphs: int = 6) -> str:
+    """生成含段落、句子和长词的文本 | Build text with paragraphs, sentences and over-long words"""
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(paragraphs):
+        sentences = []
+        for _ in range(rng.randint(1, 6)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(3, 25))]
+            if rng.random() < 0.2:
+                words.append("x" * rng.randint(30, 120))
+            sentences.append(" ".join(words) + rng.choice([".", "!", "?", "。"]))
+        blocks.append(" ".join(sentences))
+    blocks.append("中文段落没有空格用于测试无空格文本的分块行为" * 5)
+    return "\n\n".join(blocks)
+
+
+def check_spans(chunker: TextChunker, text: str, measure):
+    """检查分块的通用性质 | Check the invariants every chunking must hold"""
+    spans = chunker.chunk_spans(text)
+    chunks = chunker.chunk_text(text)
+
+    # 偏移与文本一一对应 | Offsets round-trip to the chunk text
+    assert chunks == [text[start:end] for start, end in spans]
+
+    # 起止位置单调递增 | Starts and ends are monotonic
+    for (prev_start, prev_end), (start, end) in zip(spans, spans[1:]):
+        assert prev_start < start and prev_end < end, (spans, text)
+
+    # 大小不超过 chunk_size + chunk_overlap | Size stays within chunk_size + chunk_overlap
+    limit = chunker.chunk_size + chunker.chunk_overlap
+    for chunk in chunks:
+        assert measure(chunk) <= limit, (measure(chunk), limit, chunk)
+        assert chunk == chunk.strip()
+
+    # 每个非空白字符都被覆盖 | Every non-space character is covered
+    covered = [False] * len(text)
+    for start, end in spans:
+        covered[start:end] = [True] * (end - start)
+    assert all(covered[i] for i, char in enumerate(text) if not char.isspace())
+    return spans
+
+
+def test_char_mode_invariants():
+    for seed in range(20):
+        text = make_text(seed)
+        for size, overlap in [(40, 10), (100, 20), (200, 0), (500, 150), (10, 3)]:
+            check_spans(TextChunker(size, overlap), text, len)
+
+
+def test_token_mode_invariants():
+    for seed in range(20):
+        text = make_text(seed)
+        for size, overlap in [(20, 5), (60, 15), (200, 40)]:
+            check_spans(create_chunker(size, overlap, "tokens"), text, estimate_tokens)
+
+
+def test_overlap_starts_at_word():
+    spans = TextChunker(20, 8).chunk_spans("alpha beta gamma delta epsilon zeta eta theta")
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    assert [text[start:end] for start, end in spans] == [
+        "alpha beta gamma", "gamma delta epsilon zeta", "zeta eta theta"
+    ]
+
+
+def test_no_word_in_overlap_gives_no_overlap():
+    # 重叠窗口内没有词首时不应从词中间开始 | No word start in reach must not start mid-word
+    assert TextChunker(10, 3).chunk_text("hello world. hello world.") == [
+        "hello", "world.", "hello", "world."
+    ]
+
+
+def test_empty_and_blank_input():
+    chunker = TextChunker(50, 10)
+    assert chunker.chunk_spans("") == []
+    assert chunker.chunk_spans("  \n\n \t ") == []
+    assert chunker.chunk_documents([{"content": "", "metadata": {"source": "a.pdf"}}]) == []
+
+
+def test_overlap_larger_than_size():
+    text = make_text(7)
+    check_spans(TextChunker(30, 60), text, len)
+    check_spans(create_chunker(10, 25, "tokens"), text, estimate_tokens)
+
+
+def test_chunk_documents_metadata():
+    text = make_text(3, paragraphs=2)
+    chunks = TextChunker(80, 20).chunk_documents([{"content": text, "metadata": {"source": "a.pdf", "page": 2}}])
+    assert chunks
+    for i, chunk in enumerate(chunks):
+        metadata = chunk["metadata"]
+        assert metadata["source"] == "a.pdf" and metadata["page"] == 2
+        assert metadata["chunk_index"] == i and metadata["total_chunks"] == len(chunks)
+        assert text[metadata["start_offset"]:metadata["end_offset"]] == chunk["content"]
+
+
+def test_unknown_unit():
+    try:
+        create_chunker(100, 10, "words")
+    except ValueError:
+        return
+    raise AssertionError("create_chunker accepted an unknown unit")
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"All {len(tests)} tests passed")
@@ -24,16 +24,30 @@ except ImportError:
 from flask import Flask, render_template, request, jsonify, Response
 from flask_cors import CORS
 import json
+import re
 import time
-from langgraph_orchestrator import LangGraphOrchestrator
+import atexit
+from langgraph_orchestrator import LangGraphOrchestrator, apply_state_update
 from agents import ProductResearcher, DocAssistant, FeasibilityEvaluator, init_llm
 from datetime import datetime
 import threading
-import queue
 from logger_config import logger
+from execution_events import ExecutionChannel, drain
+from execution_store import create_execution_store
+from orchestration_pool import OrchestrationPool, PoolSaturatedError
+from reindex_jobs import ReindexJobManager, ReindexInProgressError, ACTIVE_STATUSES
+import async_runtime
 
 # Import RAG components
 from config import RAG_ENABLED, RAG_DOCUMENTS_DIR, RAG_VECTOR_DB_DIR, RAG_COLLECTION_NAME, RAG_EMBEDDING_MODEL, RAG_CHUNK_SIZE, RAG_CHUNK_OVERLAP
+from config import RAG_EXTRACT_WORKERS, RAG_EXTRACT_PAGES_PER_TASK, RAG_INGEST_BATCH_SIZE, RAG_INGEST_QUEUE_SIZE
+from config import RAG_QUERY_CACHE_SIZE, RAG_QUERY_CACHE_PATH, RAG_EMBEDDING_CACHE_DIR, RAG_EMBEDDING_CACHE_MAX_ENTRIES
+from config import RAG_WARMUP_ENABLED, RAG_VECTOR_BACKEND, RAG_HYBRID_SEARCH, RAG_HYBRID_CANDIDATES, RAG_RRF_K
+from config import RAG_MMR_LAMBDA, RAG_MMR_CANDIDATES, RAG_MERGE_ADJACENT_CHUNKS, RAG_CONTEXT_TOKEN_BUDGET, RAG_CHUNK_SIZE_UNIT
+from config import LLM_STREAMING_ENABLED, EXECUTION_STORE_POLL_SECONDS
+from config import ORCHESTRATION_MAX_WORKERS, ORCHESTRATION_MAX_QUEUE_SIZE, ORCHESTRATION_RETRY_AFTER_SECONDS
+from config import EXECUTION_STATE_TTL_SECONDS, EXECUTION_STATE_MAX_FINISHED
+from config import REINDEX_JOB_DB_PATH, REINDEX_JOB_STALE_SECONDS, REINDEX_JOB_TTL_SECONDS, REINDEX_JOB_MAX_FINISHED
 
 # Initialize RAG retriever (global instance)
 rag_retriever = None
@@ -46,7 +60,24 @@ if RAG_ENABLED:
             collection_name=RAG_COLLECTION_NAME,
             embedding_model=RAG_EMBEDDING_MODEL,
             chunk_size=RAG_CHUNK_SIZE,
-            chunk_overlap=RAG_CHUNK_OVERLAP
+            chunk_overlap=RAG_CHUNK_OVERLAP,
+            chunk_unit=RAG_CHUNK_SIZE_UNIT,
+            extract_workers=RAG_EXTRACT_WORKERS,
+            pages_per_task=RAG_EXTRACT_PAGES_PER_TASK,
+            ingest_batch_size=RAG_INGEST_BATCH_SIZE,
+            ingest_queue_size=RAG_INGEST_QUEUE_SIZE,
+            query_cache_size=RAG_QUERY_CACHE_SIZE,
+            query_cache_path=RAG_QUERY_CACHE_PATH,
+            embedding_cache_dir=RAG_EMBEDDING_CACHE_DIR,
+            embedding_cache_max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+            vector_backend=RAG_VECTOR_BACKEND,
+            hybrid_search=RAG_HYBRID_SEARCH,
+            hybrid_candidates=RAG_HYBRID_CANDIDATES,
+            rrf_k=RAG_RRF_K,
+            mmr_lambda=RAG_MMR_LAMBDA,
+            mmr_candidates=RAG_MMR_CANDIDATES,
+            merge_adjacent=RAG_MERGE_ADJACENT_CHUNKS,
+            context_token_budget=RAG_CONTEXT_TOKEN_BUDGET
         )
         logger.info("RAG Retriever initialized successfully")
     except Exception as e:
@@ -56,9 +87,147 @@ if RAG_ENABLED:
 app = Flask(__name__)
 CORS(app)
 
-# 存储执行状态和结果
-execution_states = {}
-execution_queue = queue.Queue()
+# 存储执行状态和结果（可在多个 worker 间共享）| Execution states and results (shareable across workers)
+execution_states = create_execution_store()
+# 有界的编排任务池，限制并发执行数 | Bounded job pool capping concurrent orchestrations
+orchestration_pool = OrchestrationPool(ORCHESTRATION_MAX_WORKERS, ORCHESTRATION_MAX_QUEUE_SIZE)
+# 排队中（尚未开始）的编排器，用于取消 | Queued (not yet started) orchestrators, for cancellation
+queued_orchestrators = {}
+# 每个执行的 SSE 事件通道 | Per-execution SSE event channels
+execution_channels = {}
+# 后台重建索引任务 | Background reindex jobs
+reindex_jobs = ReindexJobManager(
+    rag_retriever,
+    create_execution_store(REINDEX_JOB_DB_PATH),
+    stale_seconds=REINDEX_JOB_STALE_SECONDS,
+    ttl_seconds=REINDEX_JOB_TTL_SECONDS,
+    max_finished=REINDEX_JOB_MAX_FINISHED
+) if rag_retriever else None
+
+# SSE 空闲时发送保活注释的间隔（秒）| Interval for SSE keep-alive comments when idle (seconds)
+SSE_KEEPALIVE_SECONDS = 15
+
+# 查询类请求触发淘汰的最小间隔（秒）| Minimum interval between evictions triggered by read requests (seconds)
+EVICTION_INTERVAL_SECONDS = 30
+_last_eviction_at = 0.0
+
+# 执行结果文件目录 | Directory for execution result files
+RESULTS_OUTPUT_DIR = "outputs"
+
+# 进程级共享的编排器（每个 worker 构建一次）| Worker-wide shared orchestrator (built once per worker)
+_shared_orchestrator = None
+_shared_orchestrator_lock = threading.Lock()
+
+
+def get_shared_orchestrator():
+    """
+    获取共享的 LangGraph 编排器，首次调用时构建 LLM、三个 Agent 并编译工作流
+    Get the shared LangGraph orchestrator, building the LLM, the three agents and
+    the compiled workflow on first use
+    """
+    global _shared_orchestrator
+    if _shared_orchestrator is not None:
+        return _shared_orchestrator
+
+    with _shared_orchestrator_lock:
+        if _shared_orchestrator is None:
+            logger.info("Initializing shared LLM and Agents...")
+            llm = init_llm()
+            researcher = ProductResearcher(llm)
+            doc_assistant = DocAssistant(llm)
+            # Pass RAG retriever to FeasibilityEvaluator
+            evaluator = FeasibilityEvaluator(llm, rag_retriever)
+
+            logger.info("Creating shared LangGraph Orchestrator...")
+            _shared_orchestrator = LangGraphOrchestrator(researcher, doc_assistant, evaluator, llm)
+            logger.info("Shared LangGraph Orchestrator created successfully")
+    return _shared_orchestrator
+
+
+def close_shared_orchestrator():
+    """
+    释放共享编排器的 HTTP 连接池并停止事件循环，worker 退出时调用
+    Release the shared orchestrator's HTTP connection pools and stop the event loop, called on worker exit
+    """
+    global _shared_orchestrator
+    with _shared_orchestrator_lock:
+        if _shared_orchestrator is not None:
+            _shared_orchestrator.llm.close()
+            _shared_orchestrator = None
+    async_runtime.shutdown()
+
+
+atexit.register(close_shared_orchestrator)
+
+
+def start_rag_warmup():
+    """
+    在后台线程中预热 RAG（加载嵌入模型、打开向量库），worker 启动后调用
+    Warm up RAG (load the embedding model, open the vector store) on a background
+    thread, called at worker start
+    """
+    if rag_retriever and RAG_WARMUP_ENABLED and rag_retriever.start_warm_up():
+        logger.info("RAG warm-up started")
+
+
+def _result_filepath(execution_id):
+    """执行结果文件路径 | Path of an execution's result file"""
+    return os.path.join(RESULTS_OUTPUT_DIR, f"orchestration_result_{execution_id}.json")
+
+
+def _spilled_result_path(execution_id):
+    """已保存的结果文件路径，不存在时返回 None | Path of the saved result file, or None"""
+    # 执行ID由时间戳生成，拒绝其他字符以防路径穿越 | IDs are timestamps; reject anything else
+    if not re.fullmatch(r'[0-9_]+', execution_id):
+        return None
+    filepath = _result_filepath(execution_id)
+    return filepath if os.path.exists(filepath) else None
+
+
+def _load_spilled_result(execution_id):
+    """
+    从 outputs/ 加载已淘汰执行的结果 | Load an evicted execution's result from outputs/
+
+    Returns:
+        结果字典，不存在时返回 None | Result dict, or None if not found
+    """
+    filepath = _spilled_result_path(execution_id)
+    if filepath is None:
+        return None
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[{execution_id}] Failed to load saved result: {e}")
+        return None
+
+
+def evict_finished_executions():
+    """
+    淘汰已结束的执行状态及其事件通道（结果已保存在 outputs/）
+    Evict finished execution states and their event channels (results live in outputs/)
+    """
+    global _last_eviction_at
+    _last_eviction_at = time.time()
+    evicted = execution_states.evict_finished(EXECUTION_STATE_TTL_SECONDS, EXECUTION_STATE_MAX_FINISHED)
+    for execution_id in evicted:
+        execution_channels.pop(execution_id, None)
+    # 共享存储中被其他 worker 淘汰的执行 | Executions evicted from the shared store by other workers
+    for execution_id, channel in list(execution_channels.items()):
+        if channel.closed and execution_id not in execution_states:
+            execution_channels.pop(execution_id, None)
+    if evicted:
+        logger.info(f"Evicted {len(evicted)} finished executions")
+
+
+def evict_finished_executions_periodically():
+    """
+    状态/结果/流请求中按间隔淘汰，没有新执行时内存也会回收
+    Evict at most every EVICTION_INTERVAL_SECONDS from status, result and stream
+    requests, so memory is reclaimed even when no new executions arrive
+    """
+    if time.time() - _last_eviction_at >= EVICTION_INTERVAL_SECONDS:
+        evict_finished_executions()
 
 
 class StreamingOrchestrator:
@@ -90,37 +259,29 @@ class StreamingOrchestrator:
             'display_name': 'Documentation Generation',
             'icon': '📝',
             'order': 4
+        },
+        # 并行拓扑的节点 | Nodes of the parallel topology
+        'doc_draft': {
+            'step': 'documentation',
+            'display_name': 'Documentation Draft',
+            'icon': '📝',
+            'order': 4
+        },
+        'merge': {
+            'step': 'documentation',
+            'display_name': 'Documentation Merge',
+            'icon': '🔗',
+            'order': 5
         }
     }
     
     def __init__(self, execution_id):
         self.execution_id = execution_id
 
-        # 初始化 LLM
-        logger.info(f"[{execution_id}] Initializing LLM...")
-        self.llm = init_llm()
-
-        # 初始化三个 Agent（FeasibilityEvaluator 使用 RAG）
-        logger.info(f"[{execution_id}] Initializing Agents...")
-        self.researcher = ProductResearcher(self.llm)
-        self.doc_assistant = DocAssistant(self.llm)
-        # Pass RAG retriever to FeasibilityEvaluator
-        self.evaluator = FeasibilityEvaluator(self.llm, rag_retriever)
-
-        if rag_retriever:
-            logger.info(f"[{execution_id}] FeasibilityEvaluator initialized with RAG support")
-        else:
-            logger.info(f"[{execution_id}] FeasibilityEvaluator initialized without RAG support")
-
-        # 创建 LangGraph 编排器
-        logger.info(f"[{execution_id}] Creating LangGraph Orchestrator...")
-        self.langgraph_orchestrator = LangGraphOrchestrator(
-            self.researcher,
-            self.doc_assistant,
-            self.evaluator,
-            self.llm
-        )
-        logger.info(f"[{execution_id}] LangGraph Orchestrator created successfully")
+        # 复用进程级共享的 LLM、Agent 和已编译的工作流，每次执行的状态只保存在图状态中
+        # Reuse the worker-wide LLM, agents and compiled workflow; per-execution state lives in the graph state
+        self.langgraph_orchestrator = get_shared_orchestrator()
+        self.llm = self.langgraph_orchestrator.llm
         
         self.states = {
             'status': 'idle',
@@ -135,22 +296,40 @@ class StreamingOrchestrator:
                 'documentation': None
             }
         }
+        # 状态变化通过事件通道推送给 SSE 客户端 | State changes are pushed to SSE clients via the channel
+        self.channel = ExecutionChannel()
+
+    def on_token(self, channel, delta):
+        """推送 LLM 流式输出的增量 | Publish a streamed LLM delta"""
+        self.channel.publish({'token_deltas': {channel: delta}})
     
     def update_state(self, status, step=None, message=None):
         """更新执行状态"""
+        delta = {'status': status}
         if step:
             self.states['current_step'] = step
+            delta['current_step'] = step
             if message:
-                self.states['steps'].append({
+                entry = {
                     'step': step,
                     'message': message,
                     'timestamp': datetime.now().isoformat()
-                })
+                }
+                self.states['steps'].append(entry)
+                delta['new_steps'] = [entry]
         self.states['status'] = status
-        execution_states[self.execution_id] = self.states.copy()
+        if status == 'error' and self.states.get('error'):
+            delta['error'] = self.states['error']
+        execution_states.set(self.execution_id, self.states.copy())
+        self.channel.publish(delta)
+
+    def set_partial_result(self, key, value):
+        """保存并推送中间结果 | Store and publish an intermediate result"""
+        self.states['partial_results'][key] = value
+        self.channel.publish({f'partial_{key}': value})
     
-    def orchestrate(self, user_input):
-        """执行编排流程，使用 LangGraph 流式执行"""
+    async def orchestrate(self, user_input):
+        """执行编排流程，在共享事件循环上使用 LangGraph 异步流式执行"""
         try:
             logger.info(f"[{self.execution_id}] Starting LangGraph orchestration")
             self.update_state('running', 'initializing', 'Initializing LangGraph workflow...')
@@ -158,13 +337,16 @@ class StreamingOrchestrator:
             # 使用 LangGraph 流式执行工作流
             logger.info(f"[{self.execution_id}] Starting stream workflow execution")
             
-            # 流式执行，实时更新状态
-            final_state = None
+            # 流式执行，实时更新状态；节点只返回部分更新，累积为完整状态
+            # Nodes return partial updates, accumulated into the full state
+            final_state = self.langgraph_orchestrator.create_initial_state(user_input)
             completed_nodes = set()
             
-            # 使用 stream_workflow 执行工作流（只执行一次）
-            for state_update in self.langgraph_orchestrator.stream_workflow(user_input):
-                # LangGraph stream 返回格式: {'node_name': state_dict}
+            # 使用 astream_workflow 执行工作流（只执行一次）
+            token_callback = self.on_token if LLM_STREAMING_ENABLED else None
+            workflow_started = time.perf_counter()
+            async for state_update in self.langgraph_orchestrator.astream_workflow(user_input, token_callback):
+                # LangGraph stream 返回格式: {'node_name': state_update}
                 if isinstance(state_update, dict):
                     for key, value in state_update.items():
                         # 检查是否是已知节点
@@ -178,13 +360,13 @@ class StreamingOrchestrator:
 
                             # 捕获中间结果并保存到 partial_results
                             if key == 'researcher' and isinstance(value, dict):
-                                self.states['partial_results']['research'] = value.get('research_result')
+                                self.set_partial_result('research', value.get('research_result'))
                             elif key == 'evaluator' and isinstance(value, dict):
-                                self.states['partial_results']['evaluation'] = value.get('evaluation_result')
+                                self.set_partial_result('evaluation', value.get('evaluation_result'))
                             elif key == 'aggregation' and isinstance(value, dict):
-                                self.states['partial_results']['summary'] = value.get('final_summary')
-                            elif key == 'doc_assistant' and isinstance(value, dict):
-                                self.states['partial_results']['documentation'] = value.get('document_content')
+                                self.set_partial_result('summary', value.get('final_summary'))
+                            elif key in ('doc_assistant', 'doc_draft', 'merge') and isinstance(value, dict):
+                                self.set_partial_result('documentation', value.get('document_content'))
 
                             # 更新状态 - 节点完成
                             self.update_state(
@@ -194,17 +376,14 @@ class StreamingOrchestrator:
                             )
                             logger.info(f"[{self.execution_id}] Node {key} ({step_name}) completed")
 
-                            # 保存状态（每次更新都保存，最后一次就是最终状态）
+                            # 累积节点更新 | Accumulate the node update
                             if isinstance(value, dict):
-                                final_state = value
-
-                        # 检查是否是完整状态对象
-                        elif isinstance(value, dict) and 'execution_log' in value:
-                            final_state = value
+                                apply_state_update(final_state, value)
             
             # 检查是否成功获取最终状态
-            if final_state is None:
+            if not completed_nodes:
                 raise Exception("Workflow execution failed: no final state returned")
+            final_state['execution_time'] = round(time.perf_counter() - workflow_started, 3)
             
             logger.info(f"[{self.execution_id}] Stream workflow completed, completed nodes: {completed_nodes}")
             
@@ -212,11 +391,13 @@ class StreamingOrchestrator:
             logger.info(f"[{self.execution_id}] Building final result from state")
             final_result = self._build_final_result(user_input, final_state)
             
+            # 先保存结果到文件，状态被淘汰后 /api/result 从文件重新加载
+            # Save to file first; /api/result reloads from it once the state is evicted
+            self._save_results(final_result)
+
             self.states['result'] = final_result
             self.update_state('completed', 'finished', 'LangGraph workflow completed successfully')
-            
-            # 保存结果到文件
-            self._save_results(final_result)
+            self.channel.publish({'final_result': final_result})
             
             logger.info(f"[{self.execution_id}] Orchestration completed successfully")
             return final_result
@@ -226,6 +407,8 @@ class StreamingOrchestrator:
             self.states['error'] = str(e)
             self.update_state('error', None, f'LangGraph execution error: {str(e)}')
             raise
+        finally:
+            self.channel.close()
     
     def _build_final_result(self, user_input, final_state):
         """从 LangGraph 的 final_state 构建前端期望的结果格式"""
@@ -251,15 +434,17 @@ class StreamingOrchestrator:
                 }
             },
             "final_summary": final_state.get("final_summary", {}),
+            "workflow_topology": final_state.get("workflow_topology"),
+            "node_timings": final_state.get("node_timings", {}),
             "status": "completed"
         }
     
     def _save_results(self, final_result):
         """保存结果到文件"""
-        output_dir = "outputs"
+        output_dir = RESULTS_OUTPUT_DIR
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
-        filepath = os.path.join(output_dir, f"orchestration_result_{self.execution_id}.json")
+        filepath = _result_filepath(self.execution_id)
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(final_result, f, indent=2, ensure_ascii=False, default=str)
         logger.info(f"[{self.execution_id}] Results saved to: {filepath}")
@@ -281,27 +466,45 @@ def orchestrate():
         if not user_input:
             return jsonify({'error': 'User input cannot be empty'}), 400
         
+        # 淘汰过期的已结束执行，控制内存占用 | Evict expired finished executions to bound memory
+        evict_finished_executions()
+
         # 生成执行ID
         execution_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         
-        # 创建编排器并执行
+        # 创建编排器
         orchestrator = StreamingOrchestrator(execution_id)
-        execution_states[execution_id] = orchestrator.states
-        
-        # 在后台线程中执行
-        def run_orchestration():
+
+        # 在任务池中执行（协程运行在共享事件循环上）| Run in the pool (coroutine on the shared event loop)
+        async def run_orchestration():
+            queued_orchestrators.pop(execution_id, None)
             try:
-                orchestrator.orchestrate(user_input)
+                await orchestrator.orchestrate(user_input)
             except Exception as e:
                 orchestrator.update_state('error', None, f'Execution failed: {str(e)}')
-        
-        thread = threading.Thread(target=run_orchestration)
-        thread.daemon = True
-        thread.start()
-        
+
+        orchestrator.update_state('queued')
+        queued_orchestrators[execution_id] = orchestrator
+        execution_channels[execution_id] = orchestrator.channel
+
+        try:
+            position = orchestration_pool.submit(execution_id, run_orchestration)
+        except PoolSaturatedError as e:
+            queued_orchestrators.pop(execution_id, None)
+            execution_channels.pop(execution_id, None)
+            execution_states.delete(execution_id)
+            logger.warning(f"[{execution_id}] Rejected: {e}")
+            response = jsonify({
+                'error': 'Server is busy, please retry later',
+                'retry_after': ORCHESTRATION_RETRY_AFTER_SECONDS
+            })
+            response.headers['Retry-After'] = str(ORCHESTRATION_RETRY_AFTER_SECONDS)
+            return response, 429
+
         return jsonify({
             'execution_id': execution_id,
             'status': 'started',
+            'queue_position': position,
             'message': 'Orchestration started'
         })
         
@@ -312,20 +515,55 @@ def orchestrate():
 @app.route('/api/status/<execution_id>')
 def get_status(execution_id):
     """Get execution status API endpoint"""
-    if execution_id not in execution_states:
+    evict_finished_executions_periodically()
+    state = execution_states.get(execution_id)
+    if state is None:
+        if _spilled_result_path(execution_id):
+            # 状态已淘汰，结果可通过 /api/result 加载 | State evicted, result available via /api/result
+            return jsonify({'status': 'completed', 'current_step': 'finished', 'evicted': True})
         return jsonify({'error': 'Execution ID not found'}), 404
-    
-    state = execution_states[execution_id]
+
+    position = orchestration_pool.position(execution_id)
+    if position is not None:
+        state = {**state, 'queue_position': position}
     return jsonify(state)
 
 
+@app.route('/api/cancel/<execution_id>', methods=['POST'])
+def cancel_execution(execution_id):
+    """Cancel a queued execution (running executions cannot be cancelled)"""
+    if execution_states.get_version(execution_id) is None:
+        return jsonify({'error': 'Execution ID not found'}), 404
+
+    if not orchestration_pool.cancel(execution_id):
+        return jsonify({'error': 'Execution is not queued and cannot be cancelled'}), 409
+
+    orchestrator = queued_orchestrators.pop(execution_id)
+
+    orchestrator.update_state('cancelled', 'cancelled', 'Execution cancelled before start')
+    orchestrator.channel.close()
+    logger.info(f"[{execution_id}] Cancelled while queued")
+    return jsonify({'execution_id': execution_id, 'status': 'cancelled'})
+
+
+@app.route('/api/orchestration/pool', methods=['GET'])
+def orchestration_pool_stats():
+    """Get orchestration pool statistics"""
+    return jsonify(orchestration_pool.get_stats())
+
+
 @app.route('/api/result/<execution_id>')
 def get_result(execution_id):
     """获取执行结果的API端点"""
-    if execution_id not in execution_states:
+    evict_finished_executions_periodically()
+    state = execution_states.get(execution_id)
+    if state is None:
+        # 状态已淘汰时从 outputs/ 按需加载 | Lazily reload from outputs/ once evicted
+        result = _load_spilled_result(execution_id)
+        if result is not None:
+            return jsonify(result)
         return jsonify({'error': 'Execution ID not found'}), 404
 
-    state = execution_states[execution_id]
     if state['status'] == 'completed' and state.get('result'):
         return jsonify(state['result'])
     elif state['status'] == 'error':
@@ -334,43 +572,104 @@ def get_result(execution_id):
         return jsonify({'message': 'Execution not completed yet'}), 202
 
 
-@app.route('/api/stream/<execution_id>')
-def stream_status(execution_id):
-    """SSE流式状态推送端点"""
-    def generate():
-        last_partial_results = {}
-
-        while True:
-            if execution_id not in execution_states:
-                yield f"data: {json.dumps({'error': 'Execution ID not found'})}\n\n"
-                break
-
-            state = execution_states[execution_id]
-            current_partial = state.get('partial_results', {})
-
-            # 构建更新数据
-            update = {
-                'status': state['status'],
-                'current_step': state.get('current_step'),
-                'steps': state.get('steps', [])
-            }
-
-            # 检查每个agent的结果是否有更新
-            for key in ['research', 'evaluation', 'summary', 'documentation']:
-                if current_partial.get(key) and current_partial.get(key) != last_partial_results.get(key):
-                    update[f'partial_{key}'] = current_partial[key]
-                    last_partial_results[key] = current_partial[key]
+def _state_snapshot(state):
+    """将执行状态转换为 SSE 快照消息 | Convert an execution state into an SSE snapshot message"""
+    snapshot = {
+        'status': state['status'],
+        'current_step': state.get('current_step'),
+        'new_steps': list(state.get('steps', []))
+    }
+    for key, value in state.get('partial_results', {}).items():
+        if value:
+            snapshot[f'partial_{key}'] = value
+    if state['status'] == 'completed' and state.get('result'):
+        snapshot['final_result'] = state['result']
+    if state['status'] == 'error' and state.get('error'):
+        snapshot['error'] = state['error']
+    return snapshot
+
+
+def _sse_message(data):
+    return f"data: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _poll_store_stream(execution_id):
+    """
+    执行由其他 worker 运行时，通过轮询共享存储的版本号推送增量（不含 token 流）
+    When another worker runs the execution, push deltas by polling the shared
+    store's version number (token deltas are not available)
+    """
+    last_version = None
+    sent = {}
+    last_sent_at = time.time()
+    while True:
+        version = execution_states.get_version(execution_id)
+        if version is None:
+            result = _load_spilled_result(execution_id)
+            if result is not None:
+                yield _sse_message({'status': 'completed', 'current_step': 'finished', 'final_result': result})
+                yield _sse_message({'done': True})
+            else:
+                yield _sse_message({'error': 'Execution ID not found'})
+            return
+
+        state = None
+        if version != last_version:
+            last_version = version
+            state = execution_states.get(execution_id)
+        if state is not None:
+            snapshot = _state_snapshot(state)
+            delta = {}
+            for key, value in snapshot.items():
+                if key == 'new_steps':
+                    new_steps = value[len(sent.get('new_steps', [])):]
+                    if new_steps:
+                        delta['new_steps'] = new_steps
+                elif sent.get(key) != value:
+                    delta[key] = value
+            sent = snapshot
+            if delta:
+                yield _sse_message(delta)
+                last_sent_at = time.time()
+            if state['status'] in ['completed', 'error', 'cancelled']:
+                yield _sse_message({'done': True})
+                return
+        if time.time() - last_sent_at >= SSE_KEEPALIVE_SECONDS:
+            # 与进程内通道一样，仅在长时间无消息时发送保活 | Like the in-process channel, keep alive only after a silent stretch
+            yield ": keepalive\n\n"
+            last_sent_at = time.time()
+
+        time.sleep(EXECUTION_STORE_POLL_SECONDS)
 
-            yield f"data: {json.dumps(update, ensure_ascii=False, default=str)}\n\n"
 
-            # 完成或出错时结束
-            if state['status'] in ['completed', 'error']:
-                if state['status'] == 'completed' and state.get('result'):
-                    yield f"data: {json.dumps({'final_result': state['result']}, ensure_ascii=False, default=str)}\n\n"
-                yield f"data: {json.dumps({'done': True})}\n\n"
-                break
+@app.route('/api/stream/<execution_id>')
+def stream_status(execution_id):
+    """SSE流式状态推送端点（事件驱动，只推送增量）"""
+    evict_finished_executions_periodically()
 
-            time.sleep(0.5)  # 500ms检查间隔
+    def generate():
+        channel = execution_channels.get(execution_id)
+        if channel is None:
+            # 执行不在本 worker 中，回退到轮询共享存储 | Execution not in this worker, poll the shared store
+            yield from _poll_store_stream(execution_id)
+            return
+
+        # 先发送快照，之后只在有变化时发送合并后的增量
+        # Send the snapshot first, then coalesced deltas only when something changes
+        snapshot, subscriber = channel.subscribe()
+        try:
+            if snapshot:
+                yield _sse_message(snapshot)
+            closed = subscriber is None
+            while not closed:
+                message, closed = drain(subscriber, SSE_KEEPALIVE_SECONDS)
+                if message:
+                    yield _sse_message(message)
+                elif not closed:
+                    yield ": keepalive\n\n"
+            yield _sse_message({'done': True})
+        finally:
+            channel.unsubscribe(subscriber)
 
     return Response(
         generate(),
@@ -383,6 +682,44 @@ def stream_status(execution_id):
     )
 
 
+# ============================================================================
+# LLM Response Cache API Endpoints
+# ============================================================================
+
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def llm_cache_stats():
+    """Get LLM response cache hit/miss statistics"""
+    from llm_cache import get_response_cache
+
+    cache = get_response_cache()
+    if cache is None:
+        return jsonify({'enabled': False, 'message': 'LLM cache is not enabled'})
+
+    try:
+        return jsonify({'enabled': True, **cache.get_stats()})
+    except Exception as e:
+        logger.error(f"Error getting LLM cache stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/llm-cache', methods=['DELETE'])
+def clear_llm_cache():
+    """Clear all cached LLM responses"""
+    from llm_cache import get_response_cache
+
+    cache = get_response_cache()
+    if cache is None:
+        return jsonify({'error': 'LLM cache is not enabled'}), 400
+
+    try:
+        cache.clear()
+        logger.info("LLM response cache cleared")
+        return jsonify({'message': 'LLM cache cleared'})
+    except Exception as e:
+        logger.error(f"Error clearing LLM cache: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 # ============================================================================
 # RAG Document Management API Endpoints
 # ============================================================================
@@ -461,8 +798,11 @@ def delete_document(filename):
         if os.path.exists(filepath):
             os.remove(filepath)
             logger.info(f"Deleted document: {filename}")
+            # 立即按来源删除该文档的向量 | Drop the document's vectors by source right away
+            result = rag_retriever.remove_document(filename)
             return jsonify({
-                'message': f"Deleted {filename}. Use /api/documents/reindex to update the index."
+                'message': f"Deleted {filename} and removed {result['chunks_deleted']} chunk(s) from the index.",
+                'chunks_deleted': result['chunks_deleted']
             })
         else:
             return jsonify({'error': 'File not found'}), 404
@@ -473,20 +813,58 @@ def delete_document(filename):
 
 @app.route('/api/documents/reindex', methods=['POST'])
 def reindex_documents():
-    """Rebuild the vector index from all documents"""
+    """
+    Start a background reindex job (incremental; pass {"full": true} to rebuild everything).
+    Queries keep using the current index until the job swaps in the new one.
+    """
     if not rag_retriever:
         return jsonify({'error': 'RAG is not enabled'}), 400
 
     try:
-        logger.info("Starting document reindexing...")
-        result = rag_retriever.rebuild_index()
-        logger.info(f"Reindexing completed: {result}")
-        return jsonify(result)
+        full = bool((request.get_json(silent=True) or {}).get('full', False))
+        job = reindex_jobs.start(full=full)
+        return jsonify({
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'status_url': f"/api/documents/reindex/{job['job_id']}"
+        }), 202
+    except ReindexInProgressError as e:
+        return jsonify({
+            'error': str(e),
+            'job_id': e.job_id,
+            'status_url': f"/api/documents/reindex/{e.job_id}"
+        }), 409
     except Exception as e:
-        logger.error(f"Error reindexing documents: {e}")
+        logger.error(f"Error starting reindex job: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/documents/reindex/<job_id>', methods=['GET'])
+def reindex_status(job_id):
+    """Get a reindex job's status and progress"""
+    if not rag_retriever:
+        return jsonify({'error': 'RAG is not enabled'}), 400
+
+    job = reindex_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Reindex job not found'}), 404
+    return jsonify(job)
+
+
+@app.route('/api/documents/reindex/<job_id>/cancel', methods=['POST'])
+def cancel_reindex(job_id):
+    """Cancel a running reindex job; the current index is kept"""
+    if not rag_retriever:
+        return jsonify({'error': 'RAG is not enabled'}), 400
+
+    job = reindex_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Reindex job not found'}), 404
+    if job['status'] not in ACTIVE_STATUSES:
+        return jsonify({'error': f"Reindex job already {job['status']}"}), 409
+    return jsonify({'job_id': job_id, 'status': 'cancelling'})
+
+
 @app.route('/api/rag/status', methods=['GET'])
 def rag_status():
     """Get RAG system status"""
@@ -504,10 +882,23 @@ def rag_status():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/rag/ready', methods=['GET'])
+def rag_ready():
+    """Readiness of RAG: 200 once the embedding model and vector store are loaded, 503 before"""
+    if not rag_retriever:
+        return jsonify({'enabled': False, 'ready': True})
+
+    readiness = rag_retriever.get_readiness()
+    return jsonify({'enabled': True, **readiness}), 200 if readiness['ready'] else 503
+
+
 if __name__ == '__main__':
     print("\n" + "="*80)
     print("🌐 Starting Web Application Server")
     print("="*80)
     print("\nAccess URL: http://localhost:5001")
     print("Press Ctrl+C to stop the server\n")
+    # 只在重载器启动的服务进程中预热 | Warm up only in the serving process started by the reloader
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_rag_warmup()
     app.run(debug=True, host='0.0.0.0', port=5001)